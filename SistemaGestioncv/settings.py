@@ -138,9 +138,16 @@ MEDIA_ROOT = BASE_DIR / "media"
 
 MEDIA_URL = "/media/"
 
+# Archivos parciales de las cargas reanudables (fuera de MEDIA_ROOT: no se sirven)
+CARGAS_DIRECTORIO = BASE_DIR / "cargas"
+
+# Exportaciones grandes generadas en segundo plano (se descargan desde el admin)
+EXPORTACIONES_DIRECTORIO = BASE_DIR / "exportaciones"
+
 STORAGES = {
+    # Media direccionada por contenido: archivos repetidos se guardan una vez
     "default": {
-        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "BACKEND": "gestor.storage.AlmacenamientoDeduplicado",
     },
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedStaticFilesStorage",
@@ -250,6 +257,11 @@ UNFOLD = {
                         "icon": "place",
                         "link": reverse_lazy("admin:gestor_puntocontrol_changelist"),
                     },
+                    {
+                        "title": _("Observaciones"),
+                        "icon": "straighten",
+                        "link": reverse_lazy("admin:gestor_observaciontopografica_changelist"),
+                    },
                 ],
             },
             {
@@ -272,6 +284,16 @@ UNFOLD = {
                         "icon": "analytics",
                         "link": reverse_lazy("admin:gestor_volumenterraceria_changelist"),
                     },
+                    {
+                        "title": _("Tareas en Segundo Plano"),
+                        "icon": "pending_actions",
+                        "link": reverse_lazy("admin:gestor_tareafondo_changelist"),
+                    },
+                    {
+                        "title": _("Cargas de Archivos"),
+                        "icon": "cloud_upload",
+                        "link": reverse_lazy("admin:gestor_cargaarchivo_changelist"),
+                    },
                 ],
             },
 
@@ -18,9 +18,12 @@ from unfold.forms import AdminPasswordChangeForm, UserChangeForm, UserCreationFo
 
 from .cuadrilla_admin import CuadrillaAdmin
 from .element_admin import ElementoConstructivoAdmin
+from .observation_admin import ObservacionTopograficaAdmin
 from .project_admin import ProyectoAdmin
 from .punto_admin import PuntoControlAdmin
 from .report_admin import ReporteAvanceAdmin
+from .task_admin import TareaFondoAdmin
+from .upload_admin import CargaArchivoAdmin
 from .volume_admin import VolumenTerraceriaAdmin
 
 admin.site.unregister(User)
@@ -111,4 +114,4 @@ class GroupAdmin(BaseGroupAdmin, ModelAdmin):
 
 
 __all__ = ['ProyectoAdmin', 'ElementoConstructivoAdmin', 'PuntoControlAdmin', 'CuadrillaAdmin', "ReporteAvanceAdmin",
-           "VolumenTerraceriaAdmin"]
+           "VolumenTerraceriaAdmin", "TareaFondoAdmin", "ObservacionTopograficaAdmin"]
@@ -2,7 +2,7 @@ from django.utils.safestring import mark_safe
 from django.contrib import admin
 from django.urls import reverse
 from django.utils import timezone
-from django.utils.html import format_html
+from django.utils.html import format_html, format_html_join
 from import_export.admin import ImportExportModelAdmin
 from unfold.admin import ModelAdmin
 from unfold.contrib.filters.admin import (
@@ -14,6 +14,7 @@ from unfold.contrib.filters.admin import (
 from unfold.decorators import display
 from django.template.loader import render_to_string
 from gestor.models import ElementoConstructivo
+from gestor.services import puntos_cercanos_a
 from .resorce import ElementoResource
 
 
@@ -47,6 +48,7 @@ class ElementoConstructivoAdmin(ModelAdmin, ImportExportModelAdmin):
     readonly_fields = [
         'utm_display',
         'coordenadas_card',
+        'puntos_cercanos_card',
         'avance_timeline',
         'geometria_card',
     ]
@@ -60,6 +62,7 @@ class ElementoConstructivoAdmin(ModelAdmin, ImportExportModelAdmin):
             'fields': (
                 ('latitud', 'longitud', 'elevacion'),
                 'coordenadas_card',
+                'puntos_cercanos_card',
             ),
             'classes': ['tab'],
         }),
@@ -508,6 +511,60 @@ class ElementoConstructivoAdmin(ModelAdmin, ImportExportModelAdmin):
             utm_zona_str
         )
 
+    @display(description="Puntos de Control Cercanos")
+    def puntos_cercanos_card(self, obj):
+        if not obj.pk:
+            return format_html(
+                '<div class="text-sm text-base-500 dark:text-base-400">Guarde el elemento para ver los puntos cercanos</div>'
+            )
+
+        puntos = puntos_cercanos_a(obj, k=5)
+        if not puntos:
+            return format_html(
+                '<div class="text-sm text-base-500 dark:text-base-400">El proyecto no tiene puntos de control validados</div>'
+            )
+
+        filas = format_html_join(
+            '',
+            '''
+            <tr class="border-t border-base-200 dark:border-base-700">
+                <td class="py-1.5 pr-4"><a href="{}" class="text-primary-600 dark:text-primary-400 font-semibold">{}</a></td>
+                <td class="py-1.5 pr-4 text-base-600 dark:text-base-400">{}</td>
+                <td class="py-1.5 pr-4 font-mono">{}</td>
+                <td class="py-1.5 text-right font-mono font-semibold">{} m</td>
+            </tr>
+            ''',
+            (
+                (
+                    reverse('admin:gestor_puntocontrol_change', args=[punto['id']]),
+                    punto['numero_punto'],
+                    punto['tipo'],
+                    f"{punto['elevacion']:.3f}",
+                    f"{punto['distancia_m']:.2f}",
+                )
+                for punto in puntos
+            )
+        )
+
+        return format_html(
+            '''
+            <div class="bg-base-50 dark:bg-base-900 rounded-lg p-4">
+                <table class="w-full text-xs text-base-900 dark:text-base-100">
+                    <thead>
+                        <tr class="text-left text-base-500 dark:text-base-400">
+                            <th class="pb-1.5 pr-4">Punto</th>
+                            <th class="pb-1.5 pr-4">Tipo</th>
+                            <th class="pb-1.5 pr-4">Elevación</th>
+                            <th class="pb-1.5 text-right">Distancia</th>
+                        </tr>
+                    </thead>
+                    <tbody>{}</tbody>
+                </table>
+            </div>
+            ''',
+            filas
+        )
+
     @display(description="Información de Geometría")
     def geometria_card(self, obj):
         area_str = f'{obj.area_proyecto:.2f} m²' if obj.area_proyecto else 'N/A'
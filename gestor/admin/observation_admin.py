@@ -0,0 +1,75 @@
+from django.contrib import admin
+from django.urls import reverse
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+from unfold.admin import ModelAdmin
+from unfold.contrib.filters.admin import ChoicesDropdownFilter
+from unfold.decorators import display
+
+from gestor.models import ObservacionTopografica
+
+
+@admin.register(ObservacionTopografica)
+class ObservacionTopograficaAdmin(ModelAdmin):
+    list_display = [
+        'tipo',
+        'desde_link',
+        'hasta_link',
+        'valor_display',
+        'desviacion_display',
+        'residuo_display',
+        'created_at',
+    ]
+
+    list_filter = [
+        ('tipo', ChoicesDropdownFilter),
+        ('equipo_medicion', ChoicesDropdownFilter),
+        ('proyecto', admin.RelatedOnlyFieldListFilter),
+    ]
+
+    search_fields = ['desde__numero_punto', 'hasta__numero_punto', 'proyecto__codigo']
+
+    autocomplete_fields = ['desde', 'hasta']
+    list_select_related = ['desde', 'hasta']
+    readonly_fields = ['residuo']
+
+    fieldsets = (
+        ('Observación', {
+            'fields': (
+                'proyecto',
+                ('desde', 'hasta'),
+                'tipo',
+                ('valor', 'desviacion_estandar'),
+                'equipo_medicion',
+            ),
+        }),
+        ('Ajuste', {
+            'fields': ('residuo',),
+        }),
+    )
+
+    @display(description="Desde", ordering="desde__numero_punto")
+    def desde_link(self, obj):
+        url = reverse('admin:gestor_puntocontrol_change', args=[obj.desde_id])
+        return format_html('<a href="{}">{}</a>', url, obj.desde.numero_punto)
+
+    @display(description="Hasta", ordering="hasta__numero_punto")
+    def hasta_link(self, obj):
+        url = reverse('admin:gestor_puntocontrol_change', args=[obj.hasta_id])
+        return format_html('<a href="{}">{}</a>', url, obj.hasta.numero_punto)
+
+    @display(description="Valor", ordering="valor")
+    def valor_display(self, obj):
+        return f'{obj.valor:.4f} m'
+
+    @display(description="σ")
+    def desviacion_display(self, obj):
+        if obj.desviacion_estandar is None:
+            return mark_safe('<span class="text-muted">Equipo</span>')
+        return f'±{obj.desviacion_estandar} cm'
+
+    @display(description="Residuo", ordering="residuo")
+    def residuo_display(self, obj):
+        if obj.residuo is None:
+            return mark_safe('<span class="text-muted">Sin ajustar</span>')
+        return f'{obj.residuo * 1000:.1f} mm'
@@ -12,8 +12,10 @@ from unfold.contrib.filters.admin import (
 )
 from unfold.decorators import display
 
-from gestor.models import Proyecto
-from gestor.views import ProyectoDashboardView, ProyectoMapsView, ProyectoExplorerView, ProyectoDataAPIView
+from gestor.models import Proyecto, VolumenTerraceria
+from gestor.services import encolar, programar_calculos
+from gestor.views import ProyectoDashboardView, ProyectoMapsView, ProyectoExplorerView, ProyectoDataAPIView, \
+    ProyectoCurvaSAPIView, ProyectoCoordenadasAPIView, ProyectoPuntosCercanosAPIView
 from .resorce import ProyectoResource
 
 
@@ -78,7 +80,7 @@ class ProyectoAdmin(ModelAdmin, ImportExportModelAdmin):
         }),
     )
 
-    actions = ['exportar_dashboard', 'calcular_volumenes']
+    actions = ['exportar_dashboard', 'calcular_volumenes', 'ajustar_red', 'purgar_proyectos']
 
     @display(description='Codigo',ordering='codigo')
     def codigo_link(self, obj):
@@ -452,6 +454,27 @@ class ProyectoAdmin(ModelAdmin, ImportExportModelAdmin):
                 ),
                 name='proyecto_mapa',
             ),
+            path(
+                '<path:object_id>/curva-s/',
+                self.admin_site.admin_view(
+                    ProyectoCurvaSAPIView.as_view(model_admin=self)
+                ),
+                name='proyecto_curva_s',
+            ),
+            path(
+                '<path:object_id>/coordenadas/',
+                self.admin_site.admin_view(
+                    ProyectoCoordenadasAPIView.as_view(model_admin=self)
+                ),
+                name='proyecto_coordenadas',
+            ),
+            path(
+                '<path:object_id>/puntos-cercanos/',
+                self.admin_site.admin_view(
+                    ProyectoPuntosCercanosAPIView.as_view(model_admin=self)
+                ),
+                name='proyecto_puntos_cercanos',
+            ),
             path(
                 'explorer/',
                 self.admin_site.admin_view(
@@ -480,8 +503,53 @@ class ProyectoAdmin(ModelAdmin, ImportExportModelAdmin):
 
     @admin.action(description="📐 Calcular volúmenes de terracería")
     def calcular_volumenes(self, request, queryset):
+        programados = programar_calculos(VolumenTerraceria.objects.filter(proyecto__in=queryset.values('pk')))
         self.message_user(
             request,
-            f"✓ Volúmenes calculados para {queryset.count()} proyecto(s)",
-            level='success'
+            format_html(
+                '{} cálculo(s) de volúmenes programado(s) en segundo plano: <a href="{}">ver progreso</a>',
+                programados,
+                reverse('admin:volumen_calculos')
+            ),
+            level='info'
+        )
+
+    @admin.action(description="🎯 Ajustar red de puntos de control")
+    def ajustar_red(self, request, queryset):
+        proyectos = list(queryset.only('id', 'codigo'))
+        for proyecto in proyectos:
+            encolar(
+                'ajustar_red',
+                descripcion=f'Ajuste de red del proyecto {proyecto.codigo}',
+                usuario=request.user,
+                proyecto_id=str(proyecto.pk),
+            )
+        self.message_user(
+            request,
+            format_html(
+                '{} ajuste(s) programado(s) en segundo plano: <a href="{}">ver progreso</a>',
+                len(proyectos),
+                reverse('admin:gestor_tareafondo_changelist')
+            ),
+            level='info'
+        )
+
+    @admin.action(description="🗑️ Purgar proyectos en segundo plano", permissions=['delete'])
+    def purgar_proyectos(self, request, queryset):
+        proyectos = list(queryset.only('id', 'codigo'))
+        for proyecto in proyectos:
+            encolar(
+                'purgar_proyecto',
+                descripcion=f'Purga del proyecto {proyecto.codigo}',
+                usuario=request.user,
+                proyecto_id=str(proyecto.pk),
+            )
+        self.message_user(
+            request,
+            format_html(
+                '{} purga(s) programada(s) en segundo plano: <a href="{}">ver progreso</a>',
+                len(proyectos),
+                reverse('admin:gestor_tareafondo_changelist')
+            ),
+            level='info'
         )
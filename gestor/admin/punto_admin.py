@@ -1,8 +1,7 @@
 from django.contrib import admin
 from django.template.loader import render_to_string
 from django.urls import reverse
-from django.utils import timezone
-from django.utils.html import format_html
+from django.utils.html import format_html, json_script
 from django.utils.safestring import mark_safe
 from unfold.admin import ModelAdmin
 from unfold.contrib.filters.admin import (
@@ -12,6 +11,8 @@ from unfold.contrib.filters.admin import (
 from unfold.decorators import display
 
 from gestor.models import PuntoControl
+from gestor.services import encolar
+from gestor.views import superficies_mapa
 
 
 @admin.register(PuntoControl)
@@ -186,9 +187,9 @@ class PuntoControlAdmin(ModelAdmin):
                 <tr>
                     <td style="padding: 0.5rem;"><strong>WGS84</strong></td>
                     <td style="padding: 0.5rem; font-family: monospace;">
-                        Lat: {:.6f}°<br/>
-                        Lon: {:.6f}°<br/>
-                        Elev: {:.3f}m
+                        Lat: {}°<br/>
+                        Lon: {}°<br/>
+                        Elev: {}m
                     </td>
                 </tr>
                 <tr style="background: #f8f9fa;">
@@ -198,11 +199,33 @@ class PuntoControlAdmin(ModelAdmin):
                         Vertical: ±{}cm
                     </td>
                 </tr>
+                {}
             </table>
             ''',
-            obj.latitud, obj.longitud, obj.elevacion,
+            f'{obj.latitud:.6f}', f'{obj.longitud:.6f}', f'{obj.elevacion:.3f}',
             obj.precision_horizontal or 'N/A',
-            obj.precision_vertical or 'N/A'
+            obj.precision_vertical or 'N/A',
+            self.ajuste_fila(obj)
+        )
+
+    def ajuste_fila(self, obj):
+        if obj.ajustado_en is None:
+            return ''
+        return format_html(
+            '''
+            <tr>
+                <td style="padding: 0.5rem;"><strong>Ajustado</strong><br/><small>{}</small></td>
+                <td style="padding: 0.5rem; font-family: monospace;">
+                    Lat: {}°<br/>
+                    Lon: {}°<br/>
+                    Elev: {}m<br/>
+                    Residuos: H {}mm · V {}mm
+                </td>
+            </tr>
+            ''',
+            obj.ajustado_en.strftime('%d/%m/%Y %H:%M'),
+            f'{obj.latitud_ajustada:.8f}', f'{obj.longitud_ajustada:.8f}', f'{obj.elevacion_ajustada:.3f}',
+            f'{obj.residuo_horizontal * 1000:.1f}', f'{obj.residuo_vertical * 1000:.1f}'
         )
 
     @display(description="Ubicación en Mapa")
@@ -212,24 +235,44 @@ class PuntoControlAdmin(ModelAdmin):
             <div id="map-punto-{}" style="height: 300px; border-radius: 8px;"></div>
             <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
             <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css"/>
+            {}
             <script>
                 var map = L.map('map-punto-{}').setView([{}, {}], 17);
-                L.tileLayer('https://{{s}}.tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png').addTo(map);
+                var base = L.tileLayer('https://{{s}}.tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png', {{maxZoom: 22, maxNativeZoom: 19}}).addTo(map);
+                var superficies = JSON.parse(document.getElementById('superficies-punto-{}').textContent);
+                if (superficies.length) {{
+                    var capas = {{}};
+                    superficies.forEach(function (superficie) {{
+                        capas[superficie.nombre + ' · Elevación'] = L.tileLayer(superficie.capas.elevacion, {{bounds: superficie.limites, maxZoom: 22, opacity: 0.8}});
+                        capas[superficie.nombre + ' · Corte / Relleno'] = L.tileLayer(superficie.capas.corte_relleno, {{bounds: superficie.limites, maxZoom: 22, opacity: 0.8}});
+                    }});
+                    L.control.layers({{'OpenStreetMap': base}}, capas).addTo(map);
+                }}
                 L.marker([{}, {}]).addTo(map)
                     .bindPopup('<b>{}</b><br/>Tipo: {}<br/>Elev: {}m');
             </script>
             ''',
-            obj.pk, obj.pk,
+            obj.pk,
+            json_script(superficies_mapa(obj.proyecto) if obj.proyecto_id else [], f'superficies-punto-{obj.pk}'),
+            obj.pk,
             obj.latitud, obj.longitud,
+            obj.pk,
             obj.latitud, obj.longitud,
             obj.numero_punto, obj.get_tipo_display(), obj.elevacion
         )
 
     @admin.action(description="✓ Validar puntos seleccionados")
     def validar_puntos(self, request, queryset):
-        queryset.update(
-            validado=True,
-            validado_por=request.user,
-            fecha_validacion=timezone.now()
+        tarea = encolar(
+            'validar_puntos',
+            descripcion='Validación de puntos de control',
+            usuario=request.user,
+            queryset=queryset,
+            usuario_id=request.user.pk,
+        )
+        url = reverse('admin:gestor_tareafondo_change', args=[tarea.pk])
+        self.message_user(
+            request,
+            format_html('Validación programada en segundo plano: <a href="{}">ver progreso</a>', url),
+            'info'
         )
-        self.message_user(request, f'{queryset.count()} puntos validados', 'success')
@@ -1,5 +1,7 @@
 from django.utils.safestring import mark_safe
 from django.contrib import admin
+from django.http import StreamingHttpResponse
+from django.urls import path
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.html import format_html
@@ -15,6 +17,9 @@ from unfold.contrib.filters.admin import (
     ChoicesDropdownFilter,
 )
 from gestor.models import ReporteAvance
+from gestor.services import encolar, miniatura_de
+from gestor.services.exportacion_service import FORMATOS, LIMITE_DESCARGA_DIRECTA, exportar_en_bloques
+from gestor.views import ReporteExportacionView
 
 @admin.register(ReporteAvance)
 class ReporteAvanceAdmin(ModelAdmin):
@@ -26,11 +31,13 @@ class ReporteAvanceAdmin(ModelAdmin):
         'cuadrilla_display',
         'reportado_por_display',
         'validado_badge',
+        'geocerca_badge',
         'ver_foto',
     ]
 
     list_filter = [
         'validado',
+        'fuera_de_geocerca',
         ('fecha', RangeDateFilter),
         ('elemento__proyecto', admin.RelatedOnlyFieldListFilter),
         ('avance_porcentaje', RangeNumericFilter),
@@ -43,6 +50,7 @@ class ReporteAvanceAdmin(ModelAdmin):
         'hora',
         'foto_preview',
         'mapa_ubicacion',
+        'geocerca_display',
     ]
 
     fieldsets = (
@@ -58,6 +66,7 @@ class ReporteAvanceAdmin(ModelAdmin):
         ('Ubicación', {
             'fields': (
                 ('latitud', 'longitud'),
+                'geocerca_display',
                 'mapa_ubicacion',
             ),
             'classes': ['tab'],
@@ -92,7 +101,20 @@ class ReporteAvanceAdmin(ModelAdmin):
         }),
     )
 
-    actions = ['validar_reportes', 'exportar_reportes']
+    actions = ['validar_reportes', 'verificar_geocerca', 'exportar_reportes', 'exportar_reportes_csv']
+
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path(
+                'exportaciones/<uuid:tarea_id>/',
+                self.admin_site.admin_view(
+                    ReporteExportacionView.as_view(model_admin=self)
+                ),
+                name='reporte_exportacion',
+            ),
+        ]
+        return custom_urls + urls
 
     @display(description="Elemento")
     def elemento_codigo(self, obj):
@@ -147,23 +169,54 @@ class ReporteAvanceAdmin(ModelAdmin):
             )
         return mark_safe('<span class="badge badge-warning">Pendiente</span>')
 
-    @display(description="Foto")
-    def ver_foto(self, obj):
-        if obj.foto:
+    @display(description="Geocerca", ordering="distancia_elemento_m")
+    def geocerca_badge(self, obj):
+        if obj.distancia_elemento_m is None:
+            return mark_safe('<span class="text-muted">-</span>')
+        if obj.fuera_de_geocerca:
             return format_html(
-                '<a href="{}" target="_blank"> Ver</a>',
-                obj.foto.url
+                '<span class="badge badge-danger" title="Reportado lejos del elemento">⚠ {} m</span>',
+                f'{obj.distancia_elemento_m:.0f}'
             )
-        return mark_safe('<span class="text-muted">Sin foto</span>')
+        return format_html('<span class="badge badge-success">{} m</span>', f'{obj.distancia_elemento_m:.0f}')
+
+    @display(description="Distancia al Elemento")
+    def geocerca_display(self, obj):
+        if obj.distancia_elemento_m is None:
+            return "Sin verificar"
+        estado = 'Fuera de la geocerca' if obj.fuera_de_geocerca else 'Dentro de la geocerca'
+        return f'{obj.distancia_elemento_m:.2f} m - {estado}'
+
+    @display(description="Foto")
+    def ver_foto(self, obj):
+        if not obj.foto:
+            return mark_safe('<span class="text-muted">Sin foto</span>')
+        miniatura = miniatura_de(obj, 48)
+        if miniatura is None:
+            return format_html('<a href="{}" target="_blank"> Ver</a>', obj.foto.url)
+        return format_html(
+            '<a href="{}" target="_blank"><picture><source srcset="{}" type="image/webp">'
+            '<img src="{}" width="48" height="{}" loading="lazy" style="border-radius: 4px; object-fit: cover;"></picture></a>',
+            obj.foto.url, miniatura['webp'], miniatura['jpg'], round(48 * miniatura['alto'] / miniatura['ancho'])
+        )
 
     @display(description="Vista Previa de Foto")
     def foto_preview(self, obj):
-        if obj.foto:
+        if not obj.foto:
+            return mark_safe('<span class="text-muted">Sin foto cargada</span>')
+        miniatura = miniatura_de(obj, 400)
+        if miniatura is None:
+            # Las variantes aún no se generan: se muestra la original
             return format_html(
                 '<img src="{}" style="max-width: 400px; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">',
                 obj.foto.url
             )
-        return mark_safe('<span class="text-muted">Sin foto cargada</span>')
+        return format_html(
+            '<a href="{}" target="_blank"><picture><source srcset="{}" type="image/webp">'
+            '<img src="{}" width="{}" height="{}" style="max-width: 400px; height: auto; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">'
+            '</picture></a>',
+            obj.foto.url, miniatura['webp'], miniatura['jpg'], miniatura['ancho'], miniatura['alto']
+        )
 
     @display(description="Ubicación del Reporte")
     def mapa_ubicacion(self, obj):
@@ -195,13 +248,71 @@ class ReporteAvanceAdmin(ModelAdmin):
 
     @admin.action(description="✓ Validar reportes seleccionados")
     def validar_reportes(self, request, queryset):
-        updated = queryset.update(
-            validado=True,
-            validado_por=request.user
+        tarea = encolar(
+            'validar_reportes',
+            descripcion='Validación de reportes de avance',
+            usuario=request.user,
+            queryset=queryset,
+            usuario_id=request.user.pk,
+        )
+        url = reverse('admin:gestor_tareafondo_change', args=[tarea.pk])
+        self.message_user(
+            request,
+            format_html('Validación programada en segundo plano: <a href="{}">ver progreso</a>', url),
+            'info'
+        )
+
+    @admin.action(description="📍 Verificar geocerca")
+    def verificar_geocerca(self, request, queryset):
+        tarea = encolar(
+            'verificar_geocerca',
+            descripcion='Verificación de geocerca de reportes',
+            usuario=request.user,
+            queryset=queryset,
+        )
+        url = reverse('admin:gestor_tareafondo_change', args=[tarea.pk])
+        self.message_user(
+            request,
+            format_html('Verificación programada en segundo plano: <a href="{}">ver progreso</a>', url),
+            'info'
         )
-        self.message_user(request, f'{updated} reportes validados', 'success')
+
+    def exportar(self, request, queryset, formato):
+        """
+        Hasta LIMITE_DESCARGA_DIRECTA reportes se descargan en streaming; con
+        más la exportación se genera en segundo plano y se descarga al terminar.
+        """
+        total = queryset.count()
+        if total > LIMITE_DESCARGA_DIRECTA:
+            tarea = encolar(
+                'exportar_reportes',
+                descripcion=f'Exportación de {total:,} reportes de avance ({formato.upper()})',
+                usuario=request.user,
+                queryset=queryset,
+                formato=formato,
+            )
+            self.message_user(
+                request,
+                format_html(
+                    'Exportación programada en segundo plano: <a href="{}">ver progreso</a>. '
+                    'Al terminar se descarga <a href="{}">aquí</a>.',
+                    reverse('admin:gestor_tareafondo_change', args=[tarea.pk]),
+                    reverse('admin:reporte_exportacion', args=[tarea.pk]),
+                ),
+                'info'
+            )
+            return None
+
+        respuesta = StreamingHttpResponse(exportar_en_bloques(queryset, formato), content_type=FORMATOS[formato])
+        respuesta['Content-Disposition'] = (
+            f'attachment; filename="reportes_avance_{timezone.localtime():%Y%m%d_%H%M}.{formato}"'
+        )
+        return respuesta
 
     @admin.action(description="📄 Exportar reportes a Excel")
     def exportar_reportes(self, request, queryset):
-        # Implementar exportación
-        self.message_user(request, f'{queryset.count()} reportes exportados', 'success')
+        return self.exportar(request, queryset, 'xlsx')
+
+    @admin.action(description="📄 Exportar reportes a CSV")
+    def exportar_reportes_csv(self, request, queryset):
+        return self.exportar(request, queryset, 'csv')
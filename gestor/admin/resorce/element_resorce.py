@@ -1,4 +1,5 @@
-from gestor.models import ElementoConstructivo
+from gestor.models import ElementoConstructivo, Proyecto
+from gestor.services.utm_service import convertir_lote
 from import_export import resources, fields
 
 class ElementoResource(resources.ModelResource):
@@ -12,3 +13,45 @@ class ElementoResource(resources.ModelResource):
         fields = ('codigo', 'nombre', 'tipo', 'proyecto_codigo', 'latitud',
                   'longitud', 'estado', 'porcentaje_avance')
 
+    def before_import(self, dataset, **kwargs):
+        """Convierte a UTM todas las filas del archivo en una sola operación"""
+        super().before_import(dataset, **kwargs)
+        self.utm_filas = {}
+        if not {'latitud', 'longitud'} <= set(dataset.headers or []):
+            return
+
+        codigos = dataset['proyecto_codigo'] if 'proyecto_codigo' in dataset.headers else [None] * len(dataset)
+        zonas = {
+            codigo: (zona, hemisferio)
+            for codigo, zona, hemisferio in Proyecto.objects.filter(codigo__in=set(codigos)).values_list(
+                'codigo', 'zona_utm', 'hemisferio'
+            )
+        }
+
+        filas, latitudes, longitudes, configuracion = [], [], [], []
+        for numero, (latitud, longitud, codigo) in enumerate(
+            zip(dataset['latitud'], dataset['longitud'], codigos), 1
+        ):
+            try:
+                latitud, longitud = float(latitud), float(longitud)
+            except (TypeError, ValueError):
+                # Se deja para la validación normal de la fila
+                continue
+            filas.append(numero)
+            latitudes.append(latitud)
+            longitudes.append(longitud)
+            configuracion.append(zonas.get(codigo, (None, None)))
+
+        este, norte, zona, _ = convertir_lote(
+            latitudes, longitudes, [z for z, _ in configuracion], [h for _, h in configuracion]
+        )
+        for numero, lat, lon, e, n, z in zip(filas, latitudes, longitudes, este.tolist(), norte.tolist(), zona.tolist()):
+            self.utm_filas[numero] = (lat, lon, e, n, z)
+
+    def before_save_instance(self, instance, row, **kwargs):
+        """Asigna la UTM precalculada; save() solo recalcula si no coincide"""
+        super().before_save_instance(instance, row, **kwargs)
+        utm = getattr(self, 'utm_filas', {}).get(kwargs.get('row_number'))
+        if utm is None or (instance.latitud, instance.longitud) != utm[:2]:
+            return
+        instance.fijar_utm(*utm[2:])
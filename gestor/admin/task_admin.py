@@ -0,0 +1,124 @@
+from django.contrib import admin
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.html import format_html
+from unfold.admin import ModelAdmin
+from unfold.contrib.filters.admin import (
+    RangeDateFilter,
+    ChoicesDropdownFilter,
+)
+from unfold.decorators import display
+
+from gestor.models import TareaFondo
+from gestor.services import reanudar
+
+
+@admin.register(TareaFondo)
+class TareaFondoAdmin(ModelAdmin):
+    list_display = [
+        'descripcion_display',
+        'estado_badge',
+        'progreso_display',
+        'creada_por',
+        'duracion_display',
+        'created_at',
+    ]
+
+    list_filter = [
+        ('estado', ChoicesDropdownFilter),
+        'tipo',
+        ('created_at', RangeDateFilter),
+    ]
+
+    search_fields = ['tipo', 'descripcion']
+
+    readonly_fields = ['progreso_display']
+
+    fieldsets = (
+        ('Tarea', {
+            'fields': ('tipo', 'descripcion', 'estado', 'creada_por', 'parametros'),
+            'classes': ['tab'],
+        }),
+        ('Progreso', {
+            'fields': (
+                'progreso_display',
+                ('total', 'procesados'),
+                'checkpoint',
+                ('iniciada_en', 'finalizada_en'),
+            ),
+            'classes': ['tab'],
+        }),
+        ('Resultado', {
+            'fields': ('resultado', 'error'),
+            'classes': ['tab'],
+        }),
+    )
+
+    actions = ['reanudar_tareas']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @display(description="Tarea", ordering="tipo")
+    def descripcion_display(self, obj):
+        descarga = ''
+        if obj.tipo == 'exportar_reportes' and obj.estado == 'COMPLETADA' and obj.resultado.get('archivo'):
+            descarga = format_html(
+                '<a href="{}" class="text-xs text-primary-600">📥 Descargar</a>',
+                reverse('admin:reporte_exportacion', args=[obj.pk])
+            )
+        return format_html(
+            '''
+            <div class="flex flex-col gap-1">
+                <span class="font-semibold text-base-900 dark:text-base-100">{}</span>
+                <span class="text-xs text-base-500 dark:text-base-400">{}</span>
+                {}
+            </div>
+            ''',
+            obj.descripcion or obj.tipo,
+            obj.tipo,
+            descarga
+        )
+
+    @display(description="Estado", ordering="estado")
+    def estado_badge(self, obj):
+        colores = {
+            'PENDIENTE': 'info',
+            'EJECUCION': 'warning',
+            'COMPLETADA': 'success',
+            'FALLIDA': 'danger',
+        }
+        html_badge = render_to_string(
+            "unfold/helpers/label.html",
+            {
+                'text': obj.get_estado_display(),
+                'type': colores.get(obj.estado, 'info'),
+            }
+        )
+        return format_html("{}", html_badge)
+
+    @display(description="Progreso")
+    def progreso_display(self, obj):
+        html_progress = render_to_string(
+            "unfold/components/progress.html",
+            {
+                'description': f'{obj.procesados:,} / {obj.total:,} ({obj.porcentaje}%)',
+                'value': obj.porcentaje,
+            }
+        )
+        return format_html("{}", html_progress)
+
+    @display(description="Duración")
+    def duracion_display(self, obj):
+        if not obj.iniciada_en:
+            return '-'
+        fin = obj.finalizada_en or obj.updated_at
+        return f'{(fin - obj.iniciada_en).total_seconds():,.1f} s'
+
+    @admin.action(description="🔁 Reanudar tareas seleccionadas")
+    def reanudar_tareas(self, request, queryset):
+        reencoladas = reanudar(queryset)
+        self.message_user(request, f'{reencoladas} tareas reencoladas', 'success')
@@ -0,0 +1,130 @@
+from django.contrib import admin
+from django.template.loader import render_to_string
+from django.urls import path
+from django.utils.html import format_html
+from unfold.admin import ModelAdmin
+from unfold.contrib.filters.admin import (
+    RangeDateFilter,
+    ChoicesDropdownFilter,
+)
+from unfold.decorators import display
+
+from gestor.models import CargaArchivo
+from gestor.services.cargas_service import cancelar_cargas
+from gestor.views import CargaArchivoAPIView, CargaFragmentoAPIView
+
+
+@admin.register(CargaArchivo)
+class CargaArchivoAdmin(ModelAdmin):
+    list_display = [
+        'nombre_display',
+        'estado_badge',
+        'progreso_display',
+        'creada_por',
+        'created_at',
+    ]
+
+    list_filter = [
+        ('estado', ChoicesDropdownFilter),
+        'destino',
+        ('created_at', RangeDateFilter),
+    ]
+
+    search_fields = ['nombre_archivo', 'archivo_final']
+
+    readonly_fields = ['progreso_display']
+
+    fieldsets = (
+        ('Carga', {
+            'fields': ('nombre_archivo', 'destino', 'objeto_id', 'estado', 'creada_por'),
+            'classes': ['tab'],
+        }),
+        ('Progreso', {
+            'fields': (
+                'progreso_display',
+                ('tamano_total', 'recibido', 'fragmentos'),
+                'sha256',
+                'completada_en',
+            ),
+            'classes': ['tab'],
+        }),
+        ('Resultado', {
+            'fields': ('archivo_final', 'error'),
+            'classes': ['tab'],
+        }),
+    )
+
+    actions = ['cancelar']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path(
+                'api/',
+                self.admin_site.admin_view(
+                    CargaArchivoAPIView.as_view(model_admin=self)
+                ),
+                name='carga_archivo_api',
+            ),
+            path(
+                'api/<uuid:carga_id>/',
+                self.admin_site.admin_view(
+                    CargaFragmentoAPIView.as_view(model_admin=self)
+                ),
+                name='carga_fragmento_api',
+            ),
+        ]
+        return custom_urls + urls
+
+    @display(description="Archivo", ordering="nombre_archivo")
+    def nombre_display(self, obj):
+        return format_html(
+            '''
+            <div class="flex flex-col gap-1">
+                <span class="font-semibold text-base-900 dark:text-base-100">{}</span>
+                <span class="text-xs text-base-500 dark:text-base-400">{}</span>
+            </div>
+            ''',
+            obj.nombre_archivo,
+            obj.get_destino_display()
+        )
+
+    @display(description="Estado", ordering="estado")
+    def estado_badge(self, obj):
+        colores = {
+            'EN_CURSO': 'warning',
+            'COMPLETADA': 'success',
+            'FALLIDA': 'danger',
+            'CANCELADA': 'info',
+        }
+        html_badge = render_to_string(
+            "unfold/helpers/label.html",
+            {
+                'text': obj.get_estado_display(),
+                'type': colores.get(obj.estado, 'info'),
+            }
+        )
+        return format_html("{}", html_badge)
+
+    @display(description="Progreso")
+    def progreso_display(self, obj):
+        html_progress = render_to_string(
+            "unfold/components/progress.html",
+            {
+                'description': f'{obj.recibido / 1024 ** 2:,.1f} / {obj.tamano_total / 1024 ** 2:,.1f} MB '
+                               f'({obj.porcentaje}%, {obj.fragmentos} fragmentos)',
+                'value': obj.porcentaje,
+            }
+        )
+        return format_html("{}", html_progress)
+
+    @admin.action(description="✖ Cancelar cargas en curso")
+    def cancelar(self, request, queryset):
+        canceladas = cancelar_cargas(queryset)
+        self.message_user(request, f'{canceladas} cargas canceladas', 'success')
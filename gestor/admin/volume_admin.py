@@ -1,8 +1,9 @@
 
 from django.contrib import admin
-from django.urls import reverse
+from django.template.loader import render_to_string
+from django.urls import path, reverse
 from django.utils import timezone
-from django.utils.html import format_html
+from django.utils.html import format_html, format_html_join
 from django.utils.safestring import mark_safe
 from unfold.admin import ModelAdmin
 from unfold.contrib.filters.admin import (
@@ -12,6 +13,8 @@ from unfold.contrib.filters.admin import (
 from unfold.decorators import display
 
 from gestor.models import VolumenTerraceria
+from gestor.services import programar_calculos, reanudar_calculos
+from gestor.views import VolumenCalculosView, VolumenDiferenciaRasterView, VolumenTeselaView
 
 @admin.register(VolumenTerraceria)
 class VolumenTerraceriaAdmin(ModelAdmin):
@@ -22,18 +25,28 @@ class VolumenTerraceriaAdmin(ModelAdmin):
         'area_display',
         'volumenes_display',
         'balance_badge',
+        'estado_calculo_badge',
         'fecha_calculo_display',
     ]
 
     list_filter = [
         ('metodo_calculo', ChoicesDropdownFilter),
+        ('estado_calculo', ChoicesDropdownFilter),
         ('fecha_calculo', RangeDateFilter),
         ('proyecto', admin.RelatedOnlyFieldListFilter),
     ]
 
     search_fields = ['nombre', 'descripcion', 'proyecto__codigo']
 
-    readonly_fields = ['fecha_calculo', 'grafica_volumenes', 'resumen_calculo']
+    autocomplete_fields = ['levantamiento_base']
+
+    readonly_fields = [
+        'fecha_calculo', 'grafica_volumenes', 'resumen_calculo', 'raster_diferencia',
+        'estado_calculo', 'progreso_calculo_display', 'calculo_iniciado_en', 'calculo_finalizado_en',
+        'duracion_calculo_s', 'error_calculo', 'detalle_calculo',
+    ]
+
+    actions = ['recalcular_volumenes', 'reanudar_calculos']
 
     fieldsets = (
         ('Información General', {
@@ -51,12 +64,53 @@ class VolumenTerraceriaAdmin(ModelAdmin):
         ('Datos del Levantamiento', {
             'fields': (
                 'archivo_levantamiento',
+                ('levantamiento_base', 'raster_diferencia'),
+                ('archivo_diseno', 'elevacion_diseno'),
+                ('tamano_celda_m', 'intervalo_curvas_m', 'correccion_prismoidal'),
+                ('coeficiente_variabilidad', 'acarreo_libre_m'),
                 'calculado_por',
                 'fecha_calculo',
             ),
         }),
+        ('Cálculo en Segundo Plano', {
+            'fields': (
+                ('estado_calculo', 'progreso_calculo_display'),
+                ('calculo_iniciado_en', 'calculo_finalizado_en', 'duracion_calculo_s'),
+                'detalle_calculo',
+                'error_calculo',
+            ),
+            'classes': ['collapse'],
+        }),
     )
 
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path(
+                'calculos/',
+                self.admin_site.admin_view(
+                    VolumenCalculosView.as_view(model_admin=self)
+                ),
+                name='volumen_calculos',
+            ),
+            path(
+                '<path:object_id>/diferencia.asc',
+                self.admin_site.admin_view(
+                    VolumenDiferenciaRasterView.as_view(model_admin=self)
+                ),
+                name='volumen_diferencia_raster',
+            ),
+            path(
+                '<path:object_id>/teselas/<str:capa>/<int:z>/<int:x>/<int:y>.png',
+                # cacheable: admin_view marcaría la respuesta como never_cache
+                self.admin_site.admin_view(
+                    VolumenTeselaView.as_view(model_admin=self), cacheable=True
+                ),
+                name='volumen_tesela',
+            ),
+        ]
+        return custom_urls + urls
+
     @display(description="Proyecto")
     def proyecto_link(self, obj):
         url = reverse('admin:gestor_proyecto_change', args=[obj.proyecto.pk])
@@ -69,6 +123,7 @@ class VolumenTerraceriaAdmin(ModelAdmin):
             'GRID': '⊞',
             'TIN': '▲',
             'CURVAS': '〰️',
+            'DIFERENCIA': '⇅',
         }
         return format_html(
             '{} {}',
@@ -114,6 +169,47 @@ class VolumenTerraceriaAdmin(ModelAdmin):
                 f'{abs(neto):,.0f}'
             )
 
+    @display(description="Ráster de diferencia")
+    def raster_diferencia(self, obj):
+        if not obj.pk or obj.levantamiento_base_id is None:
+            return '-'
+        return format_html(
+            '<a href="{}" class="text-primary-600 dark:text-primary-500">⬇️ Descargar diferencia por celda (ESRI ASCII, cuadrícula LOCAL)</a>',
+            reverse('admin:volumen_diferencia_raster', args=[obj.pk])
+        )
+
+    @display(description="Cálculo", ordering="estado_calculo")
+    def estado_calculo_badge(self, obj):
+        colores = {
+            'SIN_CALCULO': 'info',
+            'PENDIENTE': 'info',
+            'EJECUCION': 'warning',
+            'COMPLETADO': 'success',
+            'FALLIDO': 'danger',
+        }
+        texto = obj.get_estado_calculo_display()
+        if obj.estado_calculo == 'EJECUCION':
+            texto = f'{texto} {obj.progreso_calculo}%'
+        html_badge = render_to_string(
+            "unfold/helpers/label.html",
+            {
+                'text': texto,
+                'type': colores.get(obj.estado_calculo, 'info'),
+            }
+        )
+        return format_html("{}", html_badge)
+
+    @display(description="Progreso")
+    def progreso_calculo_display(self, obj):
+        html_progress = render_to_string(
+            "unfold/components/progress.html",
+            {
+                'description': f'{obj.get_estado_calculo_display()} ({obj.progreso_calculo}%)',
+                'value': obj.progreso_calculo,
+            }
+        )
+        return format_html("{}", html_progress)
+
     @display(description="Fecha", ordering="fecha_calculo")
     def fecha_calculo_display(self, obj):
         return obj.fecha_calculo.strftime('%d/%m/%Y %H:%M')
@@ -127,7 +223,7 @@ class VolumenTerraceriaAdmin(ModelAdmin):
         porc_corte = (corte / total * 100) if total > 0 else 0
         porc_relleno = (relleno / total * 100) if total > 0 else 0
 
-        return format_html(
+        barra = format_html(
             '''
             <div style="margin: 1rem 0;width: 100%;">
                 <div style="display: flex; height: 40px; border-radius: 8px; overflow: hidden;width: 100%;">
@@ -144,10 +240,62 @@ class VolumenTerraceriaAdmin(ModelAdmin):
                 </div>
             </div>
             ''',
-            f'{porc_corte:.0f}', f'{porc_corte:.0f}',
-            f'{porc_relleno:.0f}', f'{porc_relleno:.0f}',
+            f'{porc_corte:.0f}', f'{porc_relleno:.0f}',
             f'{corte:.0f}', f'{relleno:.0f}'
         )
+        masa = (obj.detalle_calculo or {}).get('masa')
+        if not masa:
+            return barra
+        return format_html('{}{}', barra, self.diagrama_masas(masa))
+
+    def diagrama_masas(self, masa):
+        """Curva masa en SVG: ordenadas acumuladas por estación, línea cero y puntos de balance"""
+        ancho, alto, margen = 600, 200, 10
+        estaciones, ordenadas = masa['estaciones'], masa['ordenadas']
+        inicio, fin = estaciones[0], estaciones[-1]
+        minimo, maximo = min(min(ordenadas), 0), max(max(ordenadas), 0)
+        escala_x = (ancho - 2 * margen) / ((fin - inicio) or 1)
+        escala_y = (alto - 2 * margen) / ((maximo - minimo) or 1)
+
+        def punto(estacion, ordenada):
+            return f'{margen + (estacion - inicio) * escala_x:.1f},{alto - margen - (ordenada - minimo) * escala_y:.1f}'
+
+        cero = alto - margen - (0 - minimo) * escala_y
+        balances = format_html_join(
+            '', '<circle cx="{}" cy="{}" r="4" fill="#16a34a"><title>Balance {} m</title></circle>',
+            (
+                (f'{margen + (estacion - inicio) * escala_x:.1f}', f'{cero:.1f}', f'{estacion:,.2f}')
+                for estacion in masa['puntos_balance']
+            )
+        )
+        return format_html(
+            '''
+            <div style="margin: 1rem 0;width: 100%;">
+                <div style="font-weight: 600; margin-bottom: 0.5rem;">Diagrama de masas (coeficiente {}, acarreo libre {} m)</div>
+                <svg viewBox="0 0 {} {}" preserveAspectRatio="none" style="width: 100%; height: 200px;" class="border border-base-200 dark:border-base-700 rounded-lg">
+                    <line x1="{}" y1="{}" x2="{}" y2="{}" stroke="#94a3b8" stroke-dasharray="4 4"/>
+                    <polyline points="{}" fill="none" stroke="#dc2626" stroke-width="2" vector-effect="non-scaling-stroke"/>
+                    {}
+                </svg>
+                <div style="display: flex; justify-content: space-between; margin-top: 0.5rem; font-size: 0.875rem;">
+                    <div>🟢 {} punto(s) de balance</div>
+                    <div>🚚 Acarreo libre: {} m³</div>
+                    <div>🚛 Sobreacarreo: {} m³ ({} m³·m)</div>
+                    <div>{}</div>
+                </div>
+            </div>
+            ''',
+            f'{masa["coeficiente"]:g}', f'{masa["acarreo_libre_m"]:g}',
+            ancho, alto,
+            margen, f'{cero:.1f}', ancho - margen, f'{cero:.1f}',
+            ' '.join(punto(estacion, ordenada) for estacion, ordenada in zip(estaciones, ordenadas)),
+            balances,
+            len(masa['puntos_balance']),
+            f'{masa["volumen_acarreo_libre_m3"]:,.0f}',
+            f'{masa["volumen_sobreacarreo_m3"]:,.0f}', f'{masa["sobreacarreo_m3_m"]:,.0f}',
+            f'⬇️ Faltante (préstamo): {masa["faltante_m3"]:,.0f} m³' if masa['faltante_m3']
+            else f'⬆️ Sobrante (desperdicio): {masa["sobrante_m3"]:,.0f} m³',
+        )
 
     @display(description="Resumen del Cálculo")
     def resumen_calculo(self, obj):
@@ -230,4 +378,22 @@ class VolumenTerraceriaAdmin(ModelAdmin):
             badge_color,  # Pasamos las clases del badge
             tipo_balance_str,
             metodo_str
-        )
\ No newline at end of file
+        )
+
+    @admin.action(description="📐 Recalcular desde el levantamiento")
+    def recalcular_volumenes(self, request, queryset):
+        programados = programar_calculos(queryset)
+        self.message_user(
+            request,
+            format_html(
+                '{} cálculo(s) programado(s) en segundo plano: <a href="{}">ver progreso</a>',
+                programados,
+                reverse('admin:volumen_calculos')
+            ),
+            level='info'
+        )
+
+    @admin.action(description="🔁 Reanudar cálculos fallidos o interrumpidos")
+    def reanudar_calculos(self, request, queryset):
+        reprogramados = reanudar_calculos(queryset)
+        self.message_user(request, f'{reprogramados} cálculos reprogramados', 'success')
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GestorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gestor'
+
+    def ready(self):
+        from gestor import signals  # noqa: F401
@@ -1,63 +1,98 @@
-from django.core.management.base import BaseCommand
-import requests
-from gestor.models import ElementoConstructivo
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from gestor.models import TareaFondo
+from gestor.services import encolar, ejecutar
+from gestor.services.utm_backfill_service import MODELOS_UTM
 
 
 class Command(BaseCommand):
-    help = 'Actualiza coordenadas UTM de todos los elementos'
+    help = 'Calcula las coordenadas UTM faltantes o desactualizadas de elementos, puntos y reportes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=2000,
+            help='Filas por lote de conversión y bulk_update'
+        )
+        parser.add_argument(
+            '--procesos',
+            type=int,
+            default=0,
+            help='Procesos en paralelo (0 = en este proceso)'
+        )
+        parser.add_argument(
+            '--modelos',
+            nargs='+',
+            choices=list(MODELOS_UTM),
+            default=list(MODELOS_UTM),
+            help='Modelos a actualizar'
+        )
+        parser.add_argument(
+            '--todos',
+            action='store_true',
+            help='Recalcula todas las filas, no solo las pendientes'
+        )
+        parser.add_argument(
+            '--reiniciar',
+            action='store_true',
+            help='Ignora una ejecución anterior sin terminar y empieza de cero'
+        )
 
     def handle(self, *args, **options):
+        tarea = None
+        if not options['reiniciar']:
+            tarea = (
+                TareaFondo.objects
+                .filter(tipo='actualizar_utm', estado__in=['PENDIENTE', 'EJECUCION', 'FALLIDA'])
+                .order_by('-created_at')
+                .first()
+            )
+
+        if tarea is not None and tarea.estado == 'EJECUCION':
+            raise CommandError(
+                f'La actualización {tarea.pk} ya está en ejecución; espera a que termine '
+                'o usa --reiniciar si el proceso que la ejecutaba se detuvo'
+            )
+        if tarea is not None and (
+            set(tarea.parametros.get('modelos') or MODELOS_UTM) != set(options['modelos'])
+            or tarea.parametros.get('todos', False) != options['todos']
+        ):
+            raise CommandError(
+                f'La actualización sin terminar {tarea.pk} usa otras opciones '
+                f'(modelos: {" ".join(tarea.parametros.get("modelos") or MODELOS_UTM)}, '
+                f'todos: {"sí" if tarea.parametros.get("todos") else "no"}); '
+                'repítelas para reanudarla o usa --reiniciar'
+            )
+
+        if tarea is not None:
+            self.stdout.write(f'♻️  Reanudando desde {tarea.checkpoint or "el inicio"} ({tarea.procesados:,} filas ya procesadas)')
+        else:
+            tarea = encolar(
+                'actualizar_utm',
+                descripcion='Actualización de coordenadas UTM',
+                modelos=options['modelos'],
+                tamano_lote=options['lote'],
+                todos=options['todos'],
+            )
+
+        # Se ejecuta aquí; se marca en ejecución para que el worker no la tome
+        tarea.estado = 'EJECUCION'
+        tarea.iniciada_en = tarea.iniciada_en or timezone.now()
+        tarea.save(update_fields=['estado', 'iniciada_en', 'updated_at'])
+
         self.stdout.write('🔄 Actualizando coordenadas UTM...')
 
-        API_BASE = 'http://localhost:8000/api'
-        elementos = ElementoConstructivo.objects.all()
-
-        # Preparar datos para conversión por lotes
-        coords = []
-        elementos_list = []
-
-        for elemento in elementos:
-            coords.append({
-                'latitude': elemento.latitud,
-                'longitude': elemento.longitud
-            })
-            elementos_list.append(elemento)
-
-        # Convertir en lotes de 100
-        batch_size = 100
-        total_actualizados = 0
-
-        for i in range(0, len(coords), batch_size):
-            batch_coords = coords[i:i + batch_size]
-            batch_elementos = elementos_list[i:i + batch_size]
-
-            try:
-                response = requests.post(
-                    f'{API_BASE}/coordinates/batch-convert/',
-                    json={
-                        'coordinates': batch_coords,
-                        'to_system': 'utm'
-                    },
-                    timeout=30
-                )
-
-                if response.status_code == 200:
-                    resultados = response.json()['results']
-
-                    for elemento, resultado in zip(batch_elementos, resultados):
-                        if 'output' in resultado:
-                            elemento.utm_este = resultado['output']['easting']
-                            elemento.utm_norte = resultado['output']['northing']
-                            elemento.utm_zona = resultado['output']['zone']
-                            elemento.save(update_fields=['utm_este', 'utm_norte', 'utm_zona'])
-                            total_actualizados += 1
-
-                    self.stdout.write(f'  ✓ Lote {i // batch_size + 1}: {len(batch_coords)} elementos')
-                else:
-                    self.stdout.write(self.style.ERROR(f'  ✗ Error en lote {i // batch_size + 1}'))
-
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f'  ✗ Error: {str(e)}'))
-
-        self.stdout.write(self.style.SUCCESS(f'\n✅ {total_actualizados} elementos actualizados'))
+        def progreso(modelo, filas):
+            porcentaje = tarea.procesados / tarea.total * 100 if tarea.total else 100
+            self.stdout.write(f'  ✓ {modelo}: {filas:,} filas ({porcentaje:.0f}%)')
+
+        ejecutar(tarea, procesos=options['procesos'], progreso=progreso)
+
+        if tarea.estado == 'FALLIDA':
+            self.stdout.write(self.style.ERROR(f'\n✗ Error, se puede reanudar:\n{tarea.error}'))
+            return
 
+        detalle = ', '.join(f'{nombre}: {tarea.resultado.get(nombre, 0):,}' for nombre in tarea.parametros['modelos'])
+        self.stdout.write(self.style.SUCCESS(f'\n✅ {tarea.procesados:,} filas actualizadas ({detalle})'))
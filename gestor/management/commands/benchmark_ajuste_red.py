@@ -0,0 +1,76 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from scipy.spatial import cKDTree
+
+from gestor.services.ajuste_red_service import ajustar_horizontal, ajustar_vertical
+
+
+class Command(BaseCommand):
+    help = 'Mide el tiempo de solución del ajuste de red con una red sintética'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--puntos',
+            type=int,
+            default=20_000,
+            help='Número de puntos de la red'
+        )
+        parser.add_argument(
+            '--vecinos',
+            type=int,
+            default=4,
+            help='Observaciones por punto hacia sus vecinos más cercanos'
+        )
+
+    def handle(self, *args, **options):
+        puntos = options['puntos']
+        rng = np.random.default_rng(0)
+
+        # Red verdadera en un área de ~10 km y mediciones con ruido GNSS
+        lado = 10_000 * np.sqrt(puntos / 20_000)
+        x_real = rng.uniform(0, lado, puntos)
+        y_real = rng.uniform(0, lado, puntos)
+        h_real = rng.uniform(1800, 2200, puntos)
+        sigma_h = np.full(puntos, 0.02)
+        sigma_v = np.full(puntos, 0.04)
+        x = x_real + rng.normal(0, 0.02, puntos)
+        y = y_real + rng.normal(0, 0.02, puntos)
+        h = h_real + rng.normal(0, 0.04, puntos)
+
+        # Estación total y nivel entre vecinos
+        _, vecinos = cKDTree(np.column_stack([x_real, y_real])).query(
+            np.column_stack([x_real, y_real]), k=options['vecinos'] + 1
+        )
+        i = np.repeat(np.arange(puntos), options['vecinos'])
+        j = vecinos[:, 1:].ravel()
+        distancias = np.hypot(x_real[j] - x_real[i], y_real[j] - y_real[i]) + rng.normal(0, 0.003, len(i))
+        desniveles = h_real[j] - h_real[i] + rng.normal(0, 0.002, len(i))
+
+        self.stdout.write(f'📐 Red de {puntos:,} puntos y {2 * len(i):,} observaciones...')
+
+        inicio = time.perf_counter()
+        x_aj, y_aj, _, sigma0_h, iteraciones = ajustar_horizontal(
+            x, y, sigma_h, np.full(len(i), 'DISTANCIA', dtype=object), i, j, distancias, np.full(len(i), 0.003)
+        )
+        horizontal = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        h_aj, _, sigma0_v = ajustar_vertical(h, sigma_v, i, j, desniveles, np.full(len(i), 0.002))
+        vertical = time.perf_counter() - inicio
+
+        def rms(valores):
+            return np.sqrt(np.mean(valores ** 2)) * 1000
+
+        self.stdout.write(f'  └─ Horizontal: {horizontal:.2f} s ({iteraciones} iteraciones, σ0 = {sigma0_h:.2f})')
+        self.stdout.write(f'  └─ Vertical: {vertical:.2f} s (σ0 = {sigma0_v:.2f})')
+        self.stdout.write(
+            f'  └─ Error relativo entre vecinos: {rms(np.hypot(x[j] - x[i] - x_real[j] + x_real[i], y[j] - y[i] - y_real[j] + y_real[i])):.1f} mm'
+            f' → {rms(np.hypot(x_aj[j] - x_aj[i] - x_real[j] + x_real[i], y_aj[j] - y_aj[i] - y_real[j] + y_real[i])):.1f} mm'
+        )
+        self.stdout.write(
+            f'  └─ Error de desniveles: {rms(h[j] - h[i] - h_real[j] + h_real[i]):.1f} mm'
+            f' → {rms(h_aj[j] - h_aj[i] - h_real[j] + h_real[i]):.1f} mm'
+        )
+        self.stdout.write(self.style.SUCCESS('\n✅ Benchmark terminado'))
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from gestor.services.volumenes.levantamiento import leer_puntos
+
+
+class Command(BaseCommand):
+    help = 'Mide la velocidad de lectura (MB/s) de archivos de levantamiento'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--puntos',
+            type=int,
+            default=5_000_000,
+            help='Número de puntos del archivo sintético'
+        )
+        parser.add_argument(
+            '--archivo',
+            help='Archivo de levantamiento existente a leer en lugar del sintético'
+        )
+
+    def handle(self, *args, **options):
+        ruta = options['archivo']
+        if not ruta:
+            ruta = self.generar(options['puntos'])
+
+        tamano_mb = os.path.getsize(ruta) / 1024 / 1024
+        self.stdout.write(f'📄 Leyendo {ruta} ({tamano_mb:,.1f} MB)...')
+
+        for etiquetas in (False, True):
+            inicio = time.perf_counter()
+            levantamiento = leer_puntos(ruta, etiquetas=etiquetas)
+            tiempo = time.perf_counter() - inicio
+            self.stdout.write(
+                f'  └─ {"x, y, z, punto y código" if etiquetas else "x, y, z"}: {len(levantamiento):,} puntos'
+                f' en {tiempo:.2f} s ({tamano_mb / tiempo:,.1f} MB/s)'
+            )
+
+        self.stdout.write(f'  └─ Sistema detectado: {levantamiento.sistema}')
+        self.stdout.write(f'  └─ Filas inválidas: {levantamiento.total_invalidas:,}')
+        for linea, contenido in levantamiento.filas_invalidas[:5]:
+            self.stdout.write(f'     · línea {linea}: {contenido}')
+
+        if not options['archivo']:
+            os.remove(ruta)
+        self.stdout.write(self.style.SUCCESS('\n✅ Benchmark terminado'))
+
+    def generar(self, puntos):
+        """Archivo P,N,E,Z,D en UTM con algunas filas dañadas, como el de una colectora"""
+        self.stdout.write(f'📝 Generando archivo sintético de {puntos:,} puntos...')
+        rng = np.random.default_rng(0)
+        este = rng.uniform(350_000, 352_000, puntos)
+        norte = rng.uniform(2_280_000, 2_282_000, puntos)
+        elevacion = rng.uniform(1_800, 1_850, puntos)
+        codigos = np.array(['TN', 'BORDE', 'EJE', 'CAMINO'])[rng.integers(0, 4, puntos)]
+
+        descriptor, ruta = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(descriptor, 'w') as archivo:
+            for inicio in range(0, puntos, 500_000):
+                fin = min(inicio + 500_000, puntos)
+                filas = [
+                    f'{i + 1},{n:.3f},{e:.3f},{z:.3f},{d}'
+                    for i, n, e, z, d in zip(
+                        range(inicio, fin), norte[inicio:fin], este[inicio:fin],
+                        elevacion[inicio:fin], codigos[inicio:fin]
+                    )
+                ]
+                # Una fila incompleta y una con texto en la elevación por bloque
+                filas[len(filas) // 3] = f'{inicio + len(filas) // 3 + 1},{norte[inicio]:.3f},,TN'
+                filas[2 * len(filas) // 3] = f'{inicio + 1},{norte[inicio]:.3f},{este[inicio]:.3f},N/D,TN'
+                archivo.write('\n'.join(filas) + '\n')
+        return ruta
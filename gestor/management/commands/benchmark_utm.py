@@ -0,0 +1,87 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from gestor.services.utm_service import utm_a_wgs84, wgs84_a_utm
+
+# Puntos de referencia (lat, lon, zona, hemisferio, este, norte) calculados con PROJ
+REFERENCIAS = [
+    (19.4326, -99.1332, 14, 'N', 486017.3309, 2148700.2198),
+    (20.5888, -100.3899, 14, 'N', 355146.6620, 2277258.0310),
+    (25.6866, -100.3161, 14, 'N', 367932.9662, 2841635.0550),
+    (20.6597, -103.3496, 13, 'N', 671927.8496, 2285360.2611),
+    (-33.8688, 151.2093, 56, 'S', 334368.6336, 6250948.3454),
+    (60.0, 5.0, 32, 'N', 276979.9264, 6658157.2024),
+    (78.22, 15.65, 33, 'N', 514813.5273, 8683004.1533),
+    (0.0, -78.0, 18, 'N', 166021.4431, 0.0000),
+]
+
+TOLERANCIA_M = 0.001
+
+
+class Command(BaseCommand):
+    help = 'Verifica la conversión WGS84/UTM contra puntos de referencia y mide su rendimiento'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--puntos',
+            type=int,
+            default=2_000_000,
+            help='Número de puntos para el benchmark'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('📍 Verificando puntos de referencia...')
+        if not self.verificar():
+            return
+
+        puntos = options['puntos']
+        rng = np.random.default_rng(0)
+        latitud = rng.uniform(14.5, 32.7, puntos)
+        longitud = rng.uniform(-117, -86.7, puntos)
+
+        self.stdout.write(f'\n⏱️  Convirtiendo {puntos:,} puntos...')
+
+        inicio = time.perf_counter()
+        este, norte, zona, hemisferio = wgs84_a_utm(latitud, longitud)
+        directa = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        lat_inv, lon_inv = utm_a_wgs84(este, norte, zona, hemisferio)
+        inversa = time.perf_counter() - inicio
+
+        error = max(np.abs(lat_inv - latitud).max(), np.abs(lon_inv - longitud).max())
+
+        self.stdout.write(f'  └─ WGS84 → UTM: {puntos / directa:,.0f} puntos/s')
+        self.stdout.write(f'  └─ UTM → WGS84: {puntos / inversa:,.0f} puntos/s')
+        self.stdout.write(f'  └─ Error máximo ida y vuelta: {error:.2e}°')
+        self.stdout.write(self.style.SUCCESS('\n✅ Benchmark terminado'))
+
+    def verificar(self):
+        lat, lon, zonas, hemisferios, este_ref, norte_ref = map(np.array, zip(*REFERENCIAS))
+
+        este, norte, zona, hemisferio = wgs84_a_utm(lat, lon)
+        error_directa = np.hypot(este - este_ref, norte - norte_ref)
+        lat_inv, lon_inv = utm_a_wgs84(este_ref, norte_ref, zonas, hemisferios)
+        error_inversa = np.hypot(lat_inv - lat, lon_inv - lon)
+
+        correcto = True
+        for i, referencia in enumerate(REFERENCIAS):
+            ok = (
+                error_directa[i] < TOLERANCIA_M
+                and zona[i] == zonas[i]
+                and hemisferio[i] == hemisferios[i]
+                and error_inversa[i] < 1e-8
+            )
+            correcto &= bool(ok)
+            estilo = self.style.SUCCESS if ok else self.style.ERROR
+            self.stdout.write(estilo(
+                f'  {"✓" if ok else "✗"} ({referencia[0]}, {referencia[1]}) → '
+                f'{zona[i]}{hemisferio[i]} {este[i]:.3f} {norte[i]:.3f} '
+                f'(error {error_directa[i] * 1000:.3f} mm)'
+            ))
+
+        if not correcto:
+            self.stdout.write(self.style.ERROR('\n✗ La conversión no coincide con las referencias'))
+        return correcto
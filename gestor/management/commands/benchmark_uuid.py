@@ -0,0 +1,89 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from gestor.models.uuid_utils import uuid7
+
+
+class Command(BaseCommand):
+    help = 'Compara inserciones masivas y tamaño de índice entre llaves uuid4 y uuid7'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--filas',
+            type=int,
+            default=200_000,
+            help='Número de filas a insertar por generador'
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=5_000,
+            help='Filas por INSERT'
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('El benchmark requiere PostgreSQL (usa pg_relation_size)')
+
+        filas = options['filas']
+        lote = options['lote']
+
+        self.stdout.write(f'📊 Insertando {filas:,} filas por generador en lotes de {lote:,}...\n')
+
+        resultados = {}
+        for nombre, generador in (('uuid4', uuid.uuid4), ('uuid7', uuid7)):
+            resultados[nombre] = self.medir(nombre, generador, filas, lote)
+            r = resultados[nombre]
+            self.stdout.write(
+                f'  └─ {nombre}: {r["filas_s"]:,.0f} filas/s | '
+                f'índice {r["indice_mb"]:.1f} MB | tabla {r["tabla_mb"]:.1f} MB'
+            )
+
+        v4, v7 = resultados['uuid4'], resultados['uuid7']
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ uuid7: {v7["filas_s"] / v4["filas_s"]:.2f}x throughput, '
+            f'{v7["indice_mb"] / v4["indice_mb"]:.2f}x tamaño de índice respecto a uuid4'
+        ))
+
+    def medir(self, nombre, generador, filas, lote):
+        tabla = f'benchmark_{nombre}'
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {tabla}')
+            cursor.execute(
+                f'CREATE UNLOGGED TABLE {tabla} ('
+                f'id uuid PRIMARY KEY, creado timestamptz DEFAULT now(), carga text)'
+            )
+
+        try:
+            inicio = time.perf_counter()
+            for offset in range(0, filas, lote):
+                valores = [
+                    (generador(), 'x' * 64)
+                    for _ in range(min(lote, filas - offset))
+                ]
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.executemany(
+                        f'INSERT INTO {tabla} (id, carga) VALUES (%s, %s)',
+                        valores
+                    )
+            duracion = time.perf_counter() - inicio
+
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT pg_relation_size(%s), pg_relation_size(%s)',
+                    [f'{tabla}_pkey', tabla]
+                )
+                indice, datos = cursor.fetchone()
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE IF EXISTS {tabla}')
+
+        return {
+            'filas_s': filas / duracion,
+            'indice_mb': indice / 1024 / 1024,
+            'tabla_mb': datos / 1024 / 1024,
+        }
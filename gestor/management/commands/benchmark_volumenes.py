@@ -0,0 +1,78 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from gestor.services.volumenes.grid import volumen_grid
+from gestor.services.volumenes.tin import triangular, volumen_tin
+
+
+class Command(BaseCommand):
+    help = 'Compara los motores de volumen contra superficies con volumen analítico conocido'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--puntos',
+            type=int,
+            default=1_000_000,
+            help='Número de puntos del levantamiento sintético'
+        )
+        parser.add_argument(
+            '--celda',
+            type=float,
+            default=1.0,
+            help='Tamaño de celda para el método de retícula (m)'
+        )
+
+    def handle(self, *args, **options):
+        puntos = options['puntos']
+        rng = np.random.default_rng(0)
+
+        # Terreno de 400 x 400 m; el borde se muestrea para que la envolvente sea el cuadrado
+        lado = 200.0
+        borde = np.linspace(-lado, lado, 401)
+        x = np.concatenate([rng.uniform(-lado, lado, puntos), borde, borde, np.full(401, -lado), np.full(401, lado)])
+        y = np.concatenate([rng.uniform(-lado, lado, puntos), np.full(401, -lado), np.full(401, lado), borde, borde])
+        area = (2 * lado) ** 2
+
+        # Casos con solución cerrada, diseño a elevación 0:
+        # - plano inclinado z = 0.05·x: corte = relleno = 0.05·L³
+        # - paraboloide z = h - k·r²: corte = π·h²/(2k), relleno = corte - ∫z
+        h, k = 10.0, 0.0005
+        casos = [
+            ('Plano inclinado', 0.05 * x, 0.05 * lado ** 3, 0.05 * lado ** 3),
+            (
+                'Paraboloide',
+                h - k * (x ** 2 + y ** 2),
+                np.pi * h ** 2 / (2 * k),
+                np.pi * h ** 2 / (2 * k) - (h * area - k * area * 2 * lado ** 2 / 3),
+            ),
+        ]
+
+        self.stdout.write(f'📐 Levantamiento sintético de {len(x):,} puntos...')
+
+        inicio = time.perf_counter()
+        triangulos = triangular(x, y)
+        triangulacion = time.perf_counter() - inicio
+        self.stdout.write(f'  └─ Delaunay: {triangulacion:.2f} s ({len(triangulos):,} triángulos)')
+
+        for nombre, z, corte_real, relleno_real in casos:
+            self.stdout.write(f'\n{nombre}: corte {corte_real:,.1f} m³, relleno {relleno_real:,.1f} m³')
+
+            inicio = time.perf_counter()
+            tin = volumen_tin((x, y, z), 0.0, triangulos)
+            tiempo_tin = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            grid = volumen_grid((x, y, z), 0.0, options['celda'])
+            tiempo_grid = time.perf_counter() - inicio
+
+            for metodo, resultado, tiempo in (('TIN', tin, tiempo_tin), ('GRID', grid, tiempo_grid)):
+                error_corte = (resultado['volumen_corte_m3'] - corte_real) / corte_real * 100
+                error_relleno = (resultado['volumen_relleno_m3'] - relleno_real) / relleno_real * 100
+                self.stdout.write(
+                    f'  └─ {metodo}: {tiempo:.2f} s, corte {resultado["volumen_corte_m3"]:,.1f} m³ ({error_corte:+.4f}%),'
+                    f' relleno {resultado["volumen_relleno_m3"]:,.1f} m³ ({error_relleno:+.4f}%)'
+                )
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Benchmark terminado'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from gestor.services.media_service import deduplicar
+
+
+class Command(BaseCommand):
+    help = 'Mueve la media existente al almacenamiento por contenido y elimina las copias repetidas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--simular',
+            action='store_true',
+            help='Solo calcula cuánto espacio se ahorraría, sin mover archivos'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔍 Calculando hashes de la media referenciada...')
+
+        def progreso(modelo, nombre, ruta):
+            self.stdout.write(f'  ✓ {modelo._meta.verbose_name}: {nombre} → {ruta}')
+
+        try:
+            resumen = deduplicar(simular=options['simular'], progreso=progreso)
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        accion = 'se ahorrarían' if options['simular'] else 'ahorrados'
+        self.stdout.write(self.style.SUCCESS(
+            f"\n✅ {resumen['archivos']:,} archivos, {resumen['duplicados']:,} duplicados, "
+            f"{resumen['registros']:,} registros; {resumen['bytes_ahorrados'] / 1024 ** 2:,.2f} MB {accion}"
+        ))
+        if resumen['faltantes']:
+            self.stdout.write(self.style.WARNING(f"⚠ {resumen['faltantes']} archivos referenciados no existen"))
@@ -0,0 +1,71 @@
+import os
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from gestor.models import TareaFondo
+from gestor.services import encolar, ejecutar
+
+
+class Command(BaseCommand):
+    help = 'Genera las miniaturas WebP/JPEG de las fotos de reportes que aún no las tienen'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--procesos',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Procesos en paralelo (0 = en este proceso)'
+        )
+        parser.add_argument(
+            '--todos',
+            action='store_true',
+            help='Regenera las miniaturas de todas las fotos, no solo las pendientes'
+        )
+        parser.add_argument(
+            '--reiniciar',
+            action='store_true',
+            help='Ignora una ejecución anterior sin terminar y empieza de cero'
+        )
+
+    def handle(self, *args, **options):
+        tarea = None
+        if not options['reiniciar']:
+            tarea = (
+                TareaFondo.objects
+                .filter(tipo='generar_miniaturas', parametros__pks__isnull=True,
+                        estado__in=['PENDIENTE', 'EJECUCION', 'FALLIDA'])
+                .order_by('-created_at')
+                .first()
+            )
+
+        if tarea is not None:
+            self.stdout.write(f'♻️  Reanudando desde {tarea.checkpoint or "el inicio"} ({tarea.procesados:,} fotos ya procesadas)')
+        else:
+            tarea = encolar(
+                'generar_miniaturas',
+                descripcion='Miniaturas de fotos de reportes',
+                todos=options['todos'],
+            )
+
+        # Se ejecuta aquí; se marca en ejecución para que el worker no la tome
+        tarea.estado = 'EJECUCION'
+        tarea.iniciada_en = tarea.iniciada_en or timezone.now()
+        tarea.save(update_fields=['estado', 'iniciada_en', 'updated_at'])
+
+        self.stdout.write("🖼️  Generando miniaturas de fotos de reportes...")
+
+        def progreso(pk, miniaturas):
+            if miniaturas.get('error'):
+                self.stdout.write(self.style.WARNING(f'  ⚠ {miniaturas["original"]}: {miniaturas["error"]}'))
+            elif tarea.procesados % 100 == 0:
+                self.stdout.write(f'  ✓ {tarea.procesados:,} de {tarea.total:,}')
+
+        ejecutar(tarea, procesos=options['procesos'], progreso=progreso)
+
+        if tarea.estado == 'FALLIDA':
+            self.stdout.write(self.style.ERROR(f'\n✗ Error, se puede reanudar:\n{tarea.error}'))
+            return
+
+        errores = tarea.resultado.get('errores', 0)
+        self.stdout.write(self.style.SUCCESS(f'\n✅ {tarea.procesados:,} fotos procesadas ({errores} con error)'))
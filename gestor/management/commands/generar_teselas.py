@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from gestor.models import VolumenTerraceria
+from gestor.services.volumenes.levantamiento import ErrorLevantamiento
+from gestor.services.volumenes.teselas import (
+    CAPAS, METODOS, ZOOM_MAXIMO, firma_configuracion, limites_wgs84, tesela, teselas_de
+)
+
+
+class Command(BaseCommand):
+    help = 'Dibuja por adelantado las teselas PNG de los levantamientos para los mapas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('volumenes', nargs='*', help='IDs de volúmenes (por defecto todos con levantamiento)')
+        parser.add_argument('--proyecto', help='Solo los volúmenes de este proyecto (ID)')
+        parser.add_argument('--zoom-min', type=int, default=15)
+        parser.add_argument('--zoom-max', type=int, default=19)
+        parser.add_argument('--capa', choices=CAPAS, action='append', help='Capa a dibujar (por defecto todas)')
+
+    def handle(self, *args, **options):
+        if options['zoom_min'] > options['zoom_max']:
+            raise CommandError('--zoom-min no puede ser mayor que --zoom-max')
+        if options['zoom_max'] > ZOOM_MAXIMO:
+            raise CommandError(f'--zoom-max no puede ser mayor que {ZOOM_MAXIMO}')
+
+        volumenes = (
+            VolumenTerraceria.objects
+            .exclude(archivo_levantamiento='')
+            .exclude(archivo_levantamiento__isnull=True)
+            .filter(metodo_calculo__in=METODOS)
+            .select_related('proyecto', 'levantamiento_base')
+        )
+        if options['volumenes']:
+            volumenes = volumenes.filter(pk__in=options['volumenes'])
+        if options['proyecto']:
+            volumenes = volumenes.filter(proyecto_id=options['proyecto'])
+        capas = options['capa'] or CAPAS
+
+        for volumen in volumenes:
+            inicio = time.perf_counter()
+            try:
+                firma = firma_configuracion(volumen)
+                limites = limites_wgs84(volumen)
+                total = 0
+                for z in range(options['zoom_min'], options['zoom_max'] + 1):
+                    for x, y in teselas_de(limites, z):
+                        for capa in capas:
+                            tesela(volumen, capa, z, x, y, firma)
+                            total += 1
+            except (ErrorLevantamiento, OSError, ValueError) as error:
+                self.stdout.write(self.style.ERROR(f'✗ {volumen.nombre}: {error}'))
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ {volumen.nombre}: {total} teselas en {time.perf_counter() - inicio:.2f}s'
+            ))
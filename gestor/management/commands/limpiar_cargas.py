@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from gestor.services.cargas_service import abandonadas, cancelar_cargas
+
+
+class Command(BaseCommand):
+    help = 'Cancela las cargas reanudables abandonadas y borra sus archivos parciales'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias',
+            type=int,
+            default=7,
+            help='Días sin recibir fragmentos para considerar abandonada una carga'
+        )
+
+    def handle(self, *args, **options):
+        cargas = abandonadas(options['dias'])
+        pendientes = sum(cargas.values_list('recibido', flat=True))
+        canceladas = cancelar_cargas(cargas)
+        self.stdout.write(self.style.SUCCESS(
+            f'🧹 {canceladas} cargas canceladas, {pendientes / 1024 ** 2:,.1f} MB liberados'
+        ))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from gestor.services.exportacion_service import limpiar_exportaciones
+
+
+class Command(BaseCommand):
+    help = 'Borra las exportaciones de reportes generadas en segundo plano que ya caducaron'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias',
+            type=int,
+            default=7,
+            help='Días que se conserva cada exportación'
+        )
+
+    def handle(self, *args, **options):
+        archivos, liberados = limpiar_exportaciones(options['dias'])
+        self.stdout.write(self.style.SUCCESS(
+            f'🧹 {archivos} exportaciones borradas, {liberados / 1024 ** 2:,.1f} MB liberados'
+        ))
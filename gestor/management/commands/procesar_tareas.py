@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from gestor.models import TareaFondo
+from gestor.services import ejecutar, reclamar_siguiente, reanudar
+
+
+class Command(BaseCommand):
+    help = 'Worker que ejecuta las tareas en segundo plano encoladas desde el admin'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--una-vez',
+            action='store_true',
+            help='Procesa las tareas pendientes y termina'
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=5,
+            help='Segundos de espera cuando no hay tareas pendientes'
+        )
+        parser.add_argument(
+            '--reanudar',
+            action='store_true',
+            help='Reencola tareas que quedaron en ejecución o fallidas antes de iniciar'
+        )
+
+    def handle(self, *args, **options):
+        if options['reanudar']:
+            reencoladas = reanudar(TareaFondo.objects.all())
+            self.stdout.write(f'🔁 {reencoladas} tareas reencoladas')
+
+        self.stdout.write('🚀 Worker de tareas iniciado')
+
+        while True:
+            tarea_fondo = reclamar_siguiente()
+
+            if tarea_fondo is None:
+                if options['una_vez']:
+                    break
+                time.sleep(options['intervalo'])
+                continue
+
+            self.stdout.write(f'  ▶ {tarea_fondo.tipo} ({tarea_fondo.pk})')
+            inicio = time.perf_counter()
+            ejecutar(tarea_fondo)
+            duracion = time.perf_counter() - inicio
+
+            if tarea_fondo.estado == 'COMPLETADA':
+                self.stdout.write(self.style.SUCCESS(
+                    f'  ✓ {tarea_fondo.procesados} registros en {duracion:.1f}s'
+                ))
+            else:
+                self.stdout.write(self.style.ERROR(
+                    f'  ✗ Falló: {tarea_fondo.error.strip().splitlines()[-1]}'
+                ))
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Sin tareas pendientes'))
@@ -0,0 +1,98 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+
+from gestor import workers
+from gestor.models import VolumenTerraceria
+from gestor.services.volumenes.trabajos import ejecutar_calculo, reanudar_calculos, reclamar_calculos
+
+
+class Command(BaseCommand):
+    help = 'Worker que calcula en un pool de procesos los volúmenes de terracería programados desde el admin'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--procesos',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Cálculos simultáneos en procesos hijos (0 = en este proceso)'
+        )
+        parser.add_argument(
+            '--una-vez',
+            action='store_true',
+            help='Procesa los cálculos pendientes y termina'
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=5,
+            help='Segundos de espera cuando no hay cálculos pendientes'
+        )
+        parser.add_argument(
+            '--reanudar',
+            action='store_true',
+            help='Reprograma cálculos que quedaron en ejecución o fallidos antes de iniciar'
+        )
+
+    def handle(self, *args, **options):
+        if options['reanudar']:
+            reprogramados = reanudar_calculos(VolumenTerraceria.objects.all())
+            self.stdout.write(f'🔁 {reprogramados} cálculos reprogramados')
+
+        procesos = options['procesos']
+        executor = None
+        # SQLite bloquea la base completa: los hijos no podrían escribir su avance
+        if procesos and connection.vendor != 'sqlite':
+            # Los hijos abren sus propias conexiones
+            connections.close_all()
+            executor = ProcessPoolExecutor(max_workers=procesos, initializer=workers.inicializar)
+
+        self.stdout.write(f'🚀 Worker de volúmenes iniciado ({procesos if executor else "sin"} procesos)')
+
+        en_vuelo = {}
+        try:
+            while True:
+                libres = procesos - len(en_vuelo) if executor else 1
+                pks = reclamar_calculos(libres) if libres > 0 else []
+
+                for pk in pks:
+                    self.stdout.write(f'  ▶ Volumen {pk}')
+                    if executor is None:
+                        self.reportar(ejecutar_calculo(pk))
+                    else:
+                        en_vuelo[executor.submit(workers.calcular_volumen, pk)] = pk
+
+                if en_vuelo:
+                    # Mientras hay cálculos en curso se revisa la cola cada intervalo
+                    terminados, _ = wait(en_vuelo, timeout=options['intervalo'], return_when=FIRST_COMPLETED)
+                    for futuro in terminados:
+                        pk = en_vuelo.pop(futuro)
+                        try:
+                            self.reportar(futuro.result())
+                        except Exception as error:
+                            # El hijo murió sin registrar el fallo; queda EN EJECUCIÓN hasta --reanudar
+                            self.stdout.write(self.style.ERROR(f'  ✗ Volumen {pk}: {error!r}'))
+                    continue
+
+                if not pks:
+                    if options['una_vez']:
+                        break
+                    time.sleep(options['intervalo'])
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Sin cálculos pendientes'))
+
+    def reportar(self, resumen):
+        if resumen['estado'] == 'COMPLETADO':
+            self.stdout.write(self.style.SUCCESS(
+                f'  ✓ {resumen["nombre"]} en {resumen["duracion"]:.1f}s'
+            ))
+        else:
+            self.stdout.write(self.style.ERROR(
+                f'  ✗ {resumen["nombre"]} falló: {resumen["error"]}'
+            ))
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from gestor.models import Proyecto
+from gestor.services import contar_purga, encolar, purgar_proyecto
+
+
+class Command(BaseCommand):
+    help = 'Elimina un proyecto completo por lotes acotados, sin cargarlo en memoria'
+
+    def add_arguments(self, parser):
+        parser.add_argument('codigo', help='Código del proyecto a eliminar')
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=1000,
+            help='Filas por DELETE'
+        )
+        parser.add_argument(
+            '--segundo-plano',
+            action='store_true',
+            help='Encola la purga para el worker en lugar de ejecutarla aquí'
+        )
+
+    def handle(self, *args, **options):
+        proyecto = Proyecto.objects.filter(codigo=options['codigo']).values('id', 'codigo', 'nombre').first()
+        if proyecto is None:
+            raise CommandError(f'No existe el proyecto {options["codigo"]}')
+
+        proyecto_id = str(proyecto['id'])
+
+        if options['segundo_plano']:
+            tarea = encolar(
+                'purgar_proyecto',
+                descripcion=f'Purga del proyecto {proyecto["codigo"]}',
+                proyecto_id=proyecto_id,
+                tamano_lote=options['lote'],
+            )
+            self.stdout.write(self.style.SUCCESS(f'✅ Purga encolada (tarea {tarea.pk})'))
+            return
+
+        conteos = contar_purga(proyecto_id)
+        total = sum(conteos.values())
+        self.stdout.write(f'🗑️  Eliminando {proyecto["codigo"]} - {proyecto["nombre"]} ({total:,} filas)...')
+
+        avance = {'filas': 0}
+
+        def progreso(paso, filas):
+            avance['filas'] += filas
+            porcentaje = avance['filas'] / total * 100 if total else 100
+            self.stdout.write(f'  └─ {paso}: {filas:,} filas ({porcentaje:.0f}%)')
+
+        totales = purgar_proyecto(proyecto_id, options['lote'], progreso)
+
+        self.stdout.write(self.style.SUCCESS(f'\n✅ {sum(totales.values()):,} filas eliminadas'))
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from gestor.models import ReporteAvance
+from gestor.services import encolar, ejecutar
+
+
+class Command(BaseCommand):
+    help = 'Verifica la geocerca de los reportes de avance históricos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=2000,
+            help='Reportes por lote'
+        )
+        parser.add_argument(
+            '--todos',
+            action='store_true',
+            help='Reevalúa también los reportes ya verificados'
+        )
+        parser.add_argument(
+            '--segundo-plano',
+            action='store_true',
+            help='Encola la verificación para el worker en lugar de ejecutarla aquí'
+        )
+
+    def handle(self, *args, **options):
+        tarea = encolar(
+            'verificar_geocerca',
+            descripcion='Verificación de geocerca de reportes históricos',
+            queryset=ReporteAvance.objects.all(),
+            tamano_lote=options['lote'],
+            solo_pendientes=not options['todos'],
+        )
+
+        if options['segundo_plano']:
+            self.stdout.write(self.style.SUCCESS(f'✅ Verificación encolada (tarea {tarea.pk})'))
+            return
+
+        self.stdout.write('📍 Verificando geocerca de reportes...')
+        tarea.estado = 'EJECUCION'
+        tarea.iniciada_en = timezone.now()
+        tarea.save(update_fields=['estado', 'iniciada_en', 'updated_at'])
+
+        ejecutar(tarea)
+
+        if tarea.estado == 'FALLIDA':
+            self.stdout.write(self.style.ERROR(f'\n✗ Error, se puede reanudar desde el admin:\n{tarea.error}'))
+            return
+
+        fuera = tarea.resultado.get('afectados', 0)
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ {tarea.procesados:,} reportes verificados, {fuera:,} fuera de la geocerca'
+        ))
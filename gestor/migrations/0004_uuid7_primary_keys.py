@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:12
+
+import gestor.models.uuid_utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0003_cuadrilla_puntocontrol_reporteavance_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cuadrilla',
+            name='id',
+            field=models.UUIDField(default=gestor.models.uuid_utils.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='puntocontrol',
+            name='id',
+            field=models.UUIDField(default=gestor.models.uuid_utils.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='reporteavance',
+            name='id',
+            field=models.UUIDField(default=gestor.models.uuid_utils.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:13
+
+import django.db.models.deletion
+import gestor.models.uuid_utils
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0004_uuid7_primary_keys'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TareaFondo',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=gestor.models.uuid_utils.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('tipo', models.CharField(max_length=50)),
+                ('descripcion', models.CharField(blank=True, max_length=200)),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('EJECUCION', 'En Ejecución'), ('COMPLETADA', 'Completada'), ('FALLIDA', 'Fallida')], default='PENDIENTE', max_length=20)),
+                ('parametros', models.JSONField(blank=True, default=dict)),
+                ('consulta', models.BinaryField(blank=True, null=True)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('procesados', models.PositiveIntegerField(default=0)),
+                ('checkpoint', models.CharField(blank=True, max_length=64)),
+                ('resultado', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True)),
+                ('iniciada_en', models.DateTimeField(blank=True, null=True)),
+                ('finalizada_en', models.DateTimeField(blank=True, null=True)),
+                ('creada_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tareas_fondo', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Tarea en Segundo Plano',
+                'verbose_name_plural': 'Tareas en Segundo Plano',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['estado', 'created_at'], name='gestor_tare_estado_002a33_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+
+def sembrar_historial(apps, schema_editor):
+    """Toma el estado actual de cada elemento como primer punto de su historial"""
+    ElementoConstructivo = apps.get_model('gestor', 'ElementoConstructivo')
+    HistorialAvance = apps.get_model('gestor', 'HistorialAvance')
+    AvanceProyectoDiario = apps.get_model('gestor', 'AvanceProyectoDiario')
+
+    elementos = ElementoConstructivo.objects.values_list(
+        'id', 'proyecto_id', 'updated_at', 'porcentaje_avance', 'estado'
+    ).iterator(chunk_size=2000)
+
+    lote = []
+    for elemento_id, proyecto_id, updated_at, porcentaje, estado in elementos:
+        lote.append(HistorialAvance(
+            elemento_id=elemento_id,
+            proyecto_id=proyecto_id,
+            fecha=timezone.localdate(updated_at),
+            porcentaje_avance=porcentaje,
+            estado=estado,
+        ))
+        if len(lote) == 2000:
+            HistorialAvance.objects.bulk_create(lote)
+            lote = []
+    HistorialAvance.objects.bulk_create(lote)
+
+    hoy = timezone.localdate()
+    resumenes = ElementoConstructivo.objects.values('proyecto_id').annotate(
+        avance=Avg('porcentaje_avance'),
+        total=Count('id'),
+        terminados=Count('id', filter=Q(estado='TERMINADO')),
+    ).order_by()
+    AvanceProyectoDiario.objects.bulk_create([
+        AvanceProyectoDiario(
+            proyecto_id=resumen['proyecto_id'],
+            fecha=hoy,
+            avance_real=resumen['avance'] or 0,
+            total_elementos=resumen['total'],
+            elementos_terminados=resumen['terminados'],
+        )
+        for resumen in resumenes
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0005_tareafondo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AvanceProyectoDiario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('avance_real', models.FloatField(default=0)),
+                ('total_elementos', models.PositiveIntegerField(default=0)),
+                ('elementos_terminados', models.PositiveIntegerField(default=0)),
+                ('proyecto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='avance_diario', to='gestor.proyecto')),
+            ],
+            options={
+                'verbose_name': 'Avance Diario de Proyecto',
+                'verbose_name_plural': 'Avance Diario de Proyectos',
+                'ordering': ['proyecto', 'fecha'],
+                'unique_together': {('proyecto', 'fecha')},
+            },
+        ),
+        migrations.CreateModel(
+            name='HistorialAvance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('porcentaje_avance', models.FloatField()),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('REPLANTEO', 'En Replanteo'), ('EXCAVACION', 'Excavación'), ('CIMBRADO', 'Cimbrado'), ('ARMADO', 'Armado de Acero'), ('COLADO', 'Colado'), ('TERMINADO', 'Terminado')], max_length=20)),
+                ('elemento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='historial_avance', to='gestor.elementoconstructivo')),
+                ('proyecto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='historial_avance', to='gestor.proyecto')),
+            ],
+            options={
+                'verbose_name': 'Historial de Avance',
+                'verbose_name_plural': 'Historial de Avance',
+                'indexes': [models.Index(fields=['proyecto', 'fecha'], name='gestor_hist_proyect_41a0c0_idx')],
+                'unique_together': {('elemento', 'fecha')},
+            },
+        ),
+        migrations.RunPython(sembrar_historial, migrations.RunPython.noop),
+    ]
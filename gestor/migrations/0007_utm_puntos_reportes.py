@@ -0,0 +1,58 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0006_historial_avance'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='elementoconstructivo',
+            name='utm_calculado_en',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='puntocontrol',
+            name='utm_calculado_en',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='puntocontrol',
+            name='utm_este',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='puntocontrol',
+            name='utm_norte',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='puntocontrol',
+            name='utm_zona',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='reporteavance',
+            name='utm_calculado_en',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='reporteavance',
+            name='utm_este',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='reporteavance',
+            name='utm_norte',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='reporteavance',
+            name='utm_zona',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
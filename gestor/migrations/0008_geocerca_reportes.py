@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0007_utm_puntos_reportes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reporteavance',
+            name='distancia_elemento_m',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='reporteavance',
+            name='fuera_de_geocerca',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+    ]
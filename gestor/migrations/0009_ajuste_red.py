@@ -0,0 +1,67 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:28
+
+import django.db.models.deletion
+import gestor.models.uuid_utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0008_geocerca_reportes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='puntocontrol',
+            name='ajustado_en',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='puntocontrol',
+            name='elevacion_ajustada',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='puntocontrol',
+            name='latitud_ajustada',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='puntocontrol',
+            name='longitud_ajustada',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='puntocontrol',
+            name='residuo_horizontal',
+            field=models.FloatField(blank=True, editable=False, help_text='Residuo en m', null=True),
+        ),
+        migrations.AddField(
+            model_name='puntocontrol',
+            name='residuo_vertical',
+            field=models.FloatField(blank=True, editable=False, help_text='Residuo en m', null=True),
+        ),
+        migrations.CreateModel(
+            name='ObservacionTopografica',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=gestor.models.uuid_utils.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('tipo', models.CharField(choices=[('DISTANCIA', 'Distancia Horizontal'), ('DESNIVEL', 'Desnivel'), ('DELTA_ESTE', 'Vector GNSS ΔEste'), ('DELTA_NORTE', 'Vector GNSS ΔNorte')], max_length=20)),
+                ('valor', models.FloatField(help_text="Valor observado en m (de 'desde' hacia 'hasta')")),
+                ('desviacion_estandar', models.FloatField(blank=True, help_text='Desviación estándar en cm', null=True)),
+                ('equipo_medicion', models.CharField(choices=[('GPS_DIFERENCIAL', 'GPS Diferencial'), ('GPS_RTK', 'GPS RTK'), ('ESTACION_TOTAL', 'Estación Total'), ('NIVEL', 'Nivel Óptico'), ('GPS_MOVIL', 'GPS Móvil')], max_length=30)),
+                ('residuo', models.FloatField(blank=True, editable=False, help_text='Residuo en m', null=True)),
+                ('desde', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='observaciones_salida', to='gestor.puntocontrol')),
+                ('hasta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='observaciones_llegada', to='gestor.puntocontrol')),
+                ('proyecto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='observaciones', to='gestor.proyecto')),
+            ],
+            options={
+                'verbose_name': 'Observación Topográfica',
+                'verbose_name_plural': 'Observaciones Topográficas',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['proyecto', 'tipo'], name='gestor_obse_proyect_76bd1d_idx')],
+            },
+        ),
+    ]
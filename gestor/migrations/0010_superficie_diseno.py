@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:30
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0009_ajuste_red'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='volumenterraceria',
+            name='archivo_diseno',
+            field=models.FileField(blank=True, help_text='Archivo CSV con puntos de la superficie de diseño', null=True, upload_to='levantamientos/diseno/'),
+        ),
+        migrations.AddField(
+            model_name='volumenterraceria',
+            name='elevacion_diseno',
+            field=models.FloatField(blank=True, help_text='Elevación de proyecto (m); por defecto la de referencia del proyecto', null=True),
+        ),
+        migrations.AddField(
+            model_name='volumenterraceria',
+            name='tamano_celda_m',
+            field=models.FloatField(default=1.0, help_text='Tamaño de celda para el método de retícula (m)', validators=[django.core.validators.MinValueValidator(0.01)]),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0010_superficie_diseno'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='volumenterraceria',
+            name='correccion_prismoidal',
+            field=models.BooleanField(default=False, help_text='En el método de secciones, aplicar la corrección prismoidal al promedio de áreas'),
+        ),
+    ]
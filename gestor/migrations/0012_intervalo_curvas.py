@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:41
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0011_correccion_prismoidal'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='volumenterraceria',
+            name='intervalo_curvas_m',
+            field=models.FloatField(default=0.5, help_text='Equidistancia entre curvas de nivel para el método de curvas (m)', validators=[django.core.validators.MinValueValidator(0.01)]),
+        ),
+    ]
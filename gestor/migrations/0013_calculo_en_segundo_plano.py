@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0012_intervalo_curvas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='volumenterraceria',
+            name='calculo_finalizado_en',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='volumenterraceria',
+            name='calculo_iniciado_en',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='volumenterraceria',
+            name='detalle_calculo',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='volumenterraceria',
+            name='duracion_calculo_s',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='volumenterraceria',
+            name='error_calculo',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='volumenterraceria',
+            name='estado_calculo',
+            field=models.CharField(choices=[('SIN_CALCULO', 'Sin Calcular'), ('PENDIENTE', 'Pendiente'), ('EJECUCION', 'En Ejecución'), ('COMPLETADO', 'Completado'), ('FALLIDO', 'Fallido')], db_index=True, default='SIN_CALCULO', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='volumenterraceria',
+            name='progreso_calculo',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
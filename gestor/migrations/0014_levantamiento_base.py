@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0013_calculo_en_segundo_plano'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='volumenterraceria',
+            name='levantamiento_base',
+            field=models.ForeignKey(blank=True, help_text='Levantamiento anterior contra el que se compara (p. ej. terreno natural)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='comparaciones', to='gestor.volumenterraceria'),
+        ),
+        migrations.AlterField(
+            model_name='volumenterraceria',
+            name='metodo_calculo',
+            field=models.CharField(choices=[('SECCIONES', 'Áreas de Secciones'), ('GRID', 'Retícula (Grid)'), ('TIN', 'Triangulación (TIN)'), ('CURVAS', 'Curvas de Nivel'), ('DIFERENCIA', 'Diferencia entre Levantamientos')], max_length=20),
+        ),
+    ]
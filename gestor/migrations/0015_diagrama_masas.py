@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:57
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0014_levantamiento_base'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='volumenterraceria',
+            name='acarreo_libre_m',
+            field=models.FloatField(default=20.0, help_text='Distancia de acarreo libre (m); lo que se mueve más lejos es sobreacarreo', validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AddField(
+            model_name='volumenterraceria',
+            name='coeficiente_variabilidad',
+            field=models.FloatField(default=1.0, help_text='Coeficiente de variabilidad volumétrica aplicado al corte en el diagrama de masas', validators=[django.core.validators.MinValueValidator(0.01)]),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 19:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0015_diagrama_masas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reporteavance',
+            name='miniaturas',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-19 19:07
+
+import django.db.models.deletion
+import gestor.models.uuid_utils
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0016_miniaturas_reportes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CargaArchivo',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=gestor.models.uuid_utils.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('destino', models.CharField(choices=[('FOTO_REPORTE', 'Foto de Reporte de Avance'), ('LEVANTAMIENTO', 'Archivo de Levantamiento'), ('DISENO', 'Archivo de Diseño')], max_length=20)),
+                ('objeto_id', models.UUIDField(help_text='ID del reporte o volumen que recibe el archivo')),
+                ('nombre_archivo', models.CharField(max_length=255)),
+                ('tamano_total', models.PositiveBigIntegerField()),
+                ('recibido', models.PositiveBigIntegerField(default=0)),
+                ('fragmentos', models.PositiveIntegerField(default=0)),
+                ('sha256', models.CharField(blank=True, help_text='SHA-256 del archivo completo (opcional); se verifica al terminar', max_length=64)),
+                ('estado', models.CharField(choices=[('EN_CURSO', 'En Curso'), ('COMPLETADA', 'Completada'), ('FALLIDA', 'Fallida'), ('CANCELADA', 'Cancelada')], db_index=True, default='EN_CURSO', max_length=20)),
+                ('archivo_final', models.CharField(blank=True, max_length=255)),
+                ('error', models.TextField(blank=True)),
+                ('completada_en', models.DateTimeField(blank=True, null=True)),
+                ('creada_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='cargas_archivo', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Carga de Archivo',
+                'verbose_name_plural': 'Cargas de Archivos',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
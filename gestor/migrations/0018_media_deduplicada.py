@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-19 19:11
+
+import gestor.models.uuid_utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0017_cargas_reanudables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivoMedia',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=gestor.models.uuid_utils.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('ruta', models.CharField(max_length=255, unique=True)),
+                ('tamano', models.PositiveBigIntegerField()),
+                ('referencias', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Archivo de Media',
+                'verbose_name_plural': 'Archivos de Media',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
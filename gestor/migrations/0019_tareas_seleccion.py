@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-19 21:02
+
+from django.db import migrations, models
+
+
+def cancelar_consultas_pendientes(apps, schema_editor):
+    """
+    Las tareas pendientes con una consulta serializada no pueden convertirse
+    a la nueva selección: se marcan como fallidas para volver a encolarlas,
+    en lugar de procesar todos los registros.
+    """
+    TareaFondo = apps.get_model('gestor', 'TareaFondo')
+    TareaFondo.objects.filter(
+        consulta__isnull=False, estado__in=['PENDIENTE', 'EJECUCION']
+    ).update(
+        estado='FALLIDA',
+        seleccion=[],
+        error='La selección de la tarea se guardaba en un formato anterior; vuelve a ejecutar la acción.',
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0018_media_deduplicada'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tareafondo',
+            name='seleccion',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(cancelar_consultas_pendientes, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='tareafondo',
+            name='consulta',
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.8 on 2026-10-19 19:48
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def sembrar_coordenadas_utm(apps, schema_editor):
+    """
+    Las filas que el criterio anterior daba por vigentes (sin cambios
+    después de calcular la UTM) conservan su UTM; el resto queda pendiente.
+    """
+    for nombre in ('ElementoConstructivo', 'PuntoControl', 'ReporteAvance'):
+        apps.get_model('gestor', nombre).objects.filter(
+            utm_este__isnull=False,
+            utm_calculado_en__isnull=False,
+            updated_at__lte=F('utm_calculado_en') + timedelta(seconds=1),
+        ).update(utm_latitud=F('latitud'), utm_longitud=F('longitud'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gestor', '0019_tareas_seleccion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='elementoconstructivo',
+            name='utm_latitud',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='elementoconstructivo',
+            name='utm_longitud',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='puntocontrol',
+            name='utm_latitud',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='puntocontrol',
+            name='utm_longitud',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='reporteavance',
+            name='utm_latitud',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='reporteavance',
+            name='utm_longitud',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(sembrar_coordenadas_utm, migrations.RunPython.noop),
+    ]
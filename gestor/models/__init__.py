@@ -4,6 +4,13 @@ from .point_control_model import PuntoControl
 from .cuadrilla_model import Cuadrilla
 from .report_avan_model import ReporteAvance
 from .terraceria_volume_model import VolumenTerraceria
+from .task_model import TareaFondo
+from .progress_model import HistorialAvance, AvanceProyectoDiario
+from .observation_model import ObservacionTopografica
+from .upload_model import CargaArchivo
+from .media_model import ArchivoMedia
 
 
-__all__ = ['Proyecto', 'ElementoConstructivo', 'PuntoControl', 'Cuadrilla',"ReporteAvance","VolumenTerraceria"]
\ No newline at end of file
+__all__ = ['Proyecto', 'ElementoConstructivo', 'PuntoControl', 'Cuadrilla',"ReporteAvance","VolumenTerraceria",
+           "TareaFondo", "HistorialAvance", "AvanceProyectoDiario",
+           "ObservacionTopografica", "CargaArchivo", "ArchivoMedia"]
\ No newline at end of file
@@ -1,17 +1,16 @@
 from django.db import models
 from django.contrib.auth.models import User
 
-import uuid
-
 from gestor.models.project_model import Proyecto
 from gestor.models.element_model import ElementoConstructivo
 from .audited_model import AuditedModel
+from .uuid_utils import uuid7
 
 class Cuadrilla(AuditedModel):
     """
     Equipos de trabajo en campo
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     proyecto = models.ForeignKey(Proyecto, on_delete=models.CASCADE, related_name='cuadrillas')
 
     nombre = models.CharField(max_length=100)
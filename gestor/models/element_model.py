@@ -4,6 +4,7 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 import uuid
 from .audited_model import AuditedModel
 from .project_model import Proyecto
+from .utm_model import CoordenadasUTMModel
 
 
 class TiposElemento(models.TextChoices):
@@ -30,7 +31,7 @@ class EstadosElemento(models.TextChoices):
 
 
 
-class ElementoConstructivo(AuditedModel):
+class ElementoConstructivo(AuditedModel, CoordenadasUTMModel):
     """
     Elementos específicos de la obra: zapatas, columnas, muros, etc.
     Cada elemento tiene coordenadas precisas
@@ -50,11 +51,6 @@ class ElementoConstructivo(AuditedModel):
     longitud = models.FloatField()
     elevacion = models.FloatField(help_text="Elevación en metros")
 
-    # Coordenadas UTM (calculadas automáticamente)
-    utm_este = models.FloatField(null=True, blank=True)
-    utm_norte = models.FloatField(null=True, blank=True)
-    utm_zona = models.IntegerField(null=True, blank=True)
-
     # Geometría (para elementos con área)
     area_proyecto = models.FloatField(
         null=True,
@@ -109,3 +105,17 @@ class ElementoConstructivo(AuditedModel):
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Valores cargados para detectar cambios de avance al guardar
+        instance._avance_guardado = (
+            instance.__dict__.get('porcentaje_avance'),
+            instance.__dict__.get('estado'),
+        )
+        return instance
+
+    def avance_modificado(self):
+        """Indica si porcentaje_avance o estado cambiaron desde que se cargó"""
+        return getattr(self, '_avance_guardado', None) != (self.porcentaje_avance, self.estado)
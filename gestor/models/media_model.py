@@ -0,0 +1,25 @@
+from django.db import models
+
+from .audited_model import AuditedModel
+from .uuid_utils import uuid7
+
+
+class ArchivoMedia(AuditedModel):
+    """
+    Contenido único guardado por el almacenamiento deduplicado. Cada vez que
+    se guarda un archivo con el mismo contenido se suma una referencia en vez
+    de escribir otra copia; el archivo se borra cuando ya no quedan referencias.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    sha256 = models.CharField(max_length=64, unique=True)
+    ruta = models.CharField(max_length=255, unique=True)
+    tamano = models.PositiveBigIntegerField()
+    referencias = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Archivo de Media"
+        verbose_name_plural = "Archivos de Media"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.ruta} ({self.referencias} referencias)"
@@ -0,0 +1,47 @@
+from django.db import models
+
+from .audited_model import AuditedModel
+from .point_control_model import PuntoControl, EquiposMedicion
+from .project_model import Proyecto
+from .uuid_utils import uuid7
+
+
+class TiposObservacion(models.TextChoices):
+    DISTANCIA = 'DISTANCIA', 'Distancia Horizontal'
+    DESNIVEL = 'DESNIVEL', 'Desnivel'
+    DELTA_ESTE = 'DELTA_ESTE', 'Vector GNSS ΔEste'
+    DELTA_NORTE = 'DELTA_NORTE', 'Vector GNSS ΔNorte'
+
+
+class ObservacionTopografica(AuditedModel):
+    """
+    Observación relativa entre dos puntos de control (distancia, desnivel o
+    componente de un vector GNSS), usada en el ajuste de la red
+    """
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    proyecto = models.ForeignKey(Proyecto, on_delete=models.CASCADE, related_name='observaciones')
+    desde = models.ForeignKey(PuntoControl, on_delete=models.CASCADE, related_name='observaciones_salida')
+    hasta = models.ForeignKey(PuntoControl, on_delete=models.CASCADE, related_name='observaciones_llegada')
+
+    tipo = models.CharField(max_length=20, choices=TiposObservacion)
+    valor = models.FloatField(help_text="Valor observado en m (de 'desde' hacia 'hasta')")
+    desviacion_estandar = models.FloatField(
+        help_text="Desviación estándar en cm",
+        null=True,
+        blank=True
+    )
+    equipo_medicion = models.CharField(max_length=30, choices=EquiposMedicion)
+
+    # Resultado del último ajuste
+    residuo = models.FloatField(null=True, blank=True, editable=False, help_text="Residuo en m")
+
+    class Meta:
+        verbose_name = "Observación Topográfica"
+        verbose_name_plural = "Observaciones Topográficas"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['proyecto', 'tipo']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} {self.desde.numero_punto} → {self.hasta.numero_punto}"
@@ -1,5 +1,3 @@
-import uuid
-
 from django.contrib.auth.models import User
 from django.db import models
 
@@ -7,6 +5,8 @@ from .element_model import ElementoConstructivo
 from .project_model import Proyecto
 
 from .audited_model import AuditedModel
+from .utm_model import CoordenadasUTMModel
+from .uuid_utils import uuid7
 class TiposPuntoControl(models.TextChoices):
     BENCHMARK = 'BENCHMARK', 'Banco de Nivel'
     REPLANTEO = 'REPLANTEO', 'Punto de Replanteo'
@@ -22,11 +22,11 @@ class EquiposMedicion(models.TextChoices):
     GPS_MOVIL = 'GPS_MOVIL', 'GPS Móvil'
 
 
-class PuntoControl(AuditedModel):
+class PuntoControl(AuditedModel, CoordenadasUTMModel):
     """
     Puntos de control topográfico y levantamientos
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     proyecto = models.ForeignKey(Proyecto, on_delete=models.CASCADE, related_name='puntos_control')
     elemento = models.ForeignKey(
         ElementoConstructivo,
@@ -63,6 +63,14 @@ class PuntoControl(AuditedModel):
 
     equipo_medicion = models.CharField(max_length=30, choices=EquiposMedicion)
 
+    # Resultado del ajuste de la red
+    latitud_ajustada = models.FloatField(null=True, blank=True, editable=False)
+    longitud_ajustada = models.FloatField(null=True, blank=True, editable=False)
+    elevacion_ajustada = models.FloatField(null=True, blank=True, editable=False)
+    residuo_horizontal = models.FloatField(null=True, blank=True, editable=False, help_text="Residuo en m")
+    residuo_vertical = models.FloatField(null=True, blank=True, editable=False, help_text="Residuo en m")
+    ajustado_en = models.DateTimeField(null=True, blank=True, editable=False)
+
     # Responsable de la medición
     topografo = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     fecha_medicion = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,59 @@
+from django.db import models
+
+from .element_model import ElementoConstructivo, EstadosElemento
+from .project_model import Proyecto
+
+
+class HistorialAvance(models.Model):
+    """
+    Fotografía diaria del avance de un elemento.
+    Tabla angosta y de solo inserción: una fila por elemento y día en que
+    cambió su avance o su estado (el último cambio del día sobrescribe).
+    """
+    elemento = models.ForeignKey(
+        ElementoConstructivo,
+        on_delete=models.CASCADE,
+        related_name='historial_avance'
+    )
+    # Desnormalizado para consultar un proyecto sin pasar por elementos
+    proyecto = models.ForeignKey(
+        Proyecto,
+        on_delete=models.CASCADE,
+        related_name='historial_avance'
+    )
+    fecha = models.DateField()
+    porcentaje_avance = models.FloatField()
+    estado = models.CharField(max_length=20, choices=EstadosElemento)
+
+    class Meta:
+        verbose_name = "Historial de Avance"
+        verbose_name_plural = "Historial de Avance"
+        unique_together = ['elemento', 'fecha']
+        indexes = [
+            models.Index(fields=['proyecto', 'fecha']),
+        ]
+
+    def __str__(self):
+        return f"{self.elemento_id} - {self.fecha}: {self.porcentaje_avance}%"
+
+
+class AvanceProyectoDiario(models.Model):
+    """Acumulado diario del avance real de un proyecto (curva S)"""
+    proyecto = models.ForeignKey(
+        Proyecto,
+        on_delete=models.CASCADE,
+        related_name='avance_diario'
+    )
+    fecha = models.DateField()
+    avance_real = models.FloatField(default=0)
+    total_elementos = models.PositiveIntegerField(default=0)
+    elementos_terminados = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Avance Diario de Proyecto"
+        verbose_name_plural = "Avance Diario de Proyectos"
+        unique_together = ['proyecto', 'fecha']
+        ordering = ['proyecto', 'fecha']
+
+    def __str__(self):
+        return f"{self.proyecto_id} - {self.fecha}: {self.avance_real:.1f}%"
@@ -1,14 +1,17 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
-import uuid
 from .element_model import ElementoConstructivo
 from .cuadrilla_model import Cuadrilla
 from .audited_model import AuditedModel
+from .utm_model import CoordenadasUTMModel
+from .uuid_utils import uuid7
 
-class ReporteAvance(AuditedModel):
+class ReporteAvance(AuditedModel, CoordenadasUTMModel):
     """Reportes diarios de avance con evidencia fotográfica"""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    ruta_proyecto = 'elemento__proyecto'
+
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     elemento = models.ForeignKey(
         ElementoConstructivo,
         on_delete=models.CASCADE,
@@ -30,6 +33,10 @@ class ReporteAvance(AuditedModel):
     latitud = models.FloatField()
     longitud = models.FloatField()
 
+    # Geocerca: distancia en UTM entre el reporte y su elemento
+    distancia_elemento_m = models.FloatField(null=True, blank=True, editable=False)
+    fuera_de_geocerca = models.BooleanField(default=False, db_index=True, editable=False)
+
     # Mediciones
     avance_cantidad = models.FloatField(
         help_text="Cantidad ejecutada en la unidad del concepto"
@@ -40,6 +47,8 @@ class ReporteAvance(AuditedModel):
 
     # Evidencia
     foto = models.ImageField(upload_to='reportes_avance/', null=True, blank=True)
+    # Variantes reducidas (WebP y JPEG) generadas en segundo plano a partir de la foto
+    miniaturas = models.JSONField(default=dict, blank=True, editable=False)
     descripcion = models.TextField()
 
     # Recursos utilizados
@@ -0,0 +1,67 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+from .audited_model import AuditedModel
+from .uuid_utils import uuid7
+
+
+class EstadosTarea(models.TextChoices):
+    PENDIENTE = 'PENDIENTE', 'Pendiente'
+    EJECUCION = 'EJECUCION', 'En Ejecución'
+    COMPLETADA = 'COMPLETADA', 'Completada'
+    FALLIDA = 'FALLIDA', 'Fallida'
+
+
+class TareaFondo(AuditedModel):
+    """
+    Trabajos largos que se ejecutan fuera del request con el comando procesar_tareas.
+    Guardan su avance por lotes para poder reanudarse donde se quedaron.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    tipo = models.CharField(max_length=50)
+    descripcion = models.CharField(max_length=200, blank=True)
+
+    estado = models.CharField(
+        max_length=20,
+        choices=EstadosTarea,
+        default='PENDIENTE'
+    )
+
+    # Datos de entrada: parámetros JSON y las llaves de los registros seleccionados
+    parametros = models.JSONField(default=dict, blank=True)
+    seleccion = models.JSONField(null=True, blank=True, editable=False)
+
+    # Progreso y punto de reanudación (último pk procesado o posición en la selección)
+    total = models.PositiveIntegerField(default=0)
+    procesados = models.PositiveIntegerField(default=0)
+    checkpoint = models.CharField(max_length=64, blank=True)
+
+    resultado = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+
+    creada_por = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='tareas_fondo'
+    )
+    iniciada_en = models.DateTimeField(null=True, blank=True)
+    finalizada_en = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Tarea en Segundo Plano"
+        verbose_name_plural = "Tareas en Segundo Plano"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['estado', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.descripcion or self.tipo} - {self.get_estado_display()}"
+
+    @property
+    def porcentaje(self):
+        if not self.total:
+            return 100 if self.estado == 'COMPLETADA' else 0
+        return round(min(self.procesados / self.total, 1) * 100, 1)
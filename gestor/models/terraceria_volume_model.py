@@ -1,10 +1,20 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 import uuid
 from .audited_model import AuditedModel
 from .project_model import Proyecto
 
+
+class EstadosCalculo(models.TextChoices):
+    SIN_CALCULO = 'SIN_CALCULO', 'Sin Calcular'
+    PENDIENTE = 'PENDIENTE', 'Pendiente'
+    EJECUCION = 'EJECUCION', 'En Ejecución'
+    COMPLETADO = 'COMPLETADO', 'Completado'
+    FALLIDO = 'FALLIDO', 'Fallido'
+
+
 class VolumenTerraceria(AuditedModel):
     """Cálculo de volúmenes de corte y relleno"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -28,6 +38,7 @@ class VolumenTerraceria(AuditedModel):
         ('GRID', 'Retícula (Grid)'),
         ('TIN', 'Triangulación (TIN)'),
         ('CURVAS', 'Curvas de Nivel'),
+        ('DIFERENCIA', 'Diferencia entre Levantamientos'),
     ]
     metodo_calculo = models.CharField(max_length=20, choices=METODOS)
 
@@ -43,6 +54,67 @@ class VolumenTerraceria(AuditedModel):
         help_text="Archivo CSV con coordenadas del levantamiento"
     )
 
+    # Superficie de diseño: archivo de puntos o, si no hay, una elevación constante
+    archivo_diseno = models.FileField(
+        upload_to='levantamientos/diseno/',
+        null=True,
+        blank=True,
+        help_text="Archivo CSV con puntos de la superficie de diseño"
+    )
+    # Levantamiento anterior del mismo terreno: se usa como superficie de comparación
+    levantamiento_base = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='comparaciones',
+        help_text="Levantamiento anterior contra el que se compara (p. ej. terreno natural)"
+    )
+    elevacion_diseno = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Elevación de proyecto (m); por defecto la de referencia del proyecto"
+    )
+    tamano_celda_m = models.FloatField(
+        default=1.0,
+        validators=[MinValueValidator(0.01)],
+        help_text="Tamaño de celda para el método de retícula (m)"
+    )
+    intervalo_curvas_m = models.FloatField(
+        default=0.5,
+        validators=[MinValueValidator(0.01)],
+        help_text="Equidistancia entre curvas de nivel para el método de curvas (m)"
+    )
+    # Diagrama de masas
+    coeficiente_variabilidad = models.FloatField(
+        default=1.0,
+        validators=[MinValueValidator(0.01)],
+        help_text="Coeficiente de variabilidad volumétrica aplicado al corte en el diagrama de masas"
+    )
+    acarreo_libre_m = models.FloatField(
+        default=20.0,
+        validators=[MinValueValidator(0)],
+        help_text="Distancia de acarreo libre (m); lo que se mueve más lejos es sobreacarreo"
+    )
+    correccion_prismoidal = models.BooleanField(
+        default=False,
+        help_text="En el método de secciones, aplicar la corrección prismoidal al promedio de áreas"
+    )
+
+    # Trabajo de cálculo en segundo plano (comando procesar_volumenes)
+    estado_calculo = models.CharField(
+        max_length=20,
+        choices=EstadosCalculo,
+        default='SIN_CALCULO',
+        db_index=True
+    )
+    progreso_calculo = models.PositiveSmallIntegerField(default=0)
+    calculo_iniciado_en = models.DateTimeField(null=True, blank=True)
+    calculo_finalizado_en = models.DateTimeField(null=True, blank=True)
+    duracion_calculo_s = models.FloatField(null=True, blank=True)
+    error_calculo = models.TextField(blank=True)
+    detalle_calculo = models.JSONField(default=dict, blank=True)
+
     class Meta:
         verbose_name = "Volumen de Terracería"
         verbose_name_plural = "Volúmenes de Terracería"
@@ -50,3 +122,19 @@ class VolumenTerraceria(AuditedModel):
 
     def __str__(self):
         return f"{self.nombre} - {self.fecha_calculo.date()}"
+
+    def clean(self):
+        base = self.levantamiento_base
+        if base is not None and (base.pk == self.pk or base.proyecto_id != self.proyecto_id):
+            raise ValidationError({
+                'levantamiento_base': 'Debe ser otro levantamiento del mismo proyecto'
+            })
+        if self.metodo_calculo == 'DIFERENCIA' and base is None:
+            raise ValidationError({
+                'levantamiento_base': 'El método de diferencia requiere un levantamiento base'
+            })
+
+    @property
+    def error_resumen(self):
+        """Última línea del traceback del cálculo fallido"""
+        return self.error_calculo.strip().splitlines()[-1] if self.error_calculo.strip() else ''
@@ -0,0 +1,72 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+from .audited_model import AuditedModel
+from .uuid_utils import uuid7
+
+
+class EstadosCarga(models.TextChoices):
+    EN_CURSO = 'EN_CURSO', 'En Curso'
+    COMPLETADA = 'COMPLETADA', 'Completada'
+    FALLIDA = 'FALLIDA', 'Fallida'
+    CANCELADA = 'CANCELADA', 'Cancelada'
+
+
+class DestinosCarga(models.TextChoices):
+    FOTO_REPORTE = 'FOTO_REPORTE', 'Foto de Reporte de Avance'
+    LEVANTAMIENTO = 'LEVANTAMIENTO', 'Archivo de Levantamiento'
+    DISENO = 'DISENO', 'Archivo de Diseño'
+
+
+class CargaArchivo(AuditedModel):
+    """
+    Carga reanudable de un archivo por fragmentos. Los fragmentos se agregan
+    en orden a un archivo parcial; ``recibido`` es el offset desde el que el
+    cliente debe continuar. Al completarse el archivo se asigna al campo del
+    registro destino.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    destino = models.CharField(max_length=20, choices=DestinosCarga)
+    objeto_id = models.UUIDField(help_text="ID del reporte o volumen que recibe el archivo")
+    nombre_archivo = models.CharField(max_length=255)
+
+    tamano_total = models.PositiveBigIntegerField()
+    recibido = models.PositiveBigIntegerField(default=0)
+    fragmentos = models.PositiveIntegerField(default=0)
+    sha256 = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="SHA-256 del archivo completo (opcional); se verifica al terminar"
+    )
+
+    estado = models.CharField(
+        max_length=20,
+        choices=EstadosCarga,
+        default='EN_CURSO',
+        db_index=True
+    )
+    archivo_final = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+
+    creada_por = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='cargas_archivo'
+    )
+    completada_en = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Carga de Archivo"
+        verbose_name_plural = "Cargas de Archivos"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.nombre_archivo} - {self.get_estado_display()}"
+
+    @property
+    def porcentaje(self):
+        if not self.tamano_total:
+            return 100 if self.estado == 'COMPLETADA' else 0
+        return round(self.recibido / self.tamano_total * 100, 1)
@@ -0,0 +1,133 @@
+from django.db import models
+from django.db.models import F, Q
+from django.utils import timezone
+
+CAMPOS_UTM = ['utm_este', 'utm_norte', 'utm_zona', 'utm_latitud', 'utm_longitud', 'utm_calculado_en']
+CAMPOS_COORDENADAS = {'latitud', 'longitud'}
+
+
+def asignar_utm(modelo, objetos):
+    """
+    Calcula la UTM de varios objetos con una sola conversión vectorizada.
+    La zona configurada en cada proyecto se obtiene con una consulta por lote.
+    """
+    # Importación diferida: gestor.services importa los modelos
+    from gestor.services.utm_service import convertir_lote
+
+    objetos = list(objetos)
+    if not objetos:
+        return objetos
+
+    primer_salto, _, resto = modelo.ruta_proyecto.partition('__')
+    campo = modelo._meta.get_field(primer_salto)
+    prefijo = f'{resto}__' if resto else ''
+    ids = {getattr(objeto, campo.attname) for objeto in objetos} - {None}
+    zonas_proyecto = {
+        pk: (zona, hemisferio)
+        for pk, zona, hemisferio in campo.related_model._base_manager.filter(pk__in=ids).values_list(
+            'pk', f'{prefijo}zona_utm', f'{prefijo}hemisferio'
+        )
+    }
+
+    configuracion = [zonas_proyecto.get(getattr(objeto, campo.attname), (None, None)) for objeto in objetos]
+    este, norte, zona, _ = convertir_lote(
+        [objeto.latitud for objeto in objetos],
+        [objeto.longitud for objeto in objetos],
+        [z for z, _ in configuracion],
+        [h for _, h in configuracion],
+    )
+
+    ahora = timezone.now()
+    for objeto, e, n, z in zip(objetos, este.tolist(), norte.tolist(), zona.tolist()):
+        objeto.fijar_utm(e, n, z, ahora)
+    return objetos
+
+
+class CoordenadasUTMQuerySet(models.QuerySet):
+    """Calcula la UTM en bloque antes de bulk_create/bulk_update"""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        asignar_utm(self.model, [obj for obj in objs if obj.utm_pendiente()])
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if CAMPOS_COORDENADAS & set(fields):
+            asignar_utm(self.model, [obj for obj in objs if obj.utm_pendiente()])
+            fields = [*fields, *(campo for campo in CAMPOS_UTM if campo not in fields)]
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+
+class CoordenadasUTMModel(models.Model):
+    """
+    Coordenadas UTM derivadas de latitud/longitud.
+    ``ruta_proyecto`` indica cómo llegar al proyecto para leer su zona UTM.
+    """
+    ruta_proyecto = 'proyecto'
+
+    # Coordenadas UTM (calculadas automáticamente)
+    utm_este = models.FloatField(null=True, blank=True)
+    utm_norte = models.FloatField(null=True, blank=True)
+    utm_zona = models.IntegerField(null=True, blank=True)
+    utm_calculado_en = models.DateTimeField(null=True, blank=True, editable=False)
+    # Latitud/longitud con las que se calculó la UTM
+    utm_latitud = models.FloatField(null=True, blank=True, editable=False)
+    utm_longitud = models.FloatField(null=True, blank=True, editable=False)
+
+    objects = CoordenadasUTMQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Coordenadas a las que corresponde la UTM guardada
+        if 'utm_latitud' in instance.__dict__:
+            instance._coordenadas_utm = (instance.utm_latitud, instance.utm_longitud)
+        elif instance.__dict__.get('utm_este', 0) is not None:
+            instance._coordenadas_utm = (
+                instance.__dict__.get('latitud'),
+                instance.__dict__.get('longitud'),
+            )
+        return instance
+
+    @classmethod
+    def filtro_utm_pendiente(cls):
+        """
+        Filas sin UTM o cuyas coordenadas ya no son las usadas para
+        calcularla (también si cambiaron con queryset.update).
+        """
+        return (
+            Q(utm_este__isnull=True)
+            | Q(utm_latitud__isnull=True)
+            | Q(utm_longitud__isnull=True)
+            | ~Q(latitud=F('utm_latitud'))
+            | ~Q(longitud=F('utm_longitud'))
+        )
+
+    def utm_pendiente(self):
+        """Indica si latitud/longitud cambiaron desde que se calculó la UTM"""
+        if not CAMPOS_COORDENADAS <= self.__dict__.keys():
+            return False
+        if self.latitud is None or self.longitud is None:
+            return False
+        return getattr(self, '_coordenadas_utm', None) != (self.latitud, self.longitud)
+
+    def fijar_utm(self, este, norte, zona, calculado_en=None):
+        """Asigna una UTM ya calculada para las coordenadas actuales"""
+        self.utm_este = este
+        self.utm_norte = norte
+        self.utm_zona = zona
+        self.utm_latitud = self.latitud
+        self.utm_longitud = self.longitud
+        self.utm_calculado_en = calculado_en or timezone.now()
+        self._coordenadas_utm = (self.latitud, self.longitud)
+
+    def save(self, *args, **kwargs):
+        if self.utm_pendiente():
+            asignar_utm(type(self), [self])
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], *CAMPOS_UTM}
+        super().save(*args, **kwargs)
@@ -0,0 +1,49 @@
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_ultimo_ms = 0
+_secuencia = 0
+
+
+def uuid7():
+    """
+    Genera un UUID versión 7 (RFC 9562) ordenado por tiempo.
+
+    Los primeros 48 bits son el timestamp Unix en milisegundos, por lo que
+    las inserciones consecutivas caen al final del índice btree en lugar de
+    dispersarse por todo el árbol como ocurre con uuid4.
+    Dentro del mismo milisegundo los 12 bits de rand_a funcionan como
+    contador para mantener el orden monotónico en el proceso.
+    """
+    global _ultimo_ms, _secuencia
+
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _ultimo_ms:
+            _ultimo_ms = ms
+            _secuencia = int.from_bytes(os.urandom(2), 'big') & 0x7FF
+        else:
+            _secuencia += 1
+            if _secuencia > 0xFFF:
+                # Contador agotado: se avanza el reloj lógico un milisegundo
+                _ultimo_ms += 1
+                _secuencia = 0
+        ms = _ultimo_ms
+        secuencia = _secuencia
+
+    rand_b = int.from_bytes(os.urandom(8), 'big') & 0x3FFFFFFFFFFFFFFF
+
+    valor = (ms & 0xFFFFFFFFFFFF) << 80
+    valor |= 0x7 << 76
+    valor |= secuencia << 64
+    valor |= 0b10 << 62
+    valor |= rand_b
+    return uuid.UUID(int=valor)
+
+
+def uuid7_timestamp(valor):
+    """Devuelve el timestamp (segundos) embebido en un UUID v7"""
+    return (valor.int >> 80) / 1000
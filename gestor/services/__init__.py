@@ -0,0 +1,17 @@
+from .task_service import encolar, ejecutar, reclamar_siguiente, reanudar
+from .purge_service import purgar_proyecto, contar_purga
+from .avance_service import curva_s
+from .utm_backfill_service import actualizar_utm
+from .transformacion_service import transformacion_de_proyecto, coordenadas_proyecto
+from .puntos_cercanos_service import puntos_cercanos, puntos_cercanos_a
+from .geocerca_service import evaluar_geocerca
+from .ajuste_red_service import ajustar_red
+from .volumenes import calcular_volumen
+from .miniaturas_service import miniatura_de
+from .volumenes.trabajos import programar_calculos, reanudar_calculos
+from . import validation_service, exportacion_service
+
+__all__ = ['encolar', 'ejecutar', 'reclamar_siguiente', 'reanudar', 'purgar_proyecto', 'contar_purga', 'curva_s', 'actualizar_utm',
+           'transformacion_de_proyecto', 'coordenadas_proyecto',
+           'puntos_cercanos', 'puntos_cercanos_a', 'evaluar_geocerca', 'ajustar_red', 'calcular_volumen',
+           'programar_calculos', 'reanudar_calculos', 'miniatura_de']
@@ -0,0 +1,275 @@
+"""
+Ajuste por mínimos cuadrados ponderados de la red de puntos de control.
+
+Incógnitas: coordenadas locales (x, y) y elevación de cada punto.
+Observaciones:
+  - posición medida de cada punto, con su precisión (o la típica del equipo)
+  - DELTA_ESTE / DELTA_NORTE: componentes de vectores GNSS entre puntos
+  - DISTANCIA: distancia horizontal (no lineal, Gauss-Newton)
+  - DESNIVEL: diferencia de elevación (nivelación)
+La parte horizontal y la vertical se resuelven por separado; el sistema
+normal es disperso (cada observación toca a lo más dos puntos), así que
+escala a decenas de miles de puntos.
+"""
+import time
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
+
+from gestor.models import ObservacionTopografica, PuntoControl
+from .task_service import tarea
+from .transformacion_service import transformacion_de_proyecto
+
+# Precisión típica (horizontal, vertical) en cm cuando no se registró
+PRECISION_EQUIPO_CM = {
+    'GPS_DIFERENCIAL': (1.0, 2.0),
+    'GPS_RTK': (2.0, 4.0),
+    'ESTACION_TOTAL': (0.5, 1.0),
+    'NIVEL': (100.0, 0.2),
+    'GPS_MOVIL': (300.0, 500.0),
+}
+PRECISION_DEFECTO_CM = (5.0, 10.0)
+
+HORIZONTALES = ('DISTANCIA', 'DELTA_ESTE', 'DELTA_NORTE')
+
+
+def _resolver(columnas, coeficientes, discrepancias, pesos, incognitas):
+    """Resuelve las ecuaciones normales (AᵀWA) dx = AᵀWl de un sistema disperso"""
+    filas = np.repeat(np.arange(len(discrepancias)), columnas.shape[1])
+    matriz = sparse.csr_matrix(
+        (coeficientes.ravel(), (filas, columnas.ravel())),
+        shape=(len(discrepancias), incognitas),
+    )
+    ponderada = matriz.T.multiply(pesos).tocsr()
+    normal = (ponderada @ matriz).tocsc()
+    return spsolve(normal, ponderada @ discrepancias)
+
+
+def _varianza_unitaria(residuos, pesos, redundancia):
+    if redundancia <= 0:
+        return None
+    return float(np.sqrt(np.sum(pesos * residuos ** 2) / redundancia))
+
+
+def ajustar_horizontal(x, y, sigma, tipos, i, j, valores, sigmas, iteraciones=10, tolerancia=1e-5):
+    """
+    Ajuste horizontal por Gauss-Newton. ``x``, ``y`` y ``sigma`` son las
+    posiciones medidas y su precisión (m); ``tipos``/``i``/``j``/``valores``/``sigmas``
+    describen las observaciones relativas. Devuelve (x, y, residuos, sigma0, iteraciones).
+    """
+    n = len(x)
+    medido = np.column_stack([x, y]).ravel()
+    actual = medido.copy()
+
+    es_este = tipos == 'DELTA_ESTE'
+    es_norte = tipos == 'DELTA_NORTE'
+    es_distancia = tipos == 'DISTANCIA'
+    i_d, j_d = i[es_distancia], j[es_distancia]
+
+    pesos = np.concatenate([
+        np.repeat(1 / sigma ** 2, 2),
+        1 / sigmas[es_este] ** 2,
+        1 / sigmas[es_norte] ** 2,
+        1 / sigmas[es_distancia] ** 2,
+    ])
+
+    # Todas las filas usan 4 columnas para armar la matriz de una vez; las filas
+    # de posición y de vector repiten columna con coeficiente 0
+    columnas_fijas = np.concatenate([
+        np.repeat(np.arange(2 * n)[:, None], 4, axis=1),
+        np.column_stack([2 * i[es_este], 2 * j[es_este]])[:, [0, 1, 1, 1]],
+        np.column_stack([2 * i[es_norte] + 1, 2 * j[es_norte] + 1])[:, [0, 1, 1, 1]],
+    ])
+    coeficientes_fijos = np.concatenate([
+        np.tile([1.0, 0.0, 0.0, 0.0], (2 * n, 1)),
+        np.tile([-1.0, 1.0, 0.0, 0.0], (int(es_este.sum() + es_norte.sum()), 1)),
+    ])
+    columnas = np.concatenate([
+        columnas_fijas,
+        np.column_stack([2 * i_d, 2 * i_d + 1, 2 * j_d, 2 * j_d + 1]),
+    ])
+    observado = np.concatenate([medido, valores[es_este], valores[es_norte], valores[es_distancia]])
+
+    iteracion = 0
+    for iteracion in range(1, iteraciones + 1):
+        xs, ys = actual[0::2], actual[1::2]
+        dx = xs[j_d] - xs[i_d]
+        dy = ys[j_d] - ys[i_d]
+        distancia = np.hypot(dx, dy)
+        ux, uy = dx / distancia, dy / distancia
+
+        calculado = np.concatenate([
+            actual,
+            xs[j[es_este]] - xs[i[es_este]],
+            ys[j[es_norte]] - ys[i[es_norte]],
+            distancia,
+        ])
+        coeficientes = np.concatenate([coeficientes_fijos, np.column_stack([-ux, -uy, ux, uy])])
+
+        correccion = _resolver(columnas, coeficientes, observado - calculado, pesos, 2 * n)
+        actual += correccion
+        if np.abs(correccion).max(initial=0) < tolerancia:
+            break
+
+    xs, ys = actual[0::2], actual[1::2]
+    residuos = np.empty(len(tipos))
+    residuos[es_este] = xs[j[es_este]] - xs[i[es_este]] - valores[es_este]
+    residuos[es_norte] = ys[j[es_norte]] - ys[i[es_norte]] - valores[es_norte]
+    residuos[es_distancia] = np.hypot(xs[j_d] - xs[i_d], ys[j_d] - ys[i_d]) - valores[es_distancia]
+
+    todos = np.concatenate([actual - medido, residuos[es_este], residuos[es_norte], residuos[es_distancia]])
+    sigma0 = _varianza_unitaria(todos, pesos, len(tipos))
+    return xs, ys, residuos, sigma0, iteracion
+
+
+def ajustar_vertical(h, sigma, i, j, valores, sigmas):
+    """Ajuste lineal de elevaciones con desniveles. Devuelve (h, residuos, sigma0)"""
+    n = len(h)
+    columnas = np.concatenate([
+        np.column_stack([np.arange(n), np.arange(n)]),
+        np.column_stack([i, j]),
+    ])
+    coeficientes = np.concatenate([
+        np.column_stack([np.ones(n), np.zeros(n)]),
+        np.tile([-1.0, 1.0], (len(i), 1)),
+    ])
+    observado = np.concatenate([h, valores])
+    pesos = np.concatenate([1 / sigma ** 2, 1 / sigmas ** 2])
+
+    # Se resuelve como corrección a las elevaciones medidas para conservar precisión
+    calculado = np.concatenate([h, h[j] - h[i]])
+    correccion = _resolver(columnas, coeficientes, observado - calculado, pesos, n)
+    ajustada = h + correccion
+
+    residuos = ajustada[j] - ajustada[i] - valores
+    sigma0 = _varianza_unitaria(np.concatenate([correccion, residuos]), pesos, len(i))
+    return ajustada, residuos, sigma0
+
+
+def _precisiones(registradas, equipos, posicion):
+    """Precisión en m: la registrada o la típica del equipo"""
+    return np.array([
+        (valor if valor else PRECISION_EQUIPO_CM.get(equipo, PRECISION_DEFECTO_CM)[posicion]) / 100
+        for valor, equipo in zip(registradas, equipos)
+    ], dtype=np.float64)
+
+
+def ajustar_red(proyecto_id, solo_validados=False, guardar=True):
+    """
+    Ajusta la red de puntos de control del proyecto y guarda las coordenadas
+    ajustadas y los residuos. Devuelve un resumen con los tiempos de solución.
+    """
+    inicio = time.perf_counter()
+    puntos = PuntoControl.objects.filter(proyecto_id=proyecto_id)
+    if solo_validados:
+        puntos = puntos.filter(validado=True)
+    filas = list(puntos.order_by('pk').values_list(
+        'pk', 'latitud', 'longitud', 'elevacion',
+        'precision_horizontal', 'precision_vertical', 'equipo_medicion',
+    ))
+    if not filas:
+        return {'puntos': 0, 'observaciones': 0}
+
+    ids, latitudes, longitudes, elevaciones, prec_h, prec_v, equipos = zip(*filas)
+    posicion = {pk: indice for indice, pk in enumerate(ids)}
+
+    observaciones = [
+        fila for fila in ObservacionTopografica.objects.filter(proyecto_id=proyecto_id).values_list(
+            'pk', 'tipo', 'desde_id', 'hasta_id', 'valor', 'desviacion_estandar', 'equipo_medicion',
+        )
+        if fila[2] in posicion and fila[3] in posicion
+    ]
+    if observaciones:
+        obs_ids, tipos, desde, hasta, valores, obs_desv, obs_equipos = zip(*observaciones)
+    else:
+        obs_ids, tipos, desde, hasta, valores, obs_desv, obs_equipos = (), (), (), (), (), (), ()
+    tipos = np.array(tipos, dtype=object)
+    i = np.array([posicion[pk] for pk in desde], dtype=np.int64)
+    j = np.array([posicion[pk] for pk in hasta], dtype=np.int64)
+    valores = np.array(valores, dtype=np.float64)
+    horizontal = np.isin(tipos, HORIZONTALES)
+    vertical = tipos == 'DESNIVEL'
+    obs_sigmas = np.where(
+        horizontal,
+        _precisiones(obs_desv, obs_equipos, 0),
+        _precisiones(obs_desv, obs_equipos, 1),
+    )
+
+    # Las distancias de obra son de terreno: se trabaja en la cuadrícula LOCAL
+    transformacion = transformacion_de_proyecto(proyecto_id)
+    x, y = transformacion.wgs84_a_local(latitudes, longitudes)
+    h = np.array(elevaciones, dtype=np.float64)
+    preparacion = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    x_aj, y_aj, residuos_h, sigma0_h, iteraciones = ajustar_horizontal(
+        x, y, _precisiones(prec_h, equipos, 0),
+        tipos[horizontal], i[horizontal], j[horizontal], valores[horizontal], obs_sigmas[horizontal],
+    )
+    h_aj, residuos_v, sigma0_v = ajustar_vertical(
+        h, _precisiones(prec_v, equipos, 1),
+        i[vertical], j[vertical], valores[vertical], obs_sigmas[vertical],
+    )
+    solucion = time.perf_counter() - inicio
+
+    resumen = {
+        'puntos': len(ids),
+        'observaciones': len(obs_ids),
+        'iteraciones': iteraciones,
+        'sigma0_horizontal': sigma0_h,
+        'sigma0_vertical': sigma0_v,
+        'residuo_horizontal_max_m': round(float(np.hypot(x_aj - x, y_aj - y).max()), 4),
+        'residuo_vertical_max_m': round(float(np.abs(h_aj - h).max()), 4),
+        'tiempo_preparacion_s': round(preparacion, 3),
+        'tiempo_solucion_s': round(solucion, 3),
+    }
+    if not guardar:
+        return resumen
+
+    latitud_aj, longitud_aj = transformacion.local_a_wgs84(x_aj, y_aj)
+    ahora = timezone.now()
+    ajustados = [
+        PuntoControl(
+            pk=pk,
+            latitud_ajustada=lat,
+            longitud_ajustada=lon,
+            elevacion_ajustada=elev,
+            residuo_horizontal=res_h,
+            residuo_vertical=res_v,
+            ajustado_en=ahora,
+        )
+        for pk, lat, lon, elev, res_h, res_v in zip(
+            ids, latitud_aj.tolist(), longitud_aj.tolist(), h_aj.tolist(),
+            np.hypot(x_aj - x, y_aj - y).tolist(), (h_aj - h).tolist(),
+        )
+    ]
+    residuos = np.empty(len(obs_ids))
+    residuos[horizontal] = residuos_h
+    residuos[vertical] = residuos_v
+    con_residuo = [
+        ObservacionTopografica(pk=pk, residuo=residuo)
+        for pk, residuo in zip(obs_ids, residuos.tolist())
+    ]
+
+    with transaction.atomic():
+        PuntoControl.objects.bulk_update(ajustados, [
+            'latitud_ajustada', 'longitud_ajustada', 'elevacion_ajustada',
+            'residuo_horizontal', 'residuo_vertical', 'ajustado_en',
+        ], batch_size=2000)
+        ObservacionTopografica.objects.bulk_update(con_residuo, ['residuo'], batch_size=2000)
+
+    return resumen
+
+
+@tarea('ajustar_red')
+def ajustar_red_tarea(tarea_fondo):
+    """Ajusta la red del proyecto indicado en los parámetros"""
+    parametros = tarea_fondo.parametros
+    resumen = ajustar_red(parametros['proyecto_id'], parametros.get('solo_validados', False))
+    tarea_fondo.total = tarea_fondo.procesados = resumen['puntos']
+    tarea_fondo.resultado = resumen
+    tarea_fondo.save(update_fields=['total', 'procesados', 'resultado', 'updated_at'])
+    return resumen
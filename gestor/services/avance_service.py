@@ -0,0 +1,120 @@
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+from gestor.models import ElementoConstructivo, HistorialAvance, AvanceProyectoDiario
+
+
+def registrar_avance(elemento, fecha=None):
+    """Guarda la fotografía del día del elemento y actualiza el acumulado del proyecto"""
+    fecha = fecha or timezone.localdate()
+
+    HistorialAvance.objects.update_or_create(
+        elemento_id=elemento.pk,
+        fecha=fecha,
+        defaults={
+            'proyecto_id': elemento.proyecto_id,
+            'porcentaje_avance': elemento.porcentaje_avance,
+            'estado': elemento.estado,
+        }
+    )
+    actualizar_avance_diario(elemento.proyecto_id, fecha)
+
+
+def actualizar_avance_diario(proyecto_id, fecha=None):
+    """Recalcula la fila de la curva S del proyecto para el día indicado"""
+    fecha = fecha or timezone.localdate()
+
+    resumen = ElementoConstructivo.objects.filter(proyecto_id=proyecto_id).aggregate(
+        avance=Avg('porcentaje_avance'),
+        total=Count('id'),
+        terminados=Count('id', filter=Q(estado='TERMINADO')),
+    )
+
+    AvanceProyectoDiario.objects.update_or_create(
+        proyecto_id=proyecto_id,
+        fecha=fecha,
+        defaults={
+            'avance_real': resumen['avance'] or 0,
+            'total_elementos': resumen['total'],
+            'elementos_terminados': resumen['terminados'],
+        }
+    )
+
+
+def curva_programada(proyecto, desde, hasta):
+    """
+    Avance programado promedio por día a partir de las fechas programadas.
+    Cada elemento aporta una rampa lineal de 0 a 100% entre su inicio y fin;
+    se acumulan las pendientes en un arreglo de diferencias para no recorrer
+    todos los elementos en cada día.
+    """
+    dias = (hasta - desde).days + 1
+    pendiente = [0.0] * (dias + 1)
+    base = 0.0
+
+    programacion = proyecto.elementos.values_list('fecha_inicio_programada', 'fecha_fin_programada')
+    total = 0
+    for inicio, fin in programacion:
+        total += 1
+        if not inicio or not fin:
+            continue
+        duracion = max((fin - inicio).days, 1)
+        ritmo = 100 / duracion
+
+        # Día relativo (respecto a "desde") en que empieza y termina la rampa
+        a = (inicio - desde).days
+        b = a + duracion
+        if b <= 0:
+            base += 100
+            continue
+        if a < 0:
+            base += ritmo * -a
+            a = 0
+        if a < dias:
+            pendiente[a + 1] += ritmo
+            if b < dias:
+                pendiente[b + 1] -= ritmo
+
+    valores = []
+    acumulado = base
+    ritmo_actual = 0.0
+    for i in range(dias):
+        ritmo_actual += pendiente[i]
+        acumulado += ritmo_actual
+        valores.append(round(acumulado / total, 2) if total else 0)
+    return valores
+
+
+def curva_s(proyecto, desde=None, hasta=None):
+    """
+    Curvas S programada y real de un proyecto, día por día.
+    El avance real sale de un único barrido del índice (proyecto, fecha) de
+    AvanceProyectoDiario; los días sin cambios conservan el último valor.
+    """
+    desde = desde or proyecto.fecha_inicio
+    hasta = hasta or max(timezone.localdate(), proyecto.fecha_fin_estimada)
+
+    acumulados = AvanceProyectoDiario.objects.filter(
+        proyecto=proyecto,
+        fecha__lte=hasta,
+    ).order_by('fecha').values_list('fecha', 'avance_real')
+
+    fechas = [desde + timedelta(days=i) for i in range((hasta - desde).days + 1)]
+    real = []
+    ultimo = 0
+    hoy = timezone.localdate()
+    registros = iter(acumulados)
+    siguiente = next(registros, None)
+    for fecha in fechas:
+        while siguiente is not None and siguiente[0] <= fecha:
+            ultimo = siguiente[1]
+            siguiente = next(registros, None)
+        real.append(round(ultimo, 2) if fecha <= hoy else None)
+
+    return {
+        'fechas': [fecha.isoformat() for fecha in fechas],
+        'programado': curva_programada(proyecto, desde, hasta),
+        'real': real,
+    }
@@ -0,0 +1,211 @@
+"""
+Cargas reanudables por fragmentos para fotos de reportes y archivos de
+levantamiento o diseño.
+
+El cliente crea la carga con el tamaño total, envía fragmentos con su offset
+y su SHA-256 y, si la conexión se cae, pregunta el offset recibido y sigue
+desde ahí. Cada fragmento se lee del request por bloques y se escribe
+directo al archivo parcial, así la memoria no depende del tamaño del
+archivo. El último fragmento ensambla el archivo en el almacenamiento del
+campo destino (también por bloques) y borra el parcial.
+"""
+import hashlib
+import os
+import uuid
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image
+
+from gestor.models import CargaArchivo
+
+# Destino -> (modelo, campo del archivo)
+DESTINOS = {
+    'FOTO_REPORTE': ('gestor.ReporteAvance', 'foto'),
+    'LEVANTAMIENTO': ('gestor.VolumenTerraceria', 'archivo_levantamiento'),
+    'DISENO': ('gestor.VolumenTerraceria', 'archivo_diseno'),
+}
+
+TAMANO_BLOQUE = 64 * 1024
+# Tamaño máximo de un fragmento; el cliente puede enviar menos
+TAMANO_FRAGMENTO = 8 * 1024 * 1024
+TAMANO_MAXIMO = 2 * 1024 ** 3
+
+
+class ErrorCarga(Exception):
+    """Error de la carga; ``codigo`` es el estado HTTP que corresponde"""
+
+    def __init__(self, mensaje, codigo=400):
+        super().__init__(mensaje)
+        self.codigo = codigo
+
+
+def directorio_parciales():
+    return getattr(settings, 'CARGAS_DIRECTORIO', os.path.join(settings.BASE_DIR, 'cargas'))
+
+
+def ruta_parcial(carga):
+    return os.path.join(directorio_parciales(), f'{carga.pk}.part')
+
+
+def campo_destino(destino):
+    etiqueta, campo = DESTINOS[destino]
+    return apps.get_model(etiqueta), campo
+
+
+def crear_carga(usuario, destino, objeto_id, nombre_archivo, tamano_total, sha256=''):
+    """Valida el destino y crea la carga con su archivo parcial vacío"""
+    if destino not in DESTINOS:
+        raise ErrorCarga(f'Destino desconocido: {destino}')
+    try:
+        objeto_id = uuid.UUID(str(objeto_id))
+    except ValueError:
+        raise ErrorCarga('objeto_id debe ser un UUID válido')
+    modelo, _ = campo_destino(destino)
+    if not usuario.has_perm(f'{modelo._meta.app_label}.change_{modelo._meta.model_name}'):
+        raise ErrorCarga('Sin permiso para modificar el registro destino', 403)
+    if not modelo.objects.filter(pk=objeto_id).exists():
+        raise ErrorCarga(f'{modelo._meta.verbose_name} no encontrado', 404)
+    if not 0 < tamano_total <= TAMANO_MAXIMO:
+        raise ErrorCarga(f'El tamaño debe estar entre 1 byte y {TAMANO_MAXIMO} bytes')
+    nombre_archivo = os.path.basename(nombre_archivo.replace('\\', '/')).strip()
+    if not nombre_archivo:
+        raise ErrorCarga('Falta el nombre del archivo')
+
+    carga = CargaArchivo.objects.create(
+        destino=destino,
+        objeto_id=objeto_id,
+        nombre_archivo=nombre_archivo[:255],
+        tamano_total=tamano_total,
+        sha256=sha256.lower(),
+        creada_por=usuario,
+    )
+    os.makedirs(directorio_parciales(), exist_ok=True)
+    open(ruta_parcial(carga), 'wb').close()
+    return carga
+
+
+def recibir_fragmento(carga_id, offset, flujo, longitud, checksum):
+    """
+    Agrega ``longitud`` bytes leídos de ``flujo`` en ``offset``. El fragmento
+    solo cuenta si llega completo y su SHA-256 coincide con ``checksum``; si no,
+    el archivo parcial vuelve al offset anterior. Devuelve la carga actualizada.
+    """
+    if not checksum:
+        raise ErrorCarga('Falta el SHA-256 del fragmento')
+    if not 0 < longitud <= TAMANO_FRAGMENTO:
+        raise ErrorCarga(f'El fragmento debe tener entre 1 y {TAMANO_FRAGMENTO} bytes')
+
+    with transaction.atomic():
+        # Un solo fragmento a la vez por carga
+        carga = CargaArchivo.objects.select_for_update().get(pk=carga_id)
+        if carga.estado != 'EN_CURSO':
+            raise ErrorCarga(f'La carga está {carga.get_estado_display().lower()}', 409)
+        if offset != carga.recibido:
+            raise ErrorCarga(f'Offset {offset} no coincide con lo recibido ({carga.recibido})', 409)
+        if offset + longitud > carga.tamano_total:
+            raise ErrorCarga('El fragmento excede el tamaño declarado')
+
+        digest = hashlib.sha256()
+        escritos = 0
+        with open(ruta_parcial(carga), 'r+b') as parcial:
+            # Descarta restos de un fragmento anterior que no se confirmó
+            parcial.truncate(offset)
+            parcial.seek(offset)
+            while escritos < longitud:
+                bloque = flujo.read(min(TAMANO_BLOQUE, longitud - escritos))
+                if not bloque:
+                    break
+                digest.update(bloque)
+                parcial.write(bloque)
+                escritos += len(bloque)
+
+            if escritos != longitud or digest.hexdigest() != checksum.lower():
+                parcial.truncate(offset)
+                if escritos != longitud:
+                    raise ErrorCarga(f'Fragmento incompleto: {escritos} de {longitud} bytes')
+                raise ErrorCarga('El SHA-256 del fragmento no coincide')
+            parcial.flush()
+            os.fsync(parcial.fileno())
+
+        carga.recibido += longitud
+        carga.fragmentos += 1
+        carga.save(update_fields=['recibido', 'fragmentos', 'updated_at'])
+
+    if carga.recibido == carga.tamano_total:
+        ensamblar(carga)
+    return carga
+
+
+def ensamblar(carga):
+    """Verifica el archivo completo y lo guarda en el campo del registro destino"""
+    ruta = ruta_parcial(carga)
+    modelo, campo = campo_destino(carga.destino)
+    try:
+        if carga.sha256:
+            with open(ruta, 'rb') as parcial:
+                if hashlib.file_digest(parcial, 'sha256').hexdigest() != carga.sha256:
+                    raise ErrorCarga('El SHA-256 del archivo completo no coincide', 422)
+        if carga.destino == 'FOTO_REPORTE':
+            try:
+                with Image.open(ruta) as imagen:
+                    imagen.verify()
+            except (OSError, ValueError, Image.DecompressionBombError):
+                raise ErrorCarga('El archivo no es una imagen válida', 422)
+
+        objeto = modelo.objects.filter(pk=carga.objeto_id).first()
+        if objeto is None:
+            raise ErrorCarga('El registro destino ya no existe', 404)
+        with open(ruta, 'rb') as parcial:
+            # El almacenamiento copia el archivo por bloques (File.chunks)
+            getattr(objeto, campo).save(carga.nombre_archivo, File(parcial), save=False)
+        objeto.save(update_fields=[campo, 'updated_at'])
+    except Exception as error:
+        # El archivo ya llegó completo: no hay fragmento que reintentar
+        carga.estado = 'FALLIDA'
+        carga.error = str(error)
+        carga.save(update_fields=['estado', 'error', 'updated_at'])
+        raise
+    finally:
+        os.remove(ruta)
+
+    carga.estado = 'COMPLETADA'
+    carga.archivo_final = getattr(objeto, campo).name
+    carga.completada_en = timezone.now()
+    carga.save(update_fields=['estado', 'archivo_final', 'completada_en', 'updated_at'])
+
+
+def cancelar_cargas(queryset):
+    """Cancela cargas en curso y borra sus archivos parciales"""
+    cargas = list(queryset.filter(estado='EN_CURSO'))
+    for carga in cargas:
+        try:
+            os.remove(ruta_parcial(carga))
+        except FileNotFoundError:
+            pass
+    return queryset.filter(pk__in=[carga.pk for carga in cargas]).update(
+        estado='CANCELADA', updated_at=timezone.now()
+    )
+
+
+def abandonadas(dias):
+    """Cargas en curso sin fragmentos nuevos en ``dias`` días"""
+    return CargaArchivo.objects.filter(estado='EN_CURSO', updated_at__lt=timezone.now() - timedelta(days=dias))
+
+
+def estado_carga(carga):
+    """Respuesta JSON de la API"""
+    return {
+        'id': str(carga.pk),
+        'estado': carga.estado,
+        'offset': carga.recibido,
+        'tamano_total': carga.tamano_total,
+        'fragmentos': carga.fragmentos,
+        'tamano_fragmento': TAMANO_FRAGMENTO,
+        'archivo': carga.archivo_final or None,
+        'error': carga.error or None,
+    }
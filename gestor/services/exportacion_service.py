@@ -0,0 +1,340 @@
+"""
+Exportación de reportes de avance a Excel (XLSX) o CSV.
+
+Los reportes se leen con ``iterator`` (cursor del lado del servidor en
+PostgreSQL) y cada bloque de filas se escribe y se entrega de inmediato, así
+la memoria no depende del número de reportes. El XLSX se arma a mano con
+zipfile (hoja con cadenas en línea, sin tabla de cadenas compartidas) porque
+openpyxl no está entre las dependencias y además necesitaría la hoja entera.
+
+Hasta ``LIMITE_DESCARGA_DIRECTA`` reportes la exportación va directo en la
+respuesta; con más se genera en segundo plano en ``EXPORTACIONES_DIRECTORIO``,
+de donde ``limpiar_exportaciones`` borra las que ya caducaron.
+"""
+import csv
+import io
+import os
+import re
+import zipfile
+from datetime import date, datetime, time, timedelta
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.utils import timezone
+
+from gestor.models import ReporteAvance, TareaFondo
+from .task_service import tarea, bloques_seleccion
+
+FORMATOS = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv; charset=utf-8',
+}
+TAMANO_BLOQUE = 2000
+LIMITE_DESCARGA_DIRECTA = 50_000
+
+COLUMNAS = [
+    'Proyecto', 'Elemento', 'Nombre del Elemento', 'Fecha', 'Hora', 'Cuadrilla', 'Reportado por',
+    'Avance (cantidad)', 'Avance (%)', 'Descripción', 'Materiales', 'Personal', 'Horas Trabajadas',
+    'Latitud', 'Longitud', 'Distancia al Elemento (m)', 'Fuera de Geocerca', 'Validado', 'Validado por',
+]
+
+# Caracteres de control que XML no admite
+_INVALIDOS_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_EPOCA_EXCEL = date(1899, 12, 30)
+
+
+def nombre_usuario(usuario):
+    if usuario is None:
+        return ''
+    return usuario.get_full_name() or usuario.username
+
+
+def fila_reporte(reporte):
+    """Valores del reporte en el orden de ``COLUMNAS``"""
+    return [
+        reporte.elemento.proyecto.codigo,
+        reporte.elemento.codigo,
+        reporte.elemento.nombre,
+        reporte.fecha,
+        reporte.hora,
+        reporte.cuadrilla.nombre if reporte.cuadrilla else '',
+        nombre_usuario(reporte.reportado_por),
+        reporte.avance_cantidad,
+        reporte.avance_porcentaje,
+        reporte.descripcion,
+        reporte.materiales_utilizados,
+        reporte.personal_asignado,
+        reporte.horas_trabajadas,
+        reporte.latitud,
+        reporte.longitud,
+        reporte.distancia_elemento_m,
+        'Sí' if reporte.fuera_de_geocerca else 'No',
+        'Sí' if reporte.validado else 'No',
+        nombre_usuario(reporte.validado_por),
+    ]
+
+
+def consulta_exportacion(queryset):
+    return queryset.select_related(
+        'elemento__proyecto', 'cuadrilla', 'reportado_por', 'validado_por'
+    ).defer('miniaturas')
+
+
+def filas_reportes(queryset):
+    """Filas de los reportes del queryset"""
+    for reporte in consulta_exportacion(queryset).iterator(chunk_size=TAMANO_BLOQUE):
+        yield fila_reporte(reporte)
+
+
+def filas_seleccion(tarea_fondo):
+    """Filas de los reportes seleccionados al encolar, en el orden de la selección"""
+    queryset = consulta_exportacion(ReporteAvance.objects.all())
+    for _, bloque, reportes in bloques_seleccion(tarea_fondo, queryset, TAMANO_BLOQUE):
+        por_pk = {str(reporte.pk): reporte for reporte in reportes}
+        for pk in bloque:
+            if pk in por_pk:
+                yield fila_reporte(por_pk[pk])
+
+
+def csv_en_bloques(filas, tamano_bloque=TAMANO_BLOQUE):
+    """Bytes del CSV, un bloque cada ``tamano_bloque`` filas"""
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    # BOM para que Excel reconozca UTF-8 (acentos)
+    buffer.write('\ufeff')
+    escritor.writerow(COLUMNAS)
+    for numero, fila in enumerate(filas, 1):
+        escritor.writerow([
+            valor.isoformat(timespec='seconds') if isinstance(valor, time) else valor for valor in fila
+        ])
+        if numero % tamano_bloque == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+class _Salida:
+    """Destino sin seek para zipfile: acumula lo escrito hasta que se vacía"""
+
+    def __init__(self):
+        self.bloques = []
+
+    def write(self, datos):
+        self.bloques.append(bytes(datos))
+        return len(datos)
+
+    def flush(self):
+        pass
+
+    def vaciar(self):
+        datos = b''.join(self.bloques)
+        self.bloques.clear()
+        return datos
+
+
+def celda_xlsx(valor):
+    if valor is None or valor == '':
+        return '<c/>'
+    if isinstance(valor, bool):
+        return f'<c t="b"><v>{int(valor)}</v></c>'
+    if isinstance(valor, (int, float)):
+        return f'<c><v>{valor!r}</v></c>'
+    # Fechas y horas como número de serie de Excel, con su formato (estilos 1 y 2)
+    if isinstance(valor, datetime):
+        valor = valor.date()
+    if isinstance(valor, date):
+        return f'<c s="1"><v>{(valor - _EPOCA_EXCEL).days}</v></c>'
+    if isinstance(valor, time):
+        segundos = valor.hour * 3600 + valor.minute * 60 + valor.second
+        return f'<c s="2"><v>{segundos / 86400!r}</v></c>'
+    texto = escape(_INVALIDOS_XML.sub('', str(valor)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{texto}</t></is></c>'
+
+
+def fila_xlsx(valores):
+    return '<row>' + ''.join(celda_xlsx(valor) for valor in valores) + '</row>'
+
+
+_ARCHIVOS_XLSX = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Reportes" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/styles.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<numFmts count="2"><numFmt numFmtId="164" formatCode="dd/mm/yyyy"/>'
+        '<numFmt numFmtId="165" formatCode="hh:mm"/></numFmts>'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="4">'
+        '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+        '</cellXfs>'
+        '</styleSheet>'
+    ),
+}
+
+
+def xlsx_en_bloques(filas, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Bytes del XLSX a medida que se comprime la hoja. zipfile escribe sobre un
+    destino sin seek (descriptores de datos tras cada archivo), lo que permite
+    entregar cada bloque sin conocer el tamaño final.
+    """
+    salida = _Salida()
+    with zipfile.ZipFile(salida, 'w', zipfile.ZIP_DEFLATED) as libro:
+        for nombre, contenido in _ARCHIVOS_XLSX.items():
+            libro.writestr(nombre, contenido)
+        yield salida.vaciar()
+
+        with libro.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as hoja:
+            encabezado = ''.join(
+                f'<c t="inlineStr" s="3"><is><t>{escape(columna)}</t></is></c>' for columna in COLUMNAS
+            )
+            hoja.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                '<sheetViews><sheetView workbookViewId="0">'
+                '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+                '</sheetView></sheetViews>'
+                f'<sheetData><row>{encabezado}</row>'
+            ).encode())
+
+            bloque = []
+            for fila in filas:
+                bloque.append(fila_xlsx(fila))
+                if len(bloque) == tamano_bloque:
+                    hoja.write(''.join(bloque).encode())
+                    bloque.clear()
+                    yield salida.vaciar()
+            hoja.write((''.join(bloque) + '</sheetData></worksheet>').encode())
+    yield salida.vaciar()
+
+
+def exportar_en_bloques(queryset, formato):
+    generador = xlsx_en_bloques if formato == 'xlsx' else csv_en_bloques
+    return generador(filas_reportes(queryset))
+
+
+def directorio_exportaciones():
+    return getattr(settings, 'EXPORTACIONES_DIRECTORIO', os.path.join(settings.BASE_DIR, 'exportaciones'))
+
+
+def ruta_exportacion(tarea_fondo):
+    return os.path.join(directorio_exportaciones(), f'{tarea_fondo.pk}.{tarea_fondo.parametros["formato"]}')
+
+
+@tarea('exportar_reportes')
+def exportar_reportes(tarea_fondo, progreso=None):
+    """
+    Escribe la exportación en el directorio de exportaciones. Un archivo a
+    medias no sirve, así que al reanudar se vuelve a generar completo.
+    """
+    formato = tarea_fondo.parametros['formato']
+    if tarea_fondo.seleccion is None:
+        filas = filas_reportes(ReporteAvance.objects.order_by('pk'))
+        tarea_fondo.total = ReporteAvance.objects.count()
+    else:
+        filas = filas_seleccion(tarea_fondo)
+        tarea_fondo.total = len(tarea_fondo.seleccion)
+    tarea_fondo.procesados = 0
+    tarea_fondo.save(update_fields=['total', 'procesados', 'updated_at'])
+
+    def contar(filas):
+        for numero, fila in enumerate(filas, 1):
+            yield fila
+            if numero % TAMANO_BLOQUE == 0:
+                tarea_fondo.procesados = numero
+                tarea_fondo.save(update_fields=['procesados', 'updated_at'])
+                if progreso:
+                    progreso(numero)
+
+    generador = xlsx_en_bloques if formato == 'xlsx' else csv_en_bloques
+    ruta = ruta_exportacion(tarea_fondo)
+    os.makedirs(directorio_exportaciones(), exist_ok=True)
+    temporal = f'{ruta}.tmp'
+    try:
+        with open(temporal, 'wb') as archivo:
+            for bloque in generador(contar(filas)):
+                archivo.write(bloque)
+        os.replace(temporal, ruta)
+    finally:
+        # Una exportación fallida no deja el archivo a medias
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+    tarea_fondo.procesados = tarea_fondo.total
+    tarea_fondo.resultado['archivo'] = os.path.basename(ruta)
+    tarea_fondo.resultado['tamano'] = os.path.getsize(ruta)
+    tarea_fondo.save(update_fields=['procesados', 'resultado', 'updated_at'])
+    return tarea_fondo.total
+
+
+def limpiar_exportaciones(dias):
+    """
+    Borra los archivos del directorio de exportaciones con más de ``dias``
+    días y quita la descarga de sus tareas. Devuelve (archivos, bytes).
+    """
+    limite = (timezone.now() - timedelta(days=dias)).timestamp()
+    borrados, liberados = [], 0
+    try:
+        entradas = list(os.scandir(directorio_exportaciones()))
+    except FileNotFoundError:
+        return 0, 0
+    for entrada in entradas:
+        if not entrada.is_file():
+            continue
+        estado = entrada.stat()
+        if estado.st_mtime < limite:
+            os.remove(entrada.path)
+            borrados.append(entrada.name)
+            liberados += estado.st_size
+
+    for tarea_fondo in TareaFondo.objects.filter(tipo='exportar_reportes', resultado__archivo__in=borrados):
+        tarea_fondo.resultado.pop('archivo')
+        tarea_fondo.resultado['caducada'] = True
+        tarea_fondo.save(update_fields=['resultado', 'updated_at'])
+    return len(borrados), liberados
@@ -0,0 +1,70 @@
+import numpy as np
+from django.db import transaction
+
+from gestor.models import ReporteAvance
+from .task_service import tarea, procesar_por_lotes
+from .utm_service import convertir_lote
+
+# Distancia máxima (m) entre el reporte y el elemento, según el tipo de elemento.
+# Los elementos lineales o extensos admiten más separación de su punto central.
+TOLERANCIAS_GEOCERCA_M = {
+    'ZAPATA': 25,
+    'COLUMNA': 25,
+    'TRABE': 30,
+    'MURO': 50,
+    'LOSA': 50,
+    'CIMENTACION': 50,
+    'PAVIMENTO': 250,
+    'TERRACERIA': 500,
+    'DRENAJE': 300,
+}
+TOLERANCIA_GEOCERCA_DEFECTO_M = 100
+
+
+def tolerancias(tipos):
+    """Tolerancia de cada tipo de elemento, como arreglo"""
+    return np.array(
+        [TOLERANCIAS_GEOCERCA_M.get(tipo, TOLERANCIA_GEOCERCA_DEFECTO_M) for tipo in tipos],
+        dtype=np.float64,
+    )
+
+
+def evaluar_geocerca(pks):
+    """
+    Calcula la distancia reporte-elemento de un lote de reportes y marca los
+    que exceden la tolerancia de su tipo de elemento.
+    Ambos puntos se proyectan en la misma zona (la del proyecto o la del
+    elemento) con dos conversiones vectorizadas. Devuelve cuántos quedaron fuera.
+    """
+    filas = list(ReporteAvance.objects.filter(pk__in=pks).values_list(
+        'pk', 'latitud', 'longitud',
+        'elemento__latitud', 'elemento__longitud', 'elemento__tipo',
+        'elemento__proyecto__zona_utm', 'elemento__proyecto__hemisferio',
+    ))
+    if not filas:
+        return 0
+
+    ids, lat, lon, lat_elemento, lon_elemento, tipos, zonas, hemisferios = zip(*filas)
+
+    este_elemento, norte_elemento, zona, hemisferio = convertir_lote(lat_elemento, lon_elemento, zonas, hemisferios)
+    este, norte, _, _ = convertir_lote(lat, lon, zona, hemisferio)
+
+    distancias = np.hypot(este - este_elemento, norte - norte_elemento)
+    fuera = distancias > tolerancias(tipos)
+
+    reportes = [
+        ReporteAvance(pk=pk, distancia_elemento_m=round(distancia, 2), fuera_de_geocerca=excede)
+        for pk, distancia, excede in zip(ids, distancias.tolist(), fuera.tolist())
+    ]
+    with transaction.atomic():
+        ReporteAvance.objects.bulk_update(reportes, ['distancia_elemento_m', 'fuera_de_geocerca'])
+    return int(fuera.sum())
+
+
+@tarea('verificar_geocerca')
+def verificar_geocerca(tarea_fondo):
+    """Evalúa por lotes la geocerca de los reportes seleccionados (o de todos)"""
+    queryset = ReporteAvance.objects.all()
+    if tarea_fondo.parametros.get('solo_pendientes'):
+        queryset = queryset.filter(distancia_elemento_m__isnull=True)
+    return procesar_por_lotes(tarea_fondo, queryset, evaluar_geocerca)
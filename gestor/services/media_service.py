@@ -0,0 +1,154 @@
+"""
+Migración del árbol de media existente al almacenamiento deduplicado.
+
+Recorre los FileField de los modelos, calcula el SHA-256 de cada archivo
+referenciado y lo mueve a su ruta de contenido; las copias con el mismo
+contenido se borran. Los registros se actualizan con ``update`` (sin señales)
+y cada uno cuenta como una referencia del contenido.
+
+Las señales suman con ``referenciar_archivos`` la referencia de un nombre
+asignado sin pasar por el almacenamiento (``foto=otro.foto``) y las liberan
+con ``liberar_archivos`` al borrar o reemplazar un archivo, igual que la purga
+de proyectos.
+"""
+import hashlib
+import os
+import shutil
+
+from django.apps import apps
+from django.core.files.storage import default_storage, storages
+from django.db import models
+
+from gestor.models import ArchivoMedia, ReporteAvance
+from gestor.storage import DIRECTORIO, AlmacenamientoDeduplicado
+from .volumenes.artefactos import DIRECTORIO as DIRECTORIO_ARTEFACTOS
+
+
+def campos_archivo():
+    """(modelo, campo) de cada FileField/ImageField de gestor que usa el almacenamiento por defecto"""
+    return [
+        (modelo, campo.name)
+        for modelo in apps.get_app_config('gestor').get_models()
+        for campo in modelo._meta.get_fields()
+        if isinstance(campo, models.FileField) and campo.storage is default_storage
+    ]
+
+
+def campos_de(modelo):
+    return [campo for modelo_campo, campo in campos_archivo() if modelo_campo is modelo]
+
+
+def archivos_de(queryset):
+    """Nombres guardados en los campos de archivo (y miniaturas de reportes) de las filas"""
+    campos = campos_de(queryset.model)
+    nombres = []
+    if campos:
+        nombres += [nombre for fila in queryset.values_list(*campos) for nombre in fila if nombre]
+    if queryset.model is ReporteAvance:
+        for miniaturas in queryset.exclude(miniaturas={}).values_list('miniaturas', flat=True):
+            for variante in miniaturas.get('variantes', []):
+                nombres += [variante[extension] for extension in ('webp', 'jpg') if variante.get(extension)]
+    return nombres
+
+
+def _guardados_por_contenido(nombres):
+    storage = storages['default']
+    if not isinstance(storage, AlmacenamientoDeduplicado):
+        return storage, []
+    return storage, [nombre for nombre in nombres if nombre and nombre.startswith(f'{DIRECTORIO}/')]
+
+
+def referenciar_archivos(nombres):
+    """Suma una referencia a cada nombre guardado por contenido"""
+    storage, nombres = _guardados_por_contenido(nombres)
+    for nombre in nombres:
+        storage.referenciar(nombre)
+
+
+def liberar_archivos(nombres):
+    """
+    Resta una referencia a cada nombre guardado por contenido (el archivo se
+    borra con la última, junto con sus artefactos). Los nombres anteriores a
+    la deduplicación pueden estar compartidos sin cuenta de referencias y no
+    se tocan.
+    """
+    storage, nombres = _guardados_por_contenido(nombres)
+    for nombre in nombres:
+        storage.delete(nombre)
+        if not storage.exists(nombre):
+            # Era la última referencia: los artefactos del archivo ya no sirven
+            ruta = storage.path(nombre)
+            shutil.rmtree(
+                os.path.join(os.path.dirname(ruta), DIRECTORIO_ARTEFACTOS, os.path.basename(ruta)),
+                ignore_errors=True,
+            )
+
+
+def sha256_archivo(ruta):
+    with open(ruta, 'rb') as entrada:
+        return hashlib.file_digest(entrada, 'sha256').hexdigest()
+
+
+def deduplicar(simular=False, progreso=None):
+    """
+    Lleva los archivos referenciados a ``contenido/``. Con ``simular`` solo
+    calcula cuánto se ahorraría. Devuelve conteos y bytes ahorrados.
+    """
+    storage = storages['default']
+    if not simular and not isinstance(storage, AlmacenamientoDeduplicado):
+        raise ValueError('El almacenamiento por defecto no es AlmacenamientoDeduplicado')
+
+    resumen = {'archivos': 0, 'duplicados': 0, 'faltantes': 0, 'registros': 0, 'bytes_ahorrados': 0}
+    vistos = set()
+    movidos = {}  # nombre anterior -> (sha256, tamaño), por si otro campo usa el mismo archivo
+
+    for modelo, campo in campos_archivo():
+        nombres = (
+            modelo.objects.exclude(**{campo: ''}).exclude(**{f'{campo}__isnull': True})
+            .exclude(**{f'{campo}__startswith': f'{DIRECTORIO}/'})
+            .values_list(campo, flat=True).distinct().order_by()
+        )
+        for nombre in list(nombres):
+            registros = modelo.objects.filter(**{campo: nombre})
+            cantidad = registros.count()
+            ruta = storage.path(nombre)
+
+            if nombre in movidos:
+                sha256, tamano = movidos[nombre]
+            elif os.path.exists(ruta):
+                sha256 = sha256_archivo(ruta)
+                tamano = os.path.getsize(ruta)
+                resumen['archivos'] += 1
+                # Repetido entre la media existente o de algo ya guardado por contenido
+                if sha256 in vistos or ArchivoMedia.objects.filter(sha256=sha256).exists():
+                    resumen['duplicados'] += 1
+                    resumen['bytes_ahorrados'] += tamano
+                vistos.add(sha256)
+            else:
+                resumen['faltantes'] += 1
+                continue
+
+            resumen['registros'] += cantidad
+            if simular:
+                continue
+
+            ruta_contenido = storage.registrar(ruta, sha256, tamano, os.path.splitext(nombre)[1], cantidad)
+            movidos[nombre] = (sha256, tamano)
+            if os.path.exists(ruta):
+                # El contenido ya estaba guardado: esta copia sobra
+                os.remove(ruta)
+            # Los artefactos van por nombre de archivo; se regeneran con el nuevo
+            shutil.rmtree(
+                os.path.join(os.path.dirname(ruta), DIRECTORIO_ARTEFACTOS, os.path.basename(ruta)),
+                ignore_errors=True,
+            )
+
+            if modelo is ReporteAvance and campo == 'foto':
+                miniaturas = registros.filter(miniaturas__original=nombre).values_list('miniaturas', flat=True).first()
+                if miniaturas:
+                    registros.update(miniaturas={**miniaturas, 'original': ruta_contenido})
+            registros.update(**{campo: ruta_contenido})
+            if progreso:
+                progreso(modelo, nombre, ruta_contenido)
+
+    return resumen
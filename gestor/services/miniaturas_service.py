@@ -0,0 +1,203 @@
+"""
+Miniaturas de las fotos de los reportes de avance.
+
+Las fotos de celular pesan varios MB; el admin y el explorador muestran
+variantes reducidas en WebP (con JPEG para navegadores sin WebP) que se
+generan con Pillow en segundo plano. Las rutas y dimensiones quedan en
+``ReporteAvance.miniaturas`` para elegir la variante sin tocar el almacenamiento.
+"""
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.db import connection, connections
+from PIL import Image, ImageOps
+
+from gestor import workers
+from gestor.models import ReporteAvance
+from gestor.storage import DIRECTORIO as DIRECTORIO_CONTENIDO
+from .task_service import tarea
+
+# Lado mayor de cada variante, en píxeles
+TAMANOS = (160, 480, 1280)
+CALIDAD_WEBP = 80
+CALIDAD_JPEG = 82
+DIRECTORIO = 'miniaturas'
+
+
+def generar_miniaturas(nombre, storage=None):
+    """
+    Genera las variantes de la foto ``nombre`` y devuelve el diccionario que se
+    guarda en ``ReporteAvance.miniaturas``. Si la imagen no se puede leer queda
+    registrado el error para no reintentarla en cada pasada.
+    """
+    storage = storage or ReporteAvance._meta.get_field('foto').storage
+    try:
+        with storage.open(nombre, 'rb') as entrada:
+            imagen = Image.open(entrada)
+            # En JPEG decodifica ya reducido (escalado DCT): mucho menos memoria y tiempo
+            imagen.draft('RGB', (TAMANOS[-1], TAMANOS[-1]))
+            imagen = ImageOps.exif_transpose(imagen).convert('RGB')
+    except (OSError, ValueError, Image.DecompressionBombError) as error:
+        return {'original': nombre, 'error': str(error), 'variantes': []}
+
+    carpeta, archivo = os.path.split(nombre)
+    raiz = os.path.splitext(archivo)[0]
+    lado = max(imagen.size)
+    # Nunca se amplía; una foto menor que la variante más chica se guarda a su tamaño
+    tamanos = [tamano for tamano in TAMANOS if tamano < lado] or [lado]
+
+    variantes = []
+    for tamano in reversed(tamanos):
+        # Cada variante parte de la anterior, ya reducida
+        imagen.thumbnail((tamano, tamano), Image.Resampling.LANCZOS)
+        variante = {'ancho': imagen.width, 'alto': imagen.height}
+        for formato, extension, opciones in (
+            ('WEBP', 'webp', {'quality': CALIDAD_WEBP, 'method': 4}),
+            ('JPEG', 'jpg', {'quality': CALIDAD_JPEG, 'optimize': True, 'progressive': True}),
+        ):
+            salida = io.BytesIO()
+            imagen.save(salida, formato, **opciones)
+            ruta = os.path.join(carpeta, DIRECTORIO, f'{raiz}_{tamano}.{extension}')
+            # El almacenamiento decide el nombre final (ruta de contenido)
+            variante[extension] = storage.save(ruta, ContentFile(salida.getvalue()))
+        variantes.append(variante)
+
+    return {'original': nombre, 'variantes': sorted(variantes, key=lambda v: v['ancho'])}
+
+
+def borrar_miniaturas(miniaturas, excluir=None, storage=None):
+    """
+    Libera los archivos de las variantes (la foto original no se toca). Cada
+    reporte tiene su propia referencia a las variantes guardadas por
+    contenido; las anteriores a ese almacenamiento pueden estar compartidas
+    y solo se borran si ningún otro reporte, salvo ``excluir``, usa la foto.
+    """
+    original = miniaturas.get('original')
+    if not original:
+        return
+    storage = storage or ReporteAvance._meta.get_field('foto').storage
+    compartidas = ReporteAvance.objects.filter(foto=original).exclude(pk=excluir).exists()
+    for variante in miniaturas.get('variantes', []):
+        for extension in ('webp', 'jpg'):
+            nombre = variante.get(extension)
+            if nombre and (nombre.startswith(f'{DIRECTORIO_CONTENIDO}/') or not compartidas):
+                storage.delete(nombre)
+
+
+def copiar_miniaturas(miniaturas, storage=None):
+    """
+    Las variantes de ``miniaturas`` para otro reporte de la misma foto, sin
+    volver a generarlas: cada archivo se guarda de nuevo para que el reporte
+    tenga su propia referencia (en el almacenamiento por contenido no ocupa
+    espacio).
+    """
+    storage = storage or ReporteAvance._meta.get_field('foto').storage
+    variantes = []
+    for variante in miniaturas.get('variantes', []):
+        copia = dict(variante)
+        for extension in ('webp', 'jpg'):
+            if variante.get(extension):
+                with storage.open(variante[extension], 'rb') as archivo:
+                    copia[extension] = storage.save(variante[extension], File(archivo))
+        variantes.append(copia)
+    return {**miniaturas, 'variantes': variantes}
+
+
+def miniatura_de(reporte, ancho):
+    """
+    URLs de la variante más chica cuyo lado mayor cubre ``ancho`` (o la más
+    grande disponible): {'webp', 'jpg', 'ancho', 'alto'}. None si aún no hay
+    variantes de la foto actual.
+    """
+    miniaturas = reporte.miniaturas or {}
+    variantes = miniaturas.get('variantes')
+    if not reporte.foto or not variantes or miniaturas.get('original') != reporte.foto.name:
+        return None
+
+    elegida = next((v for v in variantes if max(v['ancho'], v['alto']) >= ancho), variantes[-1])
+    storage = reporte.foto.storage
+    return {
+        'webp': storage.url(elegida['webp']),
+        'jpg': storage.url(elegida['jpg']),
+        'ancho': elegida['ancho'],
+        'alto': elegida['alto'],
+    }
+
+
+def consulta_pendientes(todos=False):
+    """(pk, foto, miniaturas) de los reportes con foto que aún no tienen variantes, ordenados por pk"""
+    queryset = ReporteAvance.objects.exclude(foto='').exclude(foto__isnull=True)
+    if not todos:
+        queryset = queryset.filter(miniaturas={})
+    return queryset.order_by('pk').values_list('pk', 'foto', 'miniaturas')
+
+
+@tarea('generar_miniaturas')
+def generar_miniaturas_reportes(tarea_fondo, procesos=None, progreso=None):
+    """
+    Genera las miniaturas de los reportes indicados en ``pks`` o de todos los
+    pendientes. Con ``procesos`` > 0 las fotos se reparten en un
+    ProcessPoolExecutor; los hijos escriben las variantes (el almacenamiento
+    por contenido registra sus referencias en ``ArchivoMedia``) y este proceso
+    guarda los resultados en orden, avanzando el checkpoint (último pk).
+    """
+    parametros = tarea_fondo.parametros
+    if procesos is None:
+        procesos = parametros.get('procesos', 0)
+
+    filas = consulta_pendientes(parametros.get('todos', False))
+    if parametros.get('pks'):
+        filas = filas.filter(pk__in=parametros['pks'])
+    if tarea_fondo.checkpoint:
+        filas = filas.filter(pk__gt=tarea_fondo.checkpoint)
+    if not tarea_fondo.total:
+        tarea_fondo.total = filas.count()
+        tarea_fondo.save(update_fields=['total', 'updated_at'])
+
+    def confirmar(pk, nombre, anteriores, miniaturas):
+        # Solo si la foto sigue siendo la misma que se procesó; si no, las variantes sobran
+        if not ReporteAvance.objects.filter(pk=pk, foto=nombre).update(miniaturas=miniaturas):
+            borrar_miniaturas(miniaturas, excluir=pk)
+        else:
+            # Las variantes anteriores se liberan hasta que las nuevas quedaron guardadas
+            borrar_miniaturas(anteriores, excluir=pk)
+        tarea_fondo.procesados += 1
+        tarea_fondo.checkpoint = str(pk)
+        if miniaturas.get('error'):
+            tarea_fondo.resultado['errores'] = tarea_fondo.resultado.get('errores', 0) + 1
+        tarea_fondo.save(update_fields=['procesados', 'checkpoint', 'resultado', 'updated_at'])
+        if progreso:
+            progreso(pk, miniaturas)
+
+    executor = None
+    # Guardar cada variante escribe en ArchivoMedia; SQLite bloquea la base
+    # completa y los hijos no podrían escribir mientras este proceso lee
+    if procesos and connection.vendor != 'sqlite':
+        # Los hijos abren sus propias conexiones
+        connections.close_all()
+        executor = ProcessPoolExecutor(max_workers=procesos, initializer=workers.inicializar)
+
+    try:
+        en_vuelo = deque()
+        for pk, nombre, anteriores in filas.iterator(chunk_size=500):
+            if executor is None:
+                confirmar(pk, nombre, anteriores, generar_miniaturas(nombre))
+                continue
+
+            en_vuelo.append((pk, nombre, anteriores, executor.submit(workers.generar_miniaturas, nombre)))
+            while en_vuelo and (en_vuelo[0][3].done() or len(en_vuelo) > procesos * 2):
+                pk, nombre, anteriores, futuro = en_vuelo.popleft()
+                confirmar(pk, nombre, anteriores, futuro.result())
+
+        while en_vuelo:
+            pk, nombre, anteriores, futuro = en_vuelo.popleft()
+            confirmar(pk, nombre, anteriores, futuro.result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    return tarea_fondo.procesados
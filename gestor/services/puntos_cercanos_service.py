@@ -0,0 +1,140 @@
+"""
+Índice espacial de los puntos de control validados de cada proyecto.
+
+Se construye un cKDTree en coordenadas UTM de la zona del proyecto y se
+guarda en memoria del proceso. Cada consulta compara una firma barata
+(número de puntos y última modificación) para detectar escrituras hechas
+por otros procesos; en este proceso las señales de PuntoControl lo
+descartan de inmediato.
+"""
+import numpy as np
+from django.db.models import Count, Max
+from scipy.spatial import cKDTree
+
+from gestor.models import PuntoControl
+from .transformacion_service import transformacion_de_proyecto
+
+# Caché por proceso: proyecto_id -> IndicePuntosControl
+_CACHE = {}
+
+
+class IndicePuntosControl:
+    """KD-tree sobre (este, norte) de los puntos de control de un proyecto"""
+
+    def __init__(self, transformacion, firma, puntos):
+        self.transformacion = transformacion
+        self.firma = firma
+
+        if puntos:
+            ids, numeros, tipos, latitudes, longitudes, elevaciones = zip(*puntos)
+        else:
+            ids, numeros, tipos, latitudes, longitudes, elevaciones = (), (), (), (), (), ()
+        self.ids = [str(pk) for pk in ids]
+        self.numeros = list(numeros)
+        self.tipos = list(tipos)
+        self.elevaciones = np.array(elevaciones, dtype=np.float64)
+
+        este, norte = self.transformacion.wgs84_a_utm(latitudes, longitudes)
+        self.coordenadas = np.column_stack([este, norte]) if puntos else np.empty((0, 2))
+        self.arbol = cKDTree(self.coordenadas) if puntos else None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _punto(self, indice, distancia):
+        este, norte = self.coordenadas[indice]
+        return {
+            'id': self.ids[indice],
+            'numero_punto': self.numeros[indice],
+            'tipo': self.tipos[indice],
+            'utm_este': round(float(este), 3),
+            'utm_norte': round(float(norte), 3),
+            'elevacion': float(self.elevaciones[indice]),
+            'distancia_m': round(float(distancia), 3),
+        }
+
+    def k_cercanos(self, este, norte, k=1, radio=None):
+        """
+        Los ``k`` puntos más cercanos a cada consulta (escalares o arreglos),
+        opcionalmente limitados a ``radio`` metros. Devuelve una lista por consulta.
+        """
+        este = np.atleast_1d(np.asarray(este, dtype=np.float64))
+        norte = np.atleast_1d(np.asarray(norte, dtype=np.float64))
+        if self.arbol is None:
+            return [[] for _ in este]
+
+        k = min(k, len(self))
+        distancias, indices = self.arbol.query(
+            np.column_stack([este, norte]),
+            k=k,
+            distance_upper_bound=np.inf if radio is None else radio,
+        )
+        distancias = distancias.reshape(len(este), k)
+        indices = indices.reshape(len(este), k)
+
+        # Los vecinos fuera del radio vienen con distancia inf e índice len(self)
+        return [
+            [self._punto(i, d) for d, i in zip(fila_d, fila_i) if np.isfinite(d)]
+            for fila_d, fila_i in zip(distancias, indices)
+        ]
+
+    def en_radio(self, este, norte, radio):
+        """Todos los puntos a ``radio`` metros o menos, ordenados por distancia"""
+        if self.arbol is None:
+            return []
+        consulta = np.array([este, norte], dtype=np.float64)
+        indices = self.arbol.query_ball_point(consulta, r=radio)
+        distancias = np.hypot(*(self.coordenadas[indices] - consulta).T) if indices else []
+        return sorted(
+            (self._punto(i, d) for i, d in zip(indices, distancias)),
+            key=lambda punto: punto['distancia_m'],
+        )
+
+
+def _puntos_validados(proyecto_id):
+    return PuntoControl.objects.filter(proyecto_id=proyecto_id, validado=True)
+
+
+def indice_de_proyecto(proyecto_id):
+    """Índice del proyecto, reconstruido solo si sus puntos validados cambiaron"""
+    proyecto_id = str(proyecto_id)
+    firma = tuple(_puntos_validados(proyecto_id).aggregate(
+        total=Count('pk'),
+        ultimo=Max('updated_at'),
+    ).values())
+
+    transformacion = transformacion_de_proyecto(proyecto_id)
+
+    indice = _CACHE.get(proyecto_id)
+    if indice is None or indice.firma != firma or indice.transformacion is not transformacion:
+        puntos = list(_puntos_validados(proyecto_id).order_by('pk').values_list(
+            'pk', 'numero_punto', 'tipo', 'latitud', 'longitud', 'elevacion'
+        ))
+        indice = IndicePuntosControl(transformacion, firma, puntos)
+        _CACHE[proyecto_id] = indice
+    return indice
+
+
+def invalidar_indice(proyecto_id):
+    _CACHE.pop(str(proyecto_id), None)
+
+
+def puntos_cercanos(proyecto_id, latitud, longitud, k=5, radio=None):
+    """
+    Puntos de control validados más cercanos a una posición WGS84.
+    Con ``radio`` y sin ``k`` devuelve todos los puntos dentro del radio.
+    """
+    indice = indice_de_proyecto(proyecto_id)
+    este, norte = indice.transformacion.wgs84_a_utm(latitud, longitud)
+    if k is None:
+        return indice.en_radio(float(este), float(norte), radio)
+    return indice.k_cercanos(este, norte, k, radio)[0]
+
+
+def puntos_cercanos_a(objeto, k=5, radio=None):
+    """Puntos cercanos a un elemento o reporte, en el proyecto al que pertenece"""
+    if objeto.ruta_proyecto == 'proyecto':
+        proyecto_id = objeto.proyecto_id
+    else:
+        proyecto_id = objeto.elemento.proyecto_id
+    return puntos_cercanos(proyecto_id, objeto.latitud, objeto.longitud, k, radio)
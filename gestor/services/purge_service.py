@@ -0,0 +1,124 @@
+from django.db import transaction
+from django.db.models import Q
+
+from gestor.models import (
+    Proyecto,
+    ElementoConstructivo,
+    PuntoControl,
+    Cuadrilla,
+    ReporteAvance,
+    VolumenTerraceria,
+    HistorialAvance,
+    AvanceProyectoDiario,
+    ObservacionTopografica,
+)
+from .media_service import archivos_de, liberar_archivos
+from .task_service import tarea
+
+
+def pasos_purga(proyecto_id):
+    """
+    Consultas a procesar, de las hojas a la raíz, para eliminar un proyecto.
+    Cada paso es (nombre, queryset, accion): 'borrar' elimina las filas y
+    'desvincular' pone en NULL referencias SET_NULL (desde otros proyectos o
+    entre filas que se borran en lotes distintos).
+    """
+    return [
+        ('reportes', ReporteAvance.objects.filter(elemento__proyecto_id=proyecto_id), 'borrar'),
+        ('observaciones', ObservacionTopografica.objects.filter(proyecto_id=proyecto_id), 'borrar'),
+        ('puntos_control', PuntoControl.objects.filter(
+            Q(proyecto_id=proyecto_id) | Q(elemento__proyecto_id=proyecto_id)
+        ), 'borrar'),
+        # Un levantamiento base y los volúmenes que lo usan pueden caer en lotes distintos
+        ('volumenes_base', VolumenTerraceria.objects.filter(
+            Q(proyecto_id=proyecto_id) | Q(levantamiento_base__proyecto_id=proyecto_id),
+            levantamiento_base__isnull=False,
+        ), 'desvincular'),
+        ('volumenes', VolumenTerraceria.objects.filter(proyecto_id=proyecto_id), 'borrar'),
+        ('reportes_otras_cuadrillas', ReporteAvance.objects.filter(
+            cuadrilla__proyecto_id=proyecto_id
+        ).exclude(elemento__proyecto_id=proyecto_id), 'desvincular'),
+        ('cuadrillas', Cuadrilla.objects.filter(proyecto_id=proyecto_id), 'borrar'),
+        ('cuadrillas_otros_elementos', Cuadrilla.objects.filter(
+            elemento_actual__proyecto_id=proyecto_id
+        ).exclude(proyecto_id=proyecto_id), 'desvincular'),
+        ('historial_avance', HistorialAvance.objects.filter(
+            Q(proyecto_id=proyecto_id) | Q(elemento__proyecto_id=proyecto_id)
+        ), 'borrar'),
+        ('avance_diario', AvanceProyectoDiario.objects.filter(proyecto_id=proyecto_id), 'borrar'),
+        ('elementos', ElementoConstructivo.objects.filter(proyecto_id=proyecto_id), 'borrar'),
+        ('proyecto', Proyecto.objects.filter(pk=proyecto_id), 'borrar'),
+        ('historial', Proyecto.history.filter(id=proyecto_id), 'borrar'),
+    ]
+
+
+_CAMPOS_DESVINCULAR = {
+    ReporteAvance: 'cuadrilla',
+    Cuadrilla: 'elemento_actual',
+    VolumenTerraceria: 'levantamiento_base',
+}
+
+
+def contar_purga(proyecto_id):
+    """Número de filas que tocará la purga, por paso"""
+    return {nombre: queryset.count() for nombre, queryset, _ in pasos_purga(proyecto_id)}
+
+
+def purgar_proyecto(proyecto_id, tamano_lote=1000, progreso=None):
+    """
+    Elimina un proyecto y todo lo que cuelga de él sin pasar por el Collector de Django.
+
+    Cada paso toma como máximo ``tamano_lote`` llaves primarias y las borra con
+    un DELETE directo en su propia transacción, así la memoria no depende del
+    tamaño del proyecto. Volver a ejecutarla continúa donde se quedó porque
+    las filas ya borradas no vuelven a aparecer en las consultas.
+    ``progreso(paso, filas)`` se llama tras cada lote confirmado.
+    """
+    totales = {}
+
+    for nombre, queryset, accion in pasos_purga(proyecto_id):
+        modelo = queryset.model
+        totales[nombre] = 0
+
+        while True:
+            pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:tamano_lote])
+            if not pks:
+                break
+
+            lote = modelo._base_manager.filter(pk__in=pks)
+            archivos = []
+            with transaction.atomic():
+                if accion == 'desvincular':
+                    filas = lote.update(**{_CAMPOS_DESVINCULAR[modelo]: None})
+                else:
+                    archivos = archivos_de(lote)
+                    filas = lote._raw_delete(lote.db)
+            # Sin señales: las referencias de fotos, levantamientos y miniaturas se liberan aquí
+            liberar_archivos(archivos)
+
+            totales[nombre] += filas
+            if progreso:
+                progreso(nombre, filas)
+
+            if len(pks) < tamano_lote:
+                break
+
+    return totales
+
+
+@tarea('purgar_proyecto')
+def purgar_proyecto_tarea(tarea_fondo):
+    proyecto_id = tarea_fondo.parametros['proyecto_id']
+    tamano_lote = tarea_fondo.parametros.get('tamano_lote', 1000)
+
+    if not tarea_fondo.total:
+        tarea_fondo.total = sum(contar_purga(proyecto_id).values())
+        tarea_fondo.save(update_fields=['total', 'updated_at'])
+
+    def progreso(paso, filas):
+        tarea_fondo.procesados += filas
+        tarea_fondo.checkpoint = paso
+        tarea_fondo.resultado[paso] = tarea_fondo.resultado.get(paso, 0) + filas
+        tarea_fondo.save(update_fields=['procesados', 'checkpoint', 'resultado', 'updated_at'])
+
+    purgar_proyecto(proyecto_id, tamano_lote, progreso)
@@ -0,0 +1,173 @@
+import traceback
+
+from django.db import transaction
+from django.utils import timezone
+
+from gestor.models import TareaFondo
+
+# Registro tipo -> función que ejecuta la tarea
+_MANEJADORES = {}
+
+
+def tarea(tipo):
+    """Registra una función como manejador de las tareas de ``tipo``"""
+    def decorador(funcion):
+        _MANEJADORES[tipo] = funcion
+        return funcion
+    return decorador
+
+
+def encolar(tipo, descripcion='', usuario=None, queryset=None, **parametros):
+    """
+    Crea una tarea pendiente para el worker.
+    Si se pasa un queryset se guardan sus llaves primarias, en su orden, como
+    JSON (``seleccion``): solo se leen las llaves, no los registros, y la
+    selección no depende de detalles internos de Django que cambien al
+    actualizarlo.
+    """
+    if tipo not in _MANEJADORES:
+        raise ValueError(f'Tipo de tarea desconocido: {tipo}')
+
+    seleccion = None
+    if queryset is not None:
+        seleccion = [str(pk) for pk in queryset.values_list('pk', flat=True).iterator(chunk_size=5000)]
+
+    return TareaFondo.objects.create(
+        tipo=tipo,
+        descripcion=descripcion,
+        parametros=parametros,
+        seleccion=seleccion,
+        creada_por=usuario if usuario and usuario.is_authenticated else None,
+    )
+
+
+def bloques_seleccion(tarea_fondo, queryset, tamano_lote, inicio=0):
+    """
+    Recorre la selección guardada al encolar desde la posición ``inicio``:
+    (posición final, llaves del bloque, ``queryset`` limitado al bloque).
+    """
+    seleccion = tarea_fondo.seleccion or []
+    for posicion in range(inicio, len(seleccion), tamano_lote):
+        bloque = seleccion[posicion:posicion + tamano_lote]
+        yield posicion + len(bloque), bloque, queryset.filter(pk__in=bloque)
+
+
+def reclamar_siguiente():
+    """Toma la tarea pendiente más antigua sin bloquear a otros workers"""
+    with transaction.atomic():
+        tarea_fondo = (
+            TareaFondo.objects
+            .select_for_update(skip_locked=True)
+            .filter(estado='PENDIENTE')
+            .order_by('created_at')
+            .first()
+        )
+        if tarea_fondo is None:
+            return None
+
+        tarea_fondo.estado = 'EJECUCION'
+        tarea_fondo.error = ''
+        tarea_fondo.finalizada_en = None
+        if not tarea_fondo.iniciada_en:
+            tarea_fondo.iniciada_en = timezone.now()
+        tarea_fondo.save(update_fields=['estado', 'error', 'iniciada_en', 'finalizada_en', 'updated_at'])
+        return tarea_fondo
+
+
+def ejecutar(tarea_fondo, **opciones):
+    """
+    Ejecuta el manejador de la tarea y registra el resultado o el error.
+    ``opciones`` se pasan al manejador (p. ej. un callback de progreso).
+    """
+    manejador = _MANEJADORES.get(tarea_fondo.tipo)
+
+    try:
+        if manejador is None:
+            raise ValueError(f'Tipo de tarea desconocido: {tarea_fondo.tipo}')
+        manejador(tarea_fondo, **opciones)
+    except Exception:
+        tarea_fondo.estado = 'FALLIDA'
+        tarea_fondo.error = traceback.format_exc()
+    else:
+        tarea_fondo.estado = 'COMPLETADA'
+
+    tarea_fondo.finalizada_en = timezone.now()
+    tarea_fondo.save(update_fields=['estado', 'error', 'finalizada_en', 'updated_at'])
+    return tarea_fondo
+
+
+def reanudar(queryset):
+    """Devuelve a la cola tareas fallidas o abandonadas; continúan desde su checkpoint"""
+    return queryset.filter(estado__in=['EJECUCION', 'FALLIDA']).update(
+        estado='PENDIENTE',
+        updated_at=timezone.now()
+    )
+
+
+# Lotes recientes que se conservan en el resultado; de los anteriores solo quedan los totales
+MAXIMO_LOTES = 20
+
+
+def registrar_lote(resultado, procesados, afectados):
+    """Suma un lote a los totales del resultado y lo agrega a los recientes"""
+    numero = resultado.get('numero_lotes', len(resultado.get('lotes', []))) + 1
+    resultado['numero_lotes'] = numero
+    resultado['afectados'] = resultado.get('afectados', 0) + afectados
+    resultado['lotes'] = resultado.get('lotes', [])[-(MAXIMO_LOTES - 1):] + [{
+        'lote': numero,
+        'procesados': procesados,
+        'afectados': afectados,
+    }]
+
+
+def _bloques_consulta(queryset, checkpoint, tamano_lote):
+    """Bloques de llaves ordenadas del queryset después de ``checkpoint``"""
+    while True:
+        pendientes = queryset.filter(pk__gt=checkpoint) if checkpoint else queryset
+        pks = list(pendientes.values_list('pk', flat=True)[:tamano_lote])
+        if not pks:
+            return
+        checkpoint = str(pks[-1])
+        yield len(pks), checkpoint, pks
+
+
+def procesar_por_lotes(tarea_fondo, queryset, funcion, tamano_lote=None):
+    """
+    Recorre por bloques las filas de la tarea: la selección guardada al
+    encolar (limitada por los filtros de ``queryset``) o, si no hay, todo el
+    queryset por llaves primarias ordenadas.
+
+    Cada bloque se procesa con ``funcion(pks)`` en su propia transacción corta,
+    junto con el avance y el checkpoint de la tarea (último pk o posición en
+    la selección), de modo que si el worker se detiene la tarea se reanuda en
+    el primer bloque no confirmado.
+    ``funcion`` devuelve el número de filas afectadas del bloque.
+    """
+    tamano_lote = tamano_lote or tarea_fondo.parametros.get('tamano_lote', 1000)
+    queryset = queryset.order_by('pk')
+
+    if tarea_fondo.seleccion is not None:
+        if not tarea_fondo.total:
+            tarea_fondo.total = len(tarea_fondo.seleccion)
+        bloques = (
+            (len(bloque), str(fin), list(filas.values_list('pk', flat=True)))
+            for fin, bloque, filas in bloques_seleccion(
+                tarea_fondo, queryset, tamano_lote, int(tarea_fondo.checkpoint or 0)
+            )
+        )
+    else:
+        if not tarea_fondo.total:
+            tarea_fondo.total = queryset.count()
+        bloques = _bloques_consulta(queryset, tarea_fondo.checkpoint, tamano_lote)
+    tarea_fondo.save(update_fields=['total', 'updated_at'])
+
+    for procesados, checkpoint, pks in bloques:
+        with transaction.atomic():
+            afectados = funcion(pks) if pks else 0
+
+            tarea_fondo.procesados += procesados
+            tarea_fondo.checkpoint = checkpoint
+            registrar_lote(tarea_fondo.resultado, procesados, afectados)
+            tarea_fondo.save(update_fields=['procesados', 'checkpoint', 'resultado', 'updated_at'])
+
+    return tarea_fondo.resultado.get('afectados', 0)
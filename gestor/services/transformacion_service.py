@@ -0,0 +1,164 @@
+"""
+Transformaciones de coordenadas por proyecto: WGS84 <-> UTM <-> LOCAL.
+
+El sistema LOCAL es una cuadrícula de obra con origen (0, 0, 0) en el punto
+de referencia del proyecto, ejes este/norte de la zona UTM del proyecto y
+distancias a nivel de terreno: se quita el factor de escala UTM y el de
+elevación calculados en el origen, de modo que medir con cinta o estación
+total coincide con la cuadrícula.
+"""
+import numpy as np
+
+from gestor.models import Proyecto
+from .utm_service import A_ELIPSOIDE, F_ELIPSOIDE, utm_a_wgs84, wgs84_a_utm, zona_utm
+
+_E2 = F_ELIPSOIDE * (2 - F_ELIPSOIDE)
+
+# Caché por proceso: proyecto_id -> TransformacionProyecto
+_CACHE = {}
+
+
+class TransformacionProyecto:
+    """Parámetros precalculados de un proyecto; todas las conversiones son vectorizadas"""
+
+    def __init__(self, lat_referencia, lon_referencia, elevacion_referencia=0, zona=None, hemisferio=None,
+                 sistema='UTM'):
+        self.sistema = sistema
+        self.zona = int(zona or zona_utm(lat_referencia, lon_referencia))
+        self.hemisferio = hemisferio or ('N' if lat_referencia >= 0 else 'S')
+        self.elevacion_origen = float(elevacion_referencia or 0)
+
+        este, norte, _, _ = wgs84_a_utm(lat_referencia, lon_referencia, self.zona, self.hemisferio)
+        self.este_origen = float(este)
+        self.norte_origen = float(norte)
+
+        # Factor de escala puntual en el origen (cuadrícula / elipsoide), por diferencias
+        phi = np.radians(lat_referencia)
+        radio_normal = A_ELIPSOIDE / np.sqrt(1 - _E2 * np.sin(phi) ** 2)
+        radio_meridiano = radio_normal * (1 - _E2) / (1 - _E2 * np.sin(phi) ** 2)
+        paso = 1e-4
+        este_paso, norte_paso, _, _ = wgs84_a_utm(lat_referencia, lon_referencia + paso, self.zona, self.hemisferio)
+        distancia_cuadricula = np.hypot(este_paso - este, norte_paso - norte)
+        distancia_elipsoide = radio_normal * np.cos(phi) * np.radians(paso)
+        self.factor_escala = float(distancia_cuadricula / distancia_elipsoide)
+
+        # Factor de elevación con el radio medio gaussiano
+        radio_medio = np.sqrt(radio_normal * radio_meridiano)
+        self.factor_elevacion = float(radio_medio / (radio_medio + self.elevacion_origen))
+        self.factor_combinado = self.factor_escala * self.factor_elevacion
+
+    @classmethod
+    def de_proyecto(cls, proyecto):
+        return cls(
+            proyecto.lat_referencia,
+            proyecto.lon_referencia,
+            proyecto.elevacion_referencia,
+            proyecto.zona_utm,
+            proyecto.hemisferio,
+            proyecto.sistema_coordenadas,
+        )
+
+    # WGS84 <-> UTM en la zona del proyecto
+
+    def wgs84_a_utm(self, latitud, longitud):
+        este, norte, _, _ = wgs84_a_utm(latitud, longitud, self.zona, self.hemisferio)
+        return este, norte
+
+    def utm_a_wgs84(self, este, norte):
+        return utm_a_wgs84(este, norte, self.zona, self.hemisferio)
+
+    # UTM <-> LOCAL
+
+    def utm_a_local(self, este, norte, elevacion=None):
+        x = (np.asarray(este, dtype=np.float64) - self.este_origen) / self.factor_combinado
+        y = (np.asarray(norte, dtype=np.float64) - self.norte_origen) / self.factor_combinado
+        if elevacion is None:
+            return x, y
+        return x, y, np.asarray(elevacion, dtype=np.float64) - self.elevacion_origen
+
+    def local_a_utm(self, x, y, z=None):
+        este = np.asarray(x, dtype=np.float64) * self.factor_combinado + self.este_origen
+        norte = np.asarray(y, dtype=np.float64) * self.factor_combinado + self.norte_origen
+        if z is None:
+            return este, norte
+        return este, norte, np.asarray(z, dtype=np.float64) + self.elevacion_origen
+
+    # WGS84 <-> LOCAL
+
+    def wgs84_a_local(self, latitud, longitud, elevacion=None):
+        return self.utm_a_local(*self.wgs84_a_utm(latitud, longitud), elevacion)
+
+    def local_a_wgs84(self, x, y):
+        return self.utm_a_wgs84(*self.local_a_utm(x, y))
+
+    def a_sistema(self, latitud, longitud, elevacion=None, sistema=None):
+        """
+        Convierte latitud/longitud al sistema indicado (por defecto el del
+        proyecto). Devuelve (x, y) o (x, y, z): lon/lat, este/norte o x/y locales.
+        """
+        sistema = sistema or self.sistema
+        if sistema == 'WGS84':
+            resultado = (np.asarray(longitud, dtype=np.float64), np.asarray(latitud, dtype=np.float64))
+            if elevacion is None:
+                return resultado
+            return (*resultado, np.asarray(elevacion, dtype=np.float64))
+        if sistema == 'UTM':
+            resultado = self.wgs84_a_utm(latitud, longitud)
+            if elevacion is None:
+                return resultado
+            return (*resultado, np.asarray(elevacion, dtype=np.float64))
+        if sistema == 'LOCAL':
+            return self.wgs84_a_local(latitud, longitud, elevacion)
+        raise ValueError(f'Sistema de coordenadas desconocido: {sistema}')
+
+
+def _firma(proyecto):
+    return (
+        proyecto.lat_referencia, proyecto.lon_referencia, proyecto.elevacion_referencia,
+        proyecto.zona_utm, proyecto.hemisferio, proyecto.sistema_coordenadas,
+    )
+
+
+def transformacion_de_proyecto(proyecto):
+    """
+    Transformación del proyecto, construida una vez por proceso.
+    Acepta la instancia o su id; se reconstruye si cambian la referencia,
+    la zona o el sistema del proyecto.
+    """
+    if not isinstance(proyecto, Proyecto):
+        proyecto = Proyecto.objects.only(
+            'lat_referencia', 'lon_referencia', 'elevacion_referencia',
+            'zona_utm', 'hemisferio', 'sistema_coordenadas',
+        ).get(pk=proyecto)
+
+    firma = _firma(proyecto)
+    guardada = _CACHE.get(proyecto.pk)
+    if guardada is None or guardada[0] != firma:
+        guardada = (firma, TransformacionProyecto.de_proyecto(proyecto))
+        _CACHE[proyecto.pk] = guardada
+    return guardada[1]
+
+
+def coordenadas_proyecto(proyecto, queryset, sistema=None):
+    """
+    Coordenadas de un queryset de elementos o puntos de control en el
+    sistema indicado, convertidas en bloque.
+    Devuelve {'ids', 'sistema', 'x', 'y', 'z'}.
+    """
+    transformacion = transformacion_de_proyecto(proyecto)
+    sistema = sistema or transformacion.sistema
+    decimales = 9 if sistema == 'WGS84' else 4
+    filas = list(queryset.values_list('pk', 'latitud', 'longitud', 'elevacion'))
+    if not filas:
+        return {'ids': [], 'sistema': sistema, 'x': [], 'y': [], 'z': []}
+
+    ids, latitudes, longitudes, elevaciones = zip(*filas)
+    elevaciones = np.array([np.nan if e is None else e for e in elevaciones], dtype=np.float64)
+    x, y, z = transformacion.a_sistema(latitudes, longitudes, elevaciones, sistema)
+    return {
+        'ids': [str(pk) for pk in ids],
+        'sistema': sistema,
+        'x': np.round(x, decimales).tolist(),
+        'y': np.round(y, decimales).tolist(),
+        'z': [None if np.isnan(valor) else round(valor, 4) for valor in z.tolist()],
+    }
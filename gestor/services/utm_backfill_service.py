@@ -0,0 +1,131 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.apps import apps
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from gestor.models import ElementoConstructivo, PuntoControl, ReporteAvance
+from gestor.models.utm_model import CAMPOS_UTM
+from gestor import workers
+from .task_service import tarea
+from .utm_service import convertir_lote
+
+MODELOS_UTM = {
+    'elementos': ElementoConstructivo,
+    'puntos': PuntoControl,
+    'reportes': ReporteAvance,
+}
+
+
+def guardar_utm_lote(etiqueta_modelo, pks, latitudes, longitudes, zonas, hemisferios):
+    """Convierte un lote completo de una vez y lo escribe con bulk_update"""
+    modelo = apps.get_model(etiqueta_modelo)
+    este, norte, zona, _ = convertir_lote(latitudes, longitudes, zonas, hemisferios)
+    ahora = timezone.now()
+
+    objetos = [
+        modelo(
+            pk=pk, utm_este=float(e), utm_norte=float(n), utm_zona=int(z),
+            utm_latitud=lat, utm_longitud=lon, utm_calculado_en=ahora,
+        )
+        for pk, lat, lon, e, n, z in zip(pks, latitudes, longitudes, este, norte, zona)
+    ]
+    with transaction.atomic():
+        modelo.objects.bulk_update(objetos, CAMPOS_UTM)
+    return len(objetos)
+
+
+def consulta_pendientes(modelo, todos=False):
+    """Filas a recalcular, solo con las columnas necesarias y ordenadas por pk"""
+    ruta = modelo.ruta_proyecto
+    queryset = modelo.objects.all()
+    if not todos:
+        queryset = queryset.filter(modelo.filtro_utm_pendiente())
+    return queryset.order_by('pk').values_list(
+        'pk', 'latitud', 'longitud', f'{ruta}__zona_utm', f'{ruta}__hemisferio'
+    )
+
+
+def _lotes(filas, tamano_lote):
+    """Agrupa el iterador de filas en columnas por lote"""
+    lote = []
+    for fila in filas:
+        lote.append(fila)
+        if len(lote) == tamano_lote:
+            yield [list(columna) for columna in zip(*lote)]
+            lote = []
+    if lote:
+        yield [list(columna) for columna in zip(*lote)]
+
+
+@tarea('actualizar_utm')
+def actualizar_utm(tarea_fondo, procesos=0, progreso=None):
+    """
+    Recalcula UTM de elementos, puntos de control y reportes.
+
+    Recorre por streaming (iterator) solo las filas sin UTM o desactualizadas,
+    en orden de pk. El checkpoint "modelo:pk" se guarda después de cada lote
+    confirmado en orden, así una nueva ejecución continúa donde quedó la anterior.
+    Con ``procesos`` > 0 los lotes se reparten en un ProcessPoolExecutor.
+    """
+    parametros = tarea_fondo.parametros
+    nombres = parametros.get('modelos') or list(MODELOS_UTM)
+    tamano_lote = parametros.get('tamano_lote', 2000)
+    todos = parametros.get('todos', False)
+
+    modelo_checkpoint, _, pk_checkpoint = tarea_fondo.checkpoint.partition(':')
+
+    if not tarea_fondo.total:
+        tarea_fondo.total = sum(consulta_pendientes(MODELOS_UTM[n], todos).count() for n in nombres)
+        tarea_fondo.save(update_fields=['total', 'updated_at'])
+
+    def confirmar(nombre, ultimo_pk, filas):
+        tarea_fondo.procesados += filas
+        tarea_fondo.checkpoint = f'{nombre}:{ultimo_pk}'
+        tarea_fondo.resultado[nombre] = tarea_fondo.resultado.get(nombre, 0) + filas
+        tarea_fondo.save(update_fields=['procesados', 'checkpoint', 'resultado', 'updated_at'])
+        if progreso:
+            progreso(nombre, filas)
+
+    executor = None
+    # SQLite bloquea la base completa: los hijos no podrían escribir mientras se lee
+    if procesos and connection.vendor != 'sqlite':
+        # Los hijos abren sus propias conexiones
+        connections.close_all()
+        executor = ProcessPoolExecutor(max_workers=procesos, initializer=workers.inicializar)
+
+    try:
+        for indice, nombre in enumerate(nombres):
+            if modelo_checkpoint in nombres and indice < nombres.index(modelo_checkpoint):
+                continue
+
+            modelo = MODELOS_UTM[nombre]
+            filas = consulta_pendientes(modelo, todos)
+            if nombre == modelo_checkpoint and pk_checkpoint:
+                filas = filas.filter(pk__gt=pk_checkpoint)
+
+            en_vuelo = deque()
+            for pks, latitudes, longitudes, zonas, hemisferios in _lotes(
+                filas.iterator(chunk_size=tamano_lote), tamano_lote
+            ):
+                argumentos = (modelo._meta.label, pks, latitudes, longitudes, zonas, hemisferios)
+
+                if executor is None:
+                    confirmar(nombre, pks[-1], guardar_utm_lote(*argumentos))
+                    continue
+
+                en_vuelo.append((pks[-1], executor.submit(workers.actualizar_utm_lote, *argumentos)))
+                # Acota la memoria y avanza el checkpoint solo con lotes terminados en orden
+                while en_vuelo and (en_vuelo[0][1].done() or len(en_vuelo) > procesos * 2):
+                    ultimo_pk, futuro = en_vuelo.popleft()
+                    confirmar(nombre, ultimo_pk, futuro.result())
+
+            while en_vuelo:
+                ultimo_pk, futuro = en_vuelo.popleft()
+                confirmar(nombre, ultimo_pk, futuro.result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    return tarea_fondo.procesados
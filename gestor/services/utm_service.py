@@ -0,0 +1,175 @@
+"""
+Conversión WGS84 <-> UTM vectorizada con NumPy.
+
+Implementa la proyección transversa de Mercator con las series de Krüger
+a sexto orden (Karney 2011), con error submilimétrico dentro de la zona.
+Todas las funciones aceptan escalares o arreglos y operan en bloque.
+"""
+import numpy as np
+
+# Elipsoide WGS84
+A_ELIPSOIDE = 6378137.0
+F_ELIPSOIDE = 1 / 298.257223563
+K0 = 0.9996
+FALSO_ESTE = 500000.0
+FALSO_NORTE_SUR = 10000000.0
+
+_E = np.sqrt(F_ELIPSOIDE * (2 - F_ELIPSOIDE))
+_N = F_ELIPSOIDE / (2 - F_ELIPSOIDE)
+_RADIO_RECTIFICADO = A_ELIPSOIDE / (1 + _N) * (1 + _N ** 2 / 4 + _N ** 4 / 64 + _N ** 6 / 256)
+
+_ALFA = np.array([
+    _N / 2 - 2 * _N ** 2 / 3 + 5 * _N ** 3 / 16 + 41 * _N ** 4 / 180
+    - 127 * _N ** 5 / 288 + 7891 * _N ** 6 / 37800,
+    13 * _N ** 2 / 48 - 3 * _N ** 3 / 5 + 557 * _N ** 4 / 1440
+    + 281 * _N ** 5 / 630 - 1983433 * _N ** 6 / 1935360,
+    61 * _N ** 3 / 240 - 103 * _N ** 4 / 140 + 15061 * _N ** 5 / 26880
+    + 167603 * _N ** 6 / 181440,
+    49561 * _N ** 4 / 161280 - 179 * _N ** 5 / 168 + 6601661 * _N ** 6 / 7257600,
+    34729 * _N ** 5 / 80640 - 3418889 * _N ** 6 / 1995840,
+    212378941 * _N ** 6 / 319334400,
+])
+
+_BETA = np.array([
+    _N / 2 - 2 * _N ** 2 / 3 + 37 * _N ** 3 / 96 - _N ** 4 / 360
+    - 81 * _N ** 5 / 512 + 96199 * _N ** 6 / 604800,
+    _N ** 2 / 48 + _N ** 3 / 15 - 437 * _N ** 4 / 1440
+    + 46 * _N ** 5 / 105 - 1118711 * _N ** 6 / 3870720,
+    17 * _N ** 3 / 480 - 37 * _N ** 4 / 840 - 209 * _N ** 5 / 4480
+    + 5569 * _N ** 6 / 90720,
+    4397 * _N ** 4 / 161280 - 11 * _N ** 5 / 504 - 830251 * _N ** 6 / 7257600,
+    4583 * _N ** 5 / 161280 - 108847 * _N ** 6 / 3991680,
+    20648693 * _N ** 6 / 638668800,
+])
+
+_J2 = 2 * np.arange(1, 7, dtype=np.float64)
+
+
+def zona_utm(latitud, longitud):
+    """Zona UTM de cada punto, incluyendo las excepciones de Noruega y Svalbard"""
+    latitud = np.asarray(latitud, dtype=np.float64)
+    longitud = np.asarray(longitud, dtype=np.float64)
+
+    lon = (longitud + 180) % 360 - 180
+    zona = np.floor((lon + 180) / 6).astype(np.int64) + 1
+    zona = np.clip(zona, 1, 60)
+
+    noruega = (latitud >= 56) & (latitud < 64) & (lon >= 3) & (lon < 12)
+    zona = np.where(noruega, 32, zona)
+
+    svalbard = (latitud >= 72) & (latitud < 84)
+    for inicio, fin, zona_especial in ((0, 9, 31), (9, 21, 33), (21, 33, 35), (33, 42, 37)):
+        zona = np.where(svalbard & (lon >= inicio) & (lon < fin), zona_especial, zona)
+
+    return zona
+
+
+def meridiano_central(zona):
+    return np.asarray(zona, dtype=np.float64) * 6 - 183
+
+
+def _hemisferio_norte(hemisferio, latitud):
+    """Arreglo booleano: True para hemisferio norte"""
+    if hemisferio is None:
+        return np.asarray(latitud) >= 0
+    hemisferio = np.asarray(hemisferio)
+    return np.char.upper(hemisferio.astype(str)) == 'N'
+
+
+def wgs84_a_utm(latitud, longitud, zona=None, hemisferio=None):
+    """
+    Convierte latitud/longitud (grados) a UTM.
+
+    Si no se indica ``zona`` o ``hemisferio`` se calculan por punto; si se
+    indican (escalares o arreglos) se fuerzan, por ejemplo con la zona del
+    proyecto para que todo el sitio quede en una sola cuadrícula.
+    Devuelve (este, norte, zona, hemisferio) como arreglos.
+    """
+    latitud = np.asarray(latitud, dtype=np.float64)
+    longitud = np.asarray(longitud, dtype=np.float64)
+
+    if zona is None:
+        zona = zona_utm(latitud, longitud)
+    zona = np.broadcast_to(np.asarray(zona, dtype=np.int64), latitud.shape)
+    norte_hemisferio = np.broadcast_to(_hemisferio_norte(hemisferio, latitud), latitud.shape)
+
+    phi = np.radians(latitud)
+    delta_lambda = np.radians((longitud - meridiano_central(zona) + 180) % 360 - 180)
+
+    sen_phi = np.sin(phi)
+    t = np.sinh(np.arctanh(sen_phi) - _E * np.arctanh(_E * sen_phi))
+    xi_p = np.arctan2(t, np.cos(delta_lambda))
+    eta_p = np.arctanh(np.sin(delta_lambda) / np.sqrt(1 + t * t))
+
+    angulos_xi = _J2 * xi_p[..., None]
+    angulos_eta = _J2 * eta_p[..., None]
+    xi = xi_p + np.sum(_ALFA * np.sin(angulos_xi) * np.cosh(angulos_eta), axis=-1)
+    eta = eta_p + np.sum(_ALFA * np.cos(angulos_xi) * np.sinh(angulos_eta), axis=-1)
+
+    este = FALSO_ESTE + K0 * _RADIO_RECTIFICADO * eta
+    norte = K0 * _RADIO_RECTIFICADO * xi + np.where(norte_hemisferio, 0.0, FALSO_NORTE_SUR)
+
+    return este, norte, np.array(zona), np.where(norte_hemisferio, 'N', 'S')
+
+
+def utm_a_wgs84(este, norte, zona, hemisferio='N'):
+    """Convierte coordenadas UTM a latitud/longitud (grados)"""
+    este = np.asarray(este, dtype=np.float64)
+    norte = np.asarray(norte, dtype=np.float64)
+    zona = np.broadcast_to(np.asarray(zona, dtype=np.int64), este.shape)
+    norte_hemisferio = np.broadcast_to(_hemisferio_norte(hemisferio, norte), este.shape)
+
+    xi = (norte - np.where(norte_hemisferio, 0.0, FALSO_NORTE_SUR)) / (K0 * _RADIO_RECTIFICADO)
+    eta = (este - FALSO_ESTE) / (K0 * _RADIO_RECTIFICADO)
+
+    angulos_xi = _J2 * xi[..., None]
+    angulos_eta = _J2 * eta[..., None]
+    xi_p = xi - np.sum(_BETA * np.sin(angulos_xi) * np.cosh(angulos_eta), axis=-1)
+    eta_p = eta - np.sum(_BETA * np.cos(angulos_xi) * np.sinh(angulos_eta), axis=-1)
+
+    sen_xi = np.sin(xi_p)
+    tau_p = sen_xi / np.sqrt(np.sinh(eta_p) ** 2 + np.cos(xi_p) ** 2)
+
+    # Latitud geodésica a partir de la conforme (Newton, converge en 2-3 pasos)
+    e2 = _E * _E
+    tau = tau_p.copy()
+    for _ in range(4):
+        raiz_tau = np.sqrt(1 + tau * tau)
+        sigma = np.sinh(_E * np.arctanh(_E * tau / raiz_tau))
+        tau_i = tau * np.sqrt(1 + sigma * sigma) - sigma * raiz_tau
+        tau += (tau_p - tau_i) / np.sqrt(1 + tau_i * tau_i) * (1 + (1 - e2) * tau * tau) / ((1 - e2) * raiz_tau)
+
+    latitud = np.degrees(np.arctan(tau))
+    longitud = meridiano_central(zona) + np.degrees(np.arctan2(np.sinh(eta_p), np.cos(xi_p)))
+    longitud = (longitud + 180) % 360 - 180
+
+    return latitud, longitud
+
+
+def convertir_lote(latitud, longitud, zonas=None, hemisferios=None):
+    """
+    Convierte un lote mezclando puntos con y sin zona configurada.
+    ``zonas``/``hemisferios`` son arreglos por punto con la configuración de
+    su proyecto; 0/None o ''/None indican que se calcule automáticamente.
+    """
+    latitud = np.asarray(latitud, dtype=np.float64)
+    longitud = np.asarray(longitud, dtype=np.float64)
+
+    zona = zona_utm(latitud, longitud)
+    if zonas is not None:
+        zonas = np.asarray([z or 0 for z in zonas], dtype=np.int64)
+        zona = np.where(zonas > 0, zonas, zona)
+
+    hemisferio = np.where(latitud >= 0, 'N', 'S')
+    if hemisferios is not None:
+        hemisferios = np.asarray([h or '' for h in hemisferios])
+        hemisferio = np.where(np.isin(hemisferios, ['N', 'S']), hemisferios, hemisferio)
+
+    return wgs84_a_utm(latitud, longitud, zona, hemisferio)
+
+
+def zona_de_proyecto(proyecto):
+    """(zona, hemisferio) configurados en el proyecto, o (None, None) para cálculo automático"""
+    if proyecto is None:
+        return None, None
+    return proyecto.zona_utm or None, proyecto.hemisferio or None
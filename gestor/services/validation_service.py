@@ -0,0 +1,38 @@
+from django.utils import timezone
+
+from gestor.models import PuntoControl, ReporteAvance
+from .task_service import tarea, procesar_por_lotes
+
+
+@tarea('validar_puntos')
+def validar_puntos(tarea_fondo):
+    """Valida por lotes los puntos de control seleccionados en el admin"""
+    queryset = PuntoControl.objects.all()
+    usuario_id = tarea_fondo.parametros.get('usuario_id')
+
+    def validar(pks):
+        ahora = timezone.now()
+        return PuntoControl.objects.filter(pk__in=pks, validado=False).update(
+            validado=True,
+            validado_por_id=usuario_id,
+            fecha_validacion=ahora,
+            updated_at=ahora
+        )
+
+    return procesar_por_lotes(tarea_fondo, queryset, validar)
+
+
+@tarea('validar_reportes')
+def validar_reportes(tarea_fondo):
+    """Valida por lotes los reportes de avance seleccionados en el admin"""
+    queryset = ReporteAvance.objects.all()
+    usuario_id = tarea_fondo.parametros.get('usuario_id')
+
+    def validar(pks):
+        return ReporteAvance.objects.filter(pk__in=pks, validado=False).update(
+            validado=True,
+            validado_por_id=usuario_id,
+            updated_at=timezone.now()
+        )
+
+    return procesar_por_lotes(tarea_fondo, queryset, validar)
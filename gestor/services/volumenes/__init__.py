@@ -0,0 +1,123 @@
+"""
+Cálculo de volúmenes de terracería a partir del archivo de levantamiento.
+
+Cada método de ``VolumenTerraceria.METODOS`` tiene un motor que recibe el
+registro, el terreno existente (x, y, z en la cuadrícula LOCAL) y el diseño
+(elevación constante o puntos x, y, z) y devuelve área, corte y relleno.
+"""
+from ..transformacion_service import transformacion_de_proyecto
+from .artefactos import leer_superficie
+from .curvas import leer_curvas, volumen_curvas
+from .diferencia import diferencia_superficies, raster_ascii, volumen_diferencia
+from .grid import volumen_grid
+from .levantamiento import ErrorLevantamiento, Levantamiento, leer_puntos
+from .masas import diagrama_masas
+from .secciones import leer_secciones, volumen_secciones
+from .tin import volumen_tin
+
+# Registro metodo_calculo -> (motor(volumen, existente, diseno), lector de archivos)
+MOTORES = {}
+
+
+def motor(metodo, lector=leer_puntos):
+    """Registra el motor de cálculo de un método y el lector de sus archivos"""
+    def decorador(funcion):
+        MOTORES[metodo] = (funcion, lector)
+        return funcion
+    return decorador
+
+
+@motor('GRID')
+def motor_grid(volumen, existente, diseno):
+    return volumen_grid(existente, diseno, volumen.tamano_celda_m)
+
+
+@motor('TIN')
+def motor_tin(volumen, existente, diseno):
+    return volumen_tin(existente, diseno)
+
+
+@motor('SECCIONES', lector=leer_secciones)
+def motor_secciones(volumen, existente, diseno):
+    return volumen_secciones(existente, diseno, volumen.correccion_prismoidal)
+
+
+@motor('CURVAS', lector=leer_curvas)
+def motor_curvas(volumen, existente, diseno):
+    return volumen_curvas(existente, diseno, volumen.intervalo_curvas_m)
+
+
+@motor('DIFERENCIA')
+def motor_diferencia(volumen, existente, diseno):
+    return volumen_diferencia(existente, diseno, volumen.tamano_celda_m)
+
+
+def diseno_de(volumen, transformacion, lector=leer_puntos):
+    """
+    Superficie de comparación del registro: su levantamiento base, su archivo
+    de diseño, su elevación o la de referencia del proyecto.
+    """
+    base = volumen.levantamiento_base
+    if base is not None:
+        if not base.archivo_levantamiento:
+            raise ErrorLevantamiento(f'{base.nombre} no tiene archivo de levantamiento')
+        return leer_superficie(base.archivo_levantamiento, transformacion, lector)
+    if volumen.archivo_diseno:
+        return leer_superficie(volumen.archivo_diseno, transformacion, lector)
+    if volumen.elevacion_diseno is not None:
+        return volumen.elevacion_diseno
+    return volumen.proyecto.elevacion_referencia
+
+
+def calcular_volumen(volumen, guardar=True, progreso=None):
+    """
+    Calcula corte, relleno y neto del registro con el motor de su método y,
+    si ``guardar``, actualiza el registro. Devuelve el resultado del motor,
+    con el diagrama de masas si el método da corte y relleno por estación.
+    ``progreso(porcentaje)`` se llama al terminar cada etapa.
+    """
+    funcion, lector = MOTORES.get(volumen.metodo_calculo, (None, None))
+    if funcion is None:
+        raise ValueError(f'Método de cálculo sin motor: {volumen.get_metodo_calculo_display()}')
+    if not volumen.archivo_levantamiento:
+        raise ErrorLevantamiento(f'{volumen.nombre} no tiene archivo de levantamiento')
+
+    progreso = progreso or (lambda porcentaje: None)
+    transformacion = transformacion_de_proyecto(volumen.proyecto)
+    existente = leer_superficie(volumen.archivo_levantamiento, transformacion, lector)
+    progreso(40)
+    diseno = diseno_de(volumen, transformacion, lector)
+    progreso(50)
+    resultado = funcion(volumen, existente, diseno)
+    progreso(90)
+    perfil = resultado.pop('perfil', None)
+    if perfil is not None:
+        resultado['masa'] = diagrama_masas(*perfil, volumen.coeficiente_variabilidad, volumen.acarreo_libre_m)
+    if isinstance(existente, Levantamiento):
+        resultado['sistema'] = existente.sistema
+        resultado['filas_invalidas'] = existente.total_invalidas
+
+    volumen.area_m2 = round(resultado['area_m2'], 2)
+    volumen.volumen_corte_m3 = round(resultado['volumen_corte_m3'], 3)
+    volumen.volumen_relleno_m3 = round(resultado['volumen_relleno_m3'], 3)
+    volumen.volumen_neto_m3 = round(volumen.volumen_corte_m3 - volumen.volumen_relleno_m3, 3)
+    volumen.detalle_calculo = resultado
+    if guardar:
+        volumen.save(update_fields=[
+            'area_m2', 'volumen_corte_m3', 'volumen_relleno_m3', 'volumen_neto_m3', 'detalle_calculo', 'updated_at',
+        ])
+    return resultado
+
+def raster_diferencia(volumen):
+    """Ráster ESRI ASCII (cuadrícula LOCAL) de la diferencia contra el levantamiento base"""
+    if not volumen.archivo_levantamiento:
+        raise ErrorLevantamiento(f'{volumen.nombre} no tiene archivo de levantamiento')
+    transformacion = transformacion_de_proyecto(volumen.proyecto)
+    existente = leer_superficie(volumen.archivo_levantamiento, transformacion)
+    reticula, diferencia = diferencia_superficies(
+        existente, diseno_de(volumen, transformacion), volumen.tamano_celda_m
+    )
+    return raster_ascii(reticula, diferencia)
+
+
+__all__ = ['MOTORES', 'motor', 'calcular_volumen', 'raster_diferencia', 'ErrorLevantamiento', 'leer_puntos']
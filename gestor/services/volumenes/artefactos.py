@@ -0,0 +1,165 @@
+"""
+Artefactos binarios de superficies, guardados junto al archivo subido.
+
+Leer y triangular un levantamiento grande cuesta mucho más que calcular el
+volumen. Los puntos ya convertidos a LOCAL, la triangulación y el modelo
+digital de elevación (DEM) de cada tamaño de celda se guardan como ``.npy``
+en ``.superficies/<archivo>/<lector>_<firma>/`` y se abren con mmap. La
+firma combina el hash del contenido, el lector y la transformación del
+proyecto: un archivo reemplazado o una referencia distinta generan artefactos
+nuevos, mientras que cambiar la elevación de diseño o el tamaño de celda
+reutiliza puntos y TIN.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from .levantamiento import Levantamiento, leer_puntos
+
+# Cambiar al modificar el formato de los artefactos o los lectores
+VERSION = 1
+DIRECTORIO = '.superficies'
+
+# Caché por proceso: (ruta, tamaño, mtime) -> hash del contenido
+_HASHES = {}
+
+
+class Artefactos:
+    """Arreglos de una superficie en un directorio: se cargan con mmap o se calculan y guardan"""
+
+    def __init__(self, directorio):
+        self.directorio = directorio
+
+    def ruta(self, nombre):
+        return os.path.join(self.directorio, f'{nombre}.npy')
+
+    def cargar(self, nombre):
+        try:
+            return np.load(self.ruta(nombre), mmap_mode='r')
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def guardar(self, nombre, arreglo):
+        # Se escribe a un temporal y se renombra: otro worker nunca ve un archivo a medias
+        os.makedirs(self.directorio, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as salida:
+            np.save(salida, np.ascontiguousarray(arreglo))
+        os.replace(temporal, self.ruta(nombre))
+
+    def obtener(self, nombre, calcular):
+        """Artefacto guardado o, si no existe, ``calcular()`` guardado para la próxima vez"""
+        arreglo = self.cargar(nombre)
+        if arreglo is None:
+            arreglo = calcular()
+            self.guardar(nombre, arreglo)
+        return arreglo
+
+    def metadatos(self):
+        try:
+            with open(os.path.join(self.directorio, 'metadatos.json'), encoding='utf-8') as entrada:
+                return json.load(entrada)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def guardar_metadatos(self, datos):
+        os.makedirs(self.directorio, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as salida:
+            json.dump(datos, salida)
+        os.replace(temporal, os.path.join(self.directorio, 'metadatos.json'))
+
+
+def hash_archivo(ruta):
+    """sha1 del contenido; se recuerda mientras no cambien tamaño ni fecha del archivo"""
+    estado = os.stat(ruta)
+    llave = (ruta, estado.st_size, estado.st_mtime_ns)
+    if llave not in _HASHES:
+        with open(ruta, 'rb') as entrada:
+            _HASHES[llave] = hashlib.file_digest(entrada, 'sha1').hexdigest()
+    return _HASHES[llave]
+
+
+def firma_transformacion(transformacion):
+    if transformacion is None:
+        return 'sin transformacion'
+    return repr((
+        transformacion.sistema, transformacion.zona, transformacion.hemisferio,
+        transformacion.este_origen, transformacion.norte_origen, transformacion.elevacion_origen,
+        transformacion.factor_combinado,
+    ))
+
+
+def artefactos_de(archivo, *parametros, lector=leer_puntos):
+    """
+    Artefactos de un FieldFile (o ruta) leído con ``lector`` para los
+    parámetros dados; None si el almacenamiento no es local. Cada lector tiene
+    los suyos (el mismo archivo puede usarse como puntos y como secciones) y
+    solo se conserva su firma más reciente, así los artefactos de una versión
+    anterior no se acumulan.
+    """
+    ruta = archivo
+    if not isinstance(archivo, str):
+        try:
+            ruta = archivo.path
+        except NotImplementedError:
+            return None
+    if not os.path.exists(ruta):
+        return None
+
+    nombre_lector = lector.__name__
+    firma = hashlib.sha1(
+        '|'.join([hash_archivo(ruta), str(VERSION), nombre_lector, *map(str, parametros)]).encode()
+    ).hexdigest()
+    base = os.path.join(os.path.dirname(ruta), DIRECTORIO, os.path.basename(ruta))
+    directorio = os.path.join(base, f'{nombre_lector}_{firma}')
+    if not os.path.isdir(directorio) and os.path.isdir(base):
+        for anterior in os.listdir(base):
+            # Firmas anteriores del mismo lector y directorios sin lector (formato previo)
+            if anterior.startswith(f'{nombre_lector}_') or '_' not in anterior:
+                shutil.rmtree(os.path.join(base, anterior), ignore_errors=True)
+    return Artefactos(directorio)
+
+
+def leer_superficie(archivo, transformacion=None, lector=leer_puntos):
+    """
+    Lee el archivo con ``lector`` usando los artefactos guardados. Si el
+    resultado es un ``Levantamiento`` sus puntos se guardan y el objeto queda
+    ligado a sus artefactos (``levantamiento.artefactos``) para reutilizar la
+    triangulación y los DEM; otros resultados (secciones, curvas importadas)
+    se devuelven tal cual.
+    """
+    artefactos = artefactos_de(archivo, firma_transformacion(transformacion), lector=lector)
+    if artefactos is None:
+        return lector(archivo, transformacion)
+
+    puntos = artefactos.cargar('puntos')
+    metadatos = artefactos.metadatos()
+    if puntos is not None and metadatos is not None:
+        levantamiento = Levantamiento(puntos[0], puntos[1], puntos[2], **metadatos)
+    else:
+        levantamiento = lector(archivo, transformacion)
+        if not isinstance(levantamiento, Levantamiento):
+            return levantamiento
+        artefactos.guardar('puntos', np.vstack([levantamiento.x, levantamiento.y, levantamiento.z]))
+        artefactos.guardar_metadatos({
+            'sistema': levantamiento.sistema,
+            'filas_invalidas': levantamiento.filas_invalidas,
+            'total_invalidas': levantamiento.total_invalidas,
+            'bytes_leidos': levantamiento.bytes_leidos,
+        })
+
+    levantamiento.artefactos = artefactos
+    return levantamiento
+
+
+def reutilizar(existente, nombre, calcular):
+    """Artefacto ``nombre`` del levantamiento si está ligado a artefactos; si no, solo se calcula"""
+    artefactos = getattr(existente, 'artefactos', None)
+    if artefactos is None:
+        return calcular()
+    return artefactos.obtener(nombre, calcular)
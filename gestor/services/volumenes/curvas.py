@@ -0,0 +1,215 @@
+"""
+Método de curvas de nivel (CURVAS): áreas encerradas por curvas a una
+equidistancia dada y volumen por tronco de cono entre curvas consecutivas,
+V = h/3 · (A1 + A2 + √(A1·A2)).
+
+Desde un levantamiento de puntos se trabaja con curvas de igual espesor
+(terreno - diseño) sobre el TIN: el área encerrada por la curva de nivel t
+es, exactamente, la suma de la fracción de cada triángulo con diferencia
+mayor o igual a t, así que no hace falta trazar los polígonos.
+También se aceptan curvas importadas (polilíneas cerradas con columna de
+curva), cuyas áreas se calculan con la fórmula del polígono.
+"""
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from .levantamiento import (
+    ALIAS_COLUMNAS, ErrorLevantamiento, a_local, cargar_columnas, columnas_encabezado, detectar_sistema,
+    leer_contenido, leer_muestra, leer_puntos, primera_fila,
+)
+from .superficie import elevaciones_diseno
+from .tin import areas_triangulos, triangulacion
+
+ALIAS_CURVA = ('curva', 'contorno', 'polilinea', 'polilínea', 'linea', 'línea', 'id_curva')
+
+# Caché por proceso de superficies trianguladas: firma -> SuperficieCurvas
+_CACHE = OrderedDict()
+MAXIMO_CACHE = 4
+
+
+class CurvasImportadas:
+    """Polilíneas cerradas de curvas de nivel: un vértice por fila, agrupados por curva"""
+
+    def __init__(self, curva, x, y, z):
+        orden = np.argsort(curva, kind='stable')
+        self.curva = curva[orden]
+        self.x = x[orden]
+        self.y = y[orden]
+        self.z = z[orden]
+
+    def areas_por_elevacion(self):
+        """Elevaciones de las curvas y área total encerrada en cada una"""
+        _, inicios, grupo = np.unique(self.curva, return_index=True, return_inverse=True)
+        siguiente = np.arange(1, len(self.x) + 1)
+        fines = np.append(inicios[1:], len(self.x)) - 1
+        siguiente[fines] = inicios
+        dobles = self.x * self.y[siguiente] - self.x[siguiente] * self.y
+        areas = np.abs(np.bincount(grupo, dobles)) / 2
+
+        elevaciones, nivel = np.unique(self.z[inicios], return_inverse=True)
+        return elevaciones, np.bincount(nivel, areas)
+
+
+def leer_curvas(archivo, transformacion=None):
+    """
+    Lee curvas importadas si el encabezado trae una columna de curva;
+    si no, el archivo se trata como levantamiento de puntos (x, y, z).
+    """
+    delimitador, primera = primera_fila(leer_muestra(archivo))
+    columnas = columnas_encabezado(primera, {**ALIAS_COLUMNAS, 'curva': ALIAS_CURVA})
+    if 'curva' not in columnas:
+        return leer_puntos(archivo, transformacion)
+
+    geograficas = {'lat', 'lon'} <= columnas.keys()
+    claves = ('curva', 'lat', 'lon', 'z') if geograficas else ('curva', 'x', 'y', 'z')
+    if not set(claves) <= columnas.keys():
+        raise ErrorLevantamiento(f'Faltan columnas de curvas: {", ".join(sorted(set(claves) - columnas.keys()))}')
+
+    datos = cargar_columnas(leer_contenido(archivo), delimitador, True, [columnas[clave] for clave in claves])
+    sistema, a, b = detectar_sistema(datos[:, 1], datos[:, 2], geograficas, transformacion)
+    x, y = a_local(a, b, sistema, transformacion)
+    return CurvasImportadas(datos[:, 0], x, y, datos[:, 3])
+
+
+def area_sobre_nivel(areas, d0, d1, d2, nivel):
+    """Área de los triángulos (valores ordenados d0 <= d1 <= d2) donde la superficie lineal es >= nivel"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        alto = (d2 - nivel) ** 2 / ((d2 - d0) * (d2 - d1))
+        bajo = 1 - (nivel - d0) ** 2 / ((d1 - d0) * (d2 - d0))
+    fraccion = np.where(
+        nivel <= d0, 1.0,
+        np.where(nivel >= d2, 0.0, np.where(nivel >= d1, alto, bajo))
+    )
+    return float((areas * fraccion).sum())
+
+
+def volumen_frustum(niveles, areas):
+    """Volumen entre curvas consecutivas por tronco de cono"""
+    h = np.diff(niveles)
+    return float((h / 3 * (areas[:-1] + areas[1:] + np.sqrt(areas[:-1] * areas[1:]))).sum())
+
+
+def niveles_de(maximo, intervalo):
+    """Niveles 0, h, 2h, ... hasta el máximo (el último intervalo puede ser menor)"""
+    if maximo <= 0:
+        return np.zeros(1)
+    niveles = np.arange(0, maximo, intervalo)
+    return np.append(niveles, maximo)
+
+
+class SuperficieCurvas:
+    """
+    Diferencia terreno - diseño sobre el TIN de un levantamiento, lista para
+    obtener volúmenes a distintas equidistancias. Los resultados por
+    equidistancia se guardan para no recalcularlos.
+    """
+
+    def __init__(self, existente, diseno):
+        x, y, z = existente
+        triangulos = triangulacion(existente)
+        dz = (z - elevaciones_diseno(diseno, x, y))[triangulos]
+        self.area = areas_triangulos(x, y, triangulos)
+        # Corte sobre dz y relleno sobre -dz; sólo interesan triángulos con algo de cada uno
+        self.corte = self._preparar(dz)
+        self.relleno = self._preparar(-dz)
+        self.resultados = {}
+
+    def _preparar(self, valores):
+        con_volumen = valores.max(axis=1) > 0
+        d0, d1, d2 = np.sort(valores[con_volumen], axis=1).T
+        return self.area[con_volumen], d0, d1, d2
+
+    @staticmethod
+    def _volumen(preparado, intervalo):
+        areas, d0, d1, d2 = preparado
+        if not len(areas):
+            return 0.0, 0
+        niveles = niveles_de(d2.max(), intervalo)
+        encerradas = np.array([area_sobre_nivel(areas, d0, d1, d2, nivel) for nivel in niveles])
+        return volumen_frustum(niveles, encerradas), len(niveles)
+
+    def volumen(self, intervalo):
+        if intervalo not in self.resultados:
+            corte, curvas_corte = self._volumen(self.corte, intervalo)
+            relleno, curvas_relleno = self._volumen(self.relleno, intervalo)
+            self.resultados[intervalo] = {
+                'area_m2': float(self.area.sum()),
+                'volumen_corte_m3': corte,
+                'volumen_relleno_m3': relleno,
+                'curvas': curvas_corte + curvas_relleno,
+            }
+        return dict(self.resultados[intervalo])
+
+
+def _firma(existente, diseno):
+    firma = hashlib.sha1()
+    for arreglo in existente:
+        firma.update(np.ascontiguousarray(arreglo).tobytes())
+    if np.isscalar(diseno):
+        firma.update(repr(float(diseno)).encode())
+    else:
+        for arreglo in diseno:
+            firma.update(np.ascontiguousarray(arreglo).tobytes())
+    return firma.hexdigest()
+
+
+def superficie_curvas(existente, diseno):
+    """Superficie del levantamiento, construida una vez por proceso para cada levantamiento y diseño"""
+    firma = _firma(existente, diseno)
+    superficie = _CACHE.get(firma)
+    if superficie is None:
+        superficie = SuperficieCurvas(existente, diseno)
+        _CACHE[firma] = superficie
+        while len(_CACHE) > MAXIMO_CACHE:
+            _CACHE.popitem(last=False)
+    else:
+        _CACHE.move_to_end(firma)
+    return superficie
+
+
+def volumen_curvas_importadas(curvas, elevacion):
+    """
+    Volúmenes respecto a una elevación de diseño constante a partir de las
+    áreas de curvas importadas. El área en la elevación de diseño se
+    interpola entre las curvas vecinas; no se cuenta el volumen por encima
+    de la curva más alta ni fuera de la más baja.
+    """
+    elevaciones, areas = curvas.areas_por_elevacion()
+    if len(elevaciones) < 2:
+        raise ErrorLevantamiento('Se requieren curvas en al menos 2 elevaciones')
+    area_diseno = np.interp(elevacion, elevaciones, areas)
+
+    arriba = elevaciones > elevacion
+    corte = volumen_frustum(
+        np.append(elevacion, elevaciones[arriba]),
+        np.append(area_diseno, areas[arriba]),
+    ) if arriba.any() else 0.0
+
+    # Relleno: el prisma de la curva más baja hasta el diseño menos el terreno que ya ocupa
+    abajo = elevaciones < elevacion
+    relleno = float(areas[0] * (elevacion - elevaciones[0])) - volumen_frustum(
+        np.append(elevaciones[abajo], elevacion),
+        np.append(areas[abajo], area_diseno),
+    ) if abajo.any() else 0.0
+    return {
+        'area_m2': float(areas[0]),
+        'volumen_corte_m3': corte,
+        'volumen_relleno_m3': relleno,
+        'curvas': int(len(elevaciones)),
+    }
+
+
+def volumen_curvas(existente, diseno, intervalo):
+    """
+    Volúmenes por curvas de nivel. Para un levantamiento de puntos se usan
+    curvas de espesor a la equidistancia indicada; las curvas importadas usan
+    sus propias elevaciones contra un diseño constante, o se triangulan sus
+    vértices si el diseño es una superficie.
+    """
+    if isinstance(existente, CurvasImportadas):
+        if np.isscalar(diseno):
+            return volumen_curvas_importadas(existente, float(diseno))
+        existente = (existente.x, existente.y, existente.z)
+    return superficie_curvas(existente, diseno).volumen(intervalo)
@@ -0,0 +1,75 @@
+"""
+Diferencia entre levantamientos (DIFERENCIA): el levantamiento actual y uno
+anterior del mismo terreno se promedian en una misma retícula, alineada a
+múltiplos de la celda, y se restan celda por celda.
+
+Corte es lo que bajó el terreno respecto al levantamiento base y relleno lo
+que subió, así los levantamientos semanales dan el avance real de la obra.
+Solo cuentan las celdas con datos en ambos levantamientos.
+"""
+import io
+
+import numpy as np
+
+from .grid import Reticula, dem, perfil_reticula
+from .levantamiento import ErrorLevantamiento
+
+SIN_DATO_ASCII = -9999
+
+# Cambios menores (precisión del levantamiento) no cuentan para las áreas de corte y relleno
+TOLERANCIA_M = 0.05
+
+
+def reticula_comun(existente, base, tamano_celda):
+    """Retícula que cubre ambos levantamientos"""
+    x, y, _ = existente
+    x_base, y_base, _ = base
+    return Reticula.que_cubre(
+        np.array([x.min(), x.max(), x_base.min(), x_base.max()]),
+        np.array([y.min(), y.max(), y_base.min(), y_base.max()]),
+        tamano_celda,
+    )
+
+
+def diferencia_superficies(existente, base, tamano_celda):
+    """Retícula común y ráster actual - base por celda (NaN donde falta alguno)"""
+    if np.isscalar(base):
+        raise ErrorLevantamiento('El método de diferencia requiere un levantamiento base con archivo')
+    reticula = reticula_comun(existente, base, tamano_celda)
+    return reticula, dem(existente, reticula) - dem(base, reticula)
+
+
+def volumen_diferencia(existente, base, tamano_celda, tolerancia=TOLERANCIA_M):
+    """Corte, relleno y cambio máximo entre el levantamiento base y el actual"""
+    reticula, diferencia = diferencia_superficies(existente, base, tamano_celda)
+    validas = ~np.isnan(diferencia)
+    if not validas.any():
+        raise ErrorLevantamiento('Los levantamientos no se traslapan')
+
+    dz = diferencia[validas]
+    return {
+        'area_m2': float(validas.sum() * reticula.area_celda),
+        'volumen_corte_m3': float(np.maximum(-dz, 0).sum() * reticula.area_celda),
+        'volumen_relleno_m3': float(np.maximum(dz, 0).sum() * reticula.area_celda),
+        'area_corte_m2': float((dz < -tolerancia).sum() * reticula.area_celda),
+        'area_relleno_m2': float((dz > tolerancia).sum() * reticula.area_celda),
+        'bajada_maxima_m': float(max(-dz.min(), 0)),
+        'subida_maxima_m': float(max(dz.max(), 0)),
+        'celdas': int(validas.sum()),
+        'perfil': perfil_reticula(reticula, np.maximum(-diferencia, 0), np.maximum(diferencia, 0)),
+    }
+
+
+def raster_ascii(reticula, malla):
+    """Ráster en formato ESRI ASCII Grid (la primera fila es la del norte)"""
+    salida = io.StringIO()
+    salida.write(
+        f'ncols {reticula.columnas}\n'
+        f'nrows {reticula.filas}\n'
+        f'xllcorner {reticula.x_min!r}\n'
+        f'yllcorner {reticula.y_min!r}\n'
+        f'cellsize {reticula.tamano_celda!r}\n'
+        f'NODATA_value {SIN_DATO_ASCII}\n'
+    )
+    np.savetxt(salida, np.nan_to_num(np.flipud(malla), nan=SIN_DATO_ASCII), fmt='%.3f')
+    return salida.getvalue()
@@ -0,0 +1,130 @@
+"""
+Método de retícula (GRID): los puntos se promedian por celda, las celdas
+vacías cercanas a datos se rellenan con el vecino más próximo y el volumen
+es la suma de (existente - diseño) × área de celda.
+"""
+import numpy as np
+from scipy import ndimage
+
+from .artefactos import reutilizar
+from .superficie import elevaciones_diseno
+
+# Celdas vacías a más de esta distancia (en celdas) de un dato quedan fuera del cálculo
+DISTANCIA_RELLENO_CELDAS = 2
+
+
+class Reticula:
+    """Geometría de una retícula regular: origen (esquina inferior izquierda), celda y forma"""
+
+    def __init__(self, x_min, y_min, tamano_celda, columnas, filas):
+        self.x_min = float(x_min)
+        self.y_min = float(y_min)
+        self.tamano_celda = float(tamano_celda)
+        self.columnas = int(columnas)
+        self.filas = int(filas)
+
+    @classmethod
+    def que_cubre(cls, x, y, tamano_celda):
+        x_min = np.floor(x.min() / tamano_celda) * tamano_celda
+        y_min = np.floor(y.min() / tamano_celda) * tamano_celda
+        columnas = max(int(np.ceil((x.max() - x_min) / tamano_celda)), 1)
+        filas = max(int(np.ceil((y.max() - y_min) / tamano_celda)), 1)
+        return cls(x_min, y_min, tamano_celda, columnas, filas)
+
+    @property
+    def forma(self):
+        return self.filas, self.columnas
+
+    @property
+    def area_celda(self):
+        return self.tamano_celda ** 2
+
+    @property
+    def clave(self):
+        """Identifica la retícula en los nombres de artefactos"""
+        return f'{self.tamano_celda!r}_{self.x_min!r}_{self.y_min!r}_{self.columnas}x{self.filas}'
+
+    def indices(self, x, y):
+        """Fila y columna de cada punto (el borde superior es inclusivo); -1 si cae fuera"""
+        u = (x - self.x_min) / self.tamano_celda
+        v = (y - self.y_min) / self.tamano_celda
+        fuera = (u < 0) | (u > self.columnas) | (v < 0) | (v > self.filas)
+        columna = np.minimum(np.floor(u).astype(np.int64), self.columnas - 1)
+        fila = np.minimum(np.floor(v).astype(np.int64), self.filas - 1)
+        columna[fuera] = -1
+        fila[fuera] = -1
+        return fila, columna
+
+    def centros(self):
+        """Coordenadas (x, y) de los centros de celda, como mallas"""
+        x = self.x_min + (np.arange(self.columnas) + 0.5) * self.tamano_celda
+        y = self.y_min + (np.arange(self.filas) + 0.5) * self.tamano_celda
+        return np.meshgrid(x, y)
+
+
+def rasterizar(x, y, z, reticula, distancia_relleno=DISTANCIA_RELLENO_CELDAS):
+    """
+    Elevación media por celda. Las celdas vacías a ``distancia_relleno``
+    celdas o menos de un dato toman el valor del más cercano; el resto queda en NaN.
+    """
+    fila, columna = reticula.indices(x, y)
+    dentro = fila >= 0
+    lineal = fila[dentro] * reticula.columnas + columna[dentro]
+    tamano = reticula.filas * reticula.columnas
+
+    suma = np.bincount(lineal, weights=z[dentro], minlength=tamano)
+    conteo = np.bincount(lineal, minlength=tamano)
+    malla = np.full(tamano, np.nan)
+    con_datos = conteo > 0
+    malla[con_datos] = suma[con_datos] / conteo[con_datos]
+    malla = malla.reshape(reticula.forma)
+
+    vacias = np.isnan(malla)
+    if vacias.any() and not vacias.all():
+        distancia, (filas_cercanas, columnas_cercanas) = ndimage.distance_transform_edt(
+            vacias, return_indices=True
+        )
+        rellenar = vacias & (distancia <= distancia_relleno)
+        malla[rellenar] = malla[filas_cercanas[rellenar], columnas_cercanas[rellenar]]
+    return malla
+
+
+def dem(existente, reticula):
+    """DEM del levantamiento en la retícula; depende solo de los puntos y se reutiliza al cambiar el diseño"""
+    x, y, z = existente
+    return reutilizar(existente, f'dem_{reticula.clave}', lambda: rasterizar(x, y, z, reticula))
+
+
+def perfil_reticula(reticula, corte, relleno):
+    """
+    Corte y relleno (mallas por celda, NaN fuera) por franjas de una celda a lo
+    largo del lado mayor de la retícula, que se toma como eje del diagrama de masas.
+    Devuelve (estaciones, corte, relleno) con estaciones desde 0 en el borde.
+    """
+    eje = 0 if reticula.columnas >= reticula.filas else 1
+    corte = np.nansum(corte, axis=eje) * reticula.area_celda
+    relleno = np.nansum(relleno, axis=eje) * reticula.area_celda
+    return np.arange(len(corte) + 1) * reticula.tamano_celda, corte, relleno
+
+
+def volumen_grid(existente, diseno, tamano_celda):
+    """
+    Volúmenes por retícula entre el terreno existente (x, y, z) y el diseño
+    (constante o puntos). Corte donde el terreno queda sobre el diseño,
+    relleno donde queda debajo. ``perfil`` alimenta el diagrama de masas.
+    """
+    x, y, z = existente
+    reticula = Reticula.que_cubre(x, y, tamano_celda)
+    malla = dem(existente, reticula) - elevaciones_diseno(diseno, *reticula.centros())
+
+    validas = ~np.isnan(malla)
+    dz = malla[validas]
+    corte = float(np.maximum(dz, 0).sum() * reticula.area_celda)
+    relleno = float(np.maximum(-dz, 0).sum() * reticula.area_celda)
+    return {
+        'area_m2': float(validas.sum() * reticula.area_celda),
+        'volumen_corte_m3': corte,
+        'volumen_relleno_m3': relleno,
+        'celdas': int(validas.sum()),
+        'perfil': perfil_reticula(reticula, np.maximum(malla, 0), np.maximum(-malla, 0)),
+    }
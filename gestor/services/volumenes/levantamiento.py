@@ -0,0 +1,441 @@
+"""
+Lectura de archivos de levantamiento (CSV/TXT de puntos) a arreglos NumPy
+en la cuadrícula LOCAL del proyecto.
+
+Formatos aceptados:
+- Con encabezado: columnas x/este, y/norte, z/elevacion, o latitud/longitud/elevacion,
+  y opcionalmente punto y código.
+- Sin encabezado: X,Y,Z (3 columnas) o P,N,E,Z[,D] (formato de colectora).
+El delimitador (tab, ``;``, ``,``, ``|`` o espacios) y la coma decimal se
+detectan de las primeras líneas. El sistema de coordenadas también: UTM si
+el este pasa de 100 km, geográficas si el encabezado lo dice o los valores
+caen a menos de un grado de la referencia del proyecto, y LOCAL en otro caso.
+
+Los archivos de puntos se leen con mmap por bloques: nunca se carga el
+texto completo en memoria y una fila inválida no detiene la carga, se
+reporta con su número de línea.
+"""
+import csv
+import io
+import mmap
+import os
+from collections import Counter
+from contextlib import contextmanager
+
+import numpy as np
+
+ALIAS_COLUMNAS = {
+    'x': ('x', 'este', 'e', 'east', 'easting'),
+    'y': ('y', 'norte', 'n', 'north', 'northing'),
+    'z': ('z', 'elevacion', 'elevación', 'elev', 'cota', 'h', 'altura'),
+    'lat': ('lat', 'latitud', 'latitude'),
+    'lon': ('lon', 'lng', 'longitud', 'longitude'),
+    'punto': ('punto', 'id', 'p', 'pt', 'nombre', 'point', 'name'),
+    'codigo': ('codigo', 'código', 'cod', 'code', 'd', 'descripcion', 'descripción', 'desc'),
+}
+
+# Un este UTM siempre está entre ~160 km y ~840 km
+ESTE_UTM_MINIMO = 100_000
+
+# Delimitadores en orden de preferencia; ';' antes que ',' por los archivos con coma decimal
+DELIMITADORES = ('\t', ';', ',', '|', ' ')
+
+TAMANO_BLOQUE = 4 * 1024 * 1024
+ANCHO_ETIQUETA = 'U16'
+# Fragmentos con filas inválidas de este tamaño o menos se recorren línea por línea
+TAMANO_FRAGMENTO = 64 * 1024
+MAXIMO_FILAS_REPORTADAS = 100
+
+
+class ErrorLevantamiento(ValueError):
+    """El archivo de levantamiento no tiene un formato reconocible"""
+
+
+class Levantamiento:
+    """
+    Puntos de un levantamiento en la cuadrícula LOCAL, con su punto y código
+    si el archivo los trae. Se desempaca como ``x, y, z``.
+    """
+
+    def __init__(self, x, y, z, punto=None, codigo=None, sistema='LOCAL', filas_invalidas=None,
+                 total_invalidas=0, bytes_leidos=0):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.punto = punto
+        self.codigo = codigo
+        self.sistema = sistema
+        self.filas_invalidas = filas_invalidas or []
+        self.total_invalidas = total_invalidas
+        self.bytes_leidos = bytes_leidos
+        # Artefactos binarios ligados (ver artefactos.leer_superficie)
+        self.artefactos = None
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __len__(self):
+        return len(self.x)
+
+
+def _es_numero(valor):
+    try:
+        float(valor)
+    except ValueError:
+        return False
+    return True
+
+
+def _dividir(linea, delimitador):
+    if delimitador == ' ':
+        return linea.split()
+    return [valor.strip() for valor in next(csv.reader([linea], delimiter=delimitador))]
+
+
+def _lineas_muestra(muestra):
+    return [linea for linea in muestra.splitlines() if linea.strip() and not linea.lstrip().startswith('#')]
+
+
+def detectar_delimitador(lineas):
+    """
+    Primer delimitador cuyo número de apariciones más frecuente se repite en
+    la mayoría de las líneas de muestra. Una fila corta o mal formada no
+    cambia el delimitador: se reporta como inválida al cargar.
+    """
+    muestra = lineas[:20]
+    for delimitador in DELIMITADORES:
+        if delimitador == ' ':
+            conteos = Counter(len(linea.split()) - 1 for linea in muestra)
+        else:
+            conteos = Counter(linea.count(delimitador) for linea in muestra)
+        conteo, frecuencia = conteos.most_common(1)[0]
+        if conteo > 0 and frecuencia * 2 > len(muestra):
+            return delimitador
+    return ','
+
+
+def primera_fila(muestra):
+    """Delimitador detectado y valores de la primera línea no vacía"""
+    lineas = _lineas_muestra(muestra)
+    if not lineas:
+        raise ErrorLevantamiento('El archivo está vacío')
+    delimitador = detectar_delimitador(lineas)
+    return delimitador, [valor for valor in _dividir(lineas[0], delimitador) if valor]
+
+
+def columnas_encabezado(encabezado, alias_columnas):
+    """Posición de cada columna conocida del encabezado, según sus alias"""
+    nombres = [valor.lower() for valor in encabezado]
+    columnas = {}
+    for clave, alias in alias_columnas.items():
+        for i, nombre in enumerate(nombres):
+            if nombre in alias and i not in columnas.values():
+                columnas[clave] = i
+                break
+    return columnas
+
+
+def cargar_columnas(texto, delimitador, encabezado, orden, convertidores=None):
+    """Carga las columnas ``orden`` de un texto completo como float64 y descarta las filas no finitas"""
+    datos = np.loadtxt(
+        io.StringIO(texto),
+        delimiter=None if delimitador == ' ' else delimitador,
+        skiprows=1 if encabezado else 0,
+        usecols=orden,
+        converters=convertidores,
+        ndmin=2,
+        dtype=np.float64,
+    )
+    return datos[np.isfinite(datos).all(axis=1)]
+
+
+@contextmanager
+def abrir_buffer(archivo):
+    """
+    Contenido de un FieldFile o de una ruta como buffer de solo lectura:
+    mmap si el archivo está en disco, bytes si el almacenamiento es remoto.
+    """
+    ruta = archivo
+    if not isinstance(archivo, str):
+        try:
+            ruta = archivo.path
+        except NotImplementedError:
+            archivo.open('rb')
+            try:
+                yield archivo.read()
+            finally:
+                archivo.close()
+            return
+
+    with open(ruta, 'rb') as manejador:
+        if os.fstat(manejador.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(manejador.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
+def leer_contenido(archivo):
+    """Texto completo de un FieldFile o de una ruta"""
+    with abrir_buffer(archivo) as buffer:
+        return bytes(buffer).decode('utf-8-sig', errors='replace')
+
+
+def leer_muestra(archivo, tamano=65536):
+    """Primeros ``tamano`` bytes como texto, sin leer el resto"""
+    with abrir_buffer(archivo) as buffer:
+        return bytes(buffer[:tamano]).decode('utf-8-sig', errors='replace')
+
+
+class Formato:
+    """Delimitador, encabezado, coma decimal y posición de cada columna de un archivo de puntos"""
+
+    def __init__(self, delimitador, encabezado, columnas, coma_decimal=False):
+        self.delimitador = delimitador
+        self.encabezado = encabezado
+        self.columnas = columnas
+        self.coma_decimal = coma_decimal
+        # Leer también punto y código; cuesta ~30% de velocidad
+        self.etiquetas = False
+
+    @property
+    def geograficas(self):
+        return 'lat' in self.columnas
+
+    @property
+    def numericas(self):
+        claves = ('lat', 'lon', 'z') if self.geograficas else ('x', 'y', 'z')
+        return [self.columnas[clave] for clave in claves]
+
+    @property
+    def textuales(self):
+        if not self.etiquetas:
+            return []
+        return [clave for clave in ('punto', 'codigo') if clave in self.columnas]
+
+
+def detectar_formato(muestra):
+    """Detecta delimitador, encabezado, coma decimal y columnas a partir de las primeras líneas"""
+    lineas = _lineas_muestra(muestra)
+    if not lineas:
+        raise ErrorLevantamiento('El archivo está vacío')
+    delimitador = detectar_delimitador(lineas)
+    filas = [_dividir(linea, delimitador) for linea in lineas[:20]]
+    # Primera fila de datos con el número de columnas más común (no una fila corta)
+    columnas_comunes = Counter(len(fila) for fila in filas[1:] or filas).most_common(1)[0][0]
+    datos = next(fila for fila in filas[1:] or filas if len(fila) == columnas_comunes)
+    filas = [filas[0], datos] if len(filas) > 1 else filas
+
+    coma_decimal = delimitador != ',' and any(
+        ',' in valor and _es_numero(valor.replace(',', '.')) for valor in datos
+    )
+
+    def numero(valor):
+        return _es_numero(valor.replace(',', '.') if coma_decimal else valor)
+
+    encabezado = len(filas) == 2 and any(
+        not numero(valor) and numero(dato) for valor, dato in zip(filas[0], filas[1])
+    )
+
+    if encabezado:
+        columnas = columnas_encabezado(filas[0], ALIAS_COLUMNAS)
+        # Sin columnas conocidas y casi toda numérica: es una fila de datos mal
+        # formada, no un encabezado; se carga como datos y se reporta inválida
+        encabezado = bool(columnas) or sum(numero(valor) for valor in filas[0]) * 2 <= len(filas[0])
+
+    if encabezado:
+        if 'z' in columnas and ({'x', 'y'} <= columnas.keys() or {'lat', 'lon'} <= columnas.keys()):
+            return Formato(delimitador, True, columnas, coma_decimal)
+        raise ErrorLevantamiento(f'No se reconocen las columnas del encabezado: {", ".join(filas[0])}')
+
+    if len(datos) == 3 and all(numero(valor) for valor in datos):
+        return Formato(delimitador, False, {'x': 0, 'y': 1, 'z': 2}, coma_decimal)
+    if len(datos) >= 4 and all(numero(valor) for valor in datos[1:4]):
+        columnas = {'punto': 0, 'y': 1, 'x': 2, 'z': 3}
+        if len(datos) >= 5:
+            columnas['codigo'] = 4
+        return Formato(delimitador, False, columnas, coma_decimal)
+    raise ErrorLevantamiento('Se esperan columnas X,Y,Z o P,N,E,Z[,D]')
+
+
+def _bloques(buffer, inicio, tamano_bloque):
+    """Rangos (inicio, fin) de ~tamano_bloque bytes que terminan en salto de línea"""
+    total = len(buffer)
+    while inicio < total:
+        fin = min(inicio + tamano_bloque, total)
+        if fin < total:
+            salto = buffer.find(b'\n', fin)
+            fin = total if salto == -1 else salto + 1
+        yield inicio, fin
+        inicio = fin
+
+
+def _inicio_datos(buffer, encabezado):
+    """Byte donde empiezan los datos (después del BOM y del encabezado) y líneas saltadas"""
+    inicio = 3 if buffer[:3] == b'\xef\xbb\xbf' else 0
+    if not encabezado:
+        return inicio, 0
+    lineas = 0
+    while inicio < len(buffer):
+        salto = buffer.find(b'\n', inicio)
+        fin = len(buffer) if salto == -1 else salto + 1
+        linea = bytes(buffer[inicio:fin]).strip()
+        inicio, lineas = fin, lineas + 1
+        if linea and not linea.startswith(b'#'):
+            break
+    return inicio, lineas
+
+
+def _bloque_rapido(texto, formato):
+    """
+    Parseo del bloque completo con una sola pasada de loadtxt (un dtype
+    estructurado si se piden punto y código); None si alguna fila es inválida.
+    """
+    delimitador = None if formato.delimitador == ' ' else formato.delimitador
+    textuales = formato.textuales
+    try:
+        if textuales:
+            datos = np.loadtxt(
+                io.StringIO(texto), delimiter=delimitador,
+                usecols=formato.numericas + [formato.columnas[clave] for clave in textuales],
+                dtype=[('a', 'f8'), ('b', 'f8'), ('z', 'f8')] + [(clave, ANCHO_ETIQUETA) for clave in textuales],
+                ndmin=1, quotechar='"',
+            )
+            numeros = np.column_stack([datos['a'], datos['b'], datos['z']])
+            textos = [datos[clave] for clave in textuales]
+        else:
+            numeros = np.loadtxt(
+                io.StringIO(texto), delimiter=delimitador, usecols=formato.numericas,
+                ndmin=2, dtype=np.float64, quotechar='"',
+            )
+            textos = []
+    except ValueError:
+        return None
+    if not np.isfinite(numeros).all():
+        return None
+    return numeros, textos
+
+
+def _bloque_por_linea(texto, formato, primera_linea, invalidas):
+    """Parseo línea por línea de un bloque con filas inválidas; las anota en ``invalidas``"""
+    numericas = formato.numericas
+    textuales = [formato.columnas[clave] for clave in formato.textuales]
+    numeros, textos = [], []
+    for i, linea in enumerate(texto.split('\n')):
+        linea = linea.strip()
+        if not linea or linea.startswith('#'):
+            continue
+        celdas = _dividir(linea, formato.delimitador)
+        try:
+            valores = [float(celdas[columna]) for columna in numericas]
+            if not np.isfinite(valores).all():
+                raise ValueError
+            etiquetas = [celdas[columna] for columna in textuales]
+        except (ValueError, IndexError):
+            invalidas.append((primera_linea + i, linea[:200]))
+            continue
+        numeros.append(valores)
+        textos.append(etiquetas)
+
+    numeros = np.array(numeros, dtype=np.float64).reshape(-1, len(numericas))
+    textos = [np.array([fila[j] for fila in textos], dtype=ANCHO_ETIQUETA) for j in range(len(textuales))]
+    return numeros, textos
+
+
+def _parsear(texto, formato, primera_linea, invalidas):
+    """
+    Parsea un bloque por la vía rápida; si tiene filas inválidas lo parte a
+    la mitad y repite, de modo que sólo los fragmentos pequeños que las
+    contienen se recorren línea por línea. Genera (numeros, textos).
+    """
+    bloque = _bloque_rapido(texto, formato)
+    if bloque is not None:
+        yield bloque
+        return
+    if len(texto) <= TAMANO_FRAGMENTO:
+        yield _bloque_por_linea(texto, formato, primera_linea, invalidas)
+        return
+
+    mitad = texto.find('\n', len(texto) // 2) + 1 or len(texto)
+    primera, segunda = texto[:mitad], texto[mitad:]
+    yield from _parsear(primera, formato, primera_linea, invalidas)
+    yield from _parsear(segunda, formato, primera_linea + primera.count('\n'), invalidas)
+
+
+def detectar_sistema(a, b, geograficas=False, transformacion=None):
+    """
+    Sistema de las dos primeras columnas numéricas: 'WGS84' (devuelve
+    latitud, longitud), 'UTM' o 'LOCAL'. Devuelve (sistema, a, b).
+    """
+    if geograficas:
+        return 'WGS84', a, b
+    if not len(a):
+        return 'LOCAL', a, b
+    mediana_a, mediana_b = np.median(a), np.median(b)
+    if np.abs(mediana_a) > ESTE_UTM_MINIMO:
+        return 'UTM', a, b
+    if transformacion is not None:
+        lat_origen, lon_origen = transformacion.utm_a_wgs84(transformacion.este_origen, transformacion.norte_origen)
+        if abs(mediana_a - lat_origen) < 1 and abs(mediana_b - lon_origen) < 1:
+            return 'WGS84', a, b
+        if abs(mediana_a - lon_origen) < 1 and abs(mediana_b - lat_origen) < 1:
+            return 'WGS84', b, a
+    return 'LOCAL', a, b
+
+
+def a_local(a, b, sistema, transformacion=None):
+    """Pasa a la cuadrícula LOCAL latitud/longitud ('WGS84') o este/norte ('UTM')"""
+    if sistema == 'WGS84':
+        if transformacion is None:
+            raise ErrorLevantamiento('Se requiere el proyecto para convertir latitud/longitud')
+        x, y = transformacion.wgs84_a_local(a, b)
+    elif sistema == 'UTM' and transformacion is not None:
+        x, y = transformacion.utm_a_local(a, b)
+    else:
+        x, y = a, b
+    return np.ascontiguousarray(x), np.ascontiguousarray(y)
+
+
+def leer_buffer(buffer, transformacion=None, tamano_bloque=TAMANO_BLOQUE, etiquetas=False):
+    """
+    Parsea un buffer de puntos (mmap o bytes) por bloques y devuelve un
+    ``Levantamiento``; con ``etiquetas`` incluye punto y código.
+    """
+    formato = detectar_formato(bytes(buffer[:65536]).decode('utf-8-sig', errors='replace'))
+    formato.etiquetas = etiquetas
+    inicio, linea = _inicio_datos(buffer, formato.encabezado)
+
+    numeros, textos, invalidas = [], [[] for _ in formato.textuales], []
+    for desde, hasta in _bloques(buffer, inicio, tamano_bloque):
+        texto = bytes(buffer[desde:hasta]).decode('utf-8', errors='replace')
+        if formato.coma_decimal:
+            texto = texto.replace(',', '.')
+
+        for bloque in _parsear(texto, formato, linea + 1, invalidas):
+            numeros.append(bloque[0])
+            for lista, columna in zip(textos, bloque[1]):
+                lista.append(columna)
+        linea += texto.count('\n')
+
+    datos = np.concatenate(numeros) if numeros else np.empty((0, 3))
+    if len(datos) < 3:
+        raise ErrorLevantamiento('El levantamiento tiene menos de 3 puntos válidos')
+
+    sistema, a, b = detectar_sistema(datos[:, 0], datos[:, 1], formato.geograficas, transformacion)
+    x, y = a_local(a, b, sistema, transformacion)
+    etiquetas = dict(zip(formato.textuales, (np.concatenate(lista) for lista in textos)))
+    return Levantamiento(
+        x, y, np.ascontiguousarray(datos[:, 2]),
+        punto=etiquetas.get('punto'),
+        codigo=etiquetas.get('codigo'),
+        sistema=sistema,
+        filas_invalidas=invalidas[:MAXIMO_FILAS_REPORTADAS],
+        total_invalidas=len(invalidas),
+        bytes_leidos=len(buffer),
+    )
+
+
+def leer_puntos(archivo, transformacion=None, tamano_bloque=TAMANO_BLOQUE, etiquetas=False):
+    """Lee un FieldFile (o ruta) de levantamiento con mmap y devuelve un ``Levantamiento``"""
+    with abrir_buffer(archivo) as buffer:
+        return leer_buffer(buffer, transformacion, tamano_bloque, etiquetas)
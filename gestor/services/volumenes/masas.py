@@ -0,0 +1,112 @@
+"""
+Diagrama de masas (curva masa) a partir del corte y relleno por tramo de
+los métodos de secciones o de retícula.
+
+La ordenada en cada estación es la suma acumulada de corte × coeficiente de
+variabilidad volumétrica menos relleno. Los puntos de balance son los cruces
+con la línea de ordenada cero y dividen la curva en ondas: en una onda
+positiva el corte se acarrea hacia adelante, en una negativa hacia atrás.
+
+Para una onda, el ancho w(h) a la ordenada h es la longitud de estaciones
+donde la curva está más allá de h; el volumen que se mueve más lejos que el
+acarreo libre es el que queda donde w(h) > acarreo libre y el sobreacarreo
+(m³·m) es ∫ (w(h) - acarreo libre) dh sobre esas ordenadas.
+"""
+import numpy as np
+
+# Ordenadas en que se evalúa el ancho de cada onda
+NIVELES_POR_ONDA = 256
+
+
+def ordenadas_masa(corte, relleno, coeficiente=1.0):
+    """Ordenadas acumuladas en las estaciones (una más que tramos; la primera es 0)"""
+    return np.concatenate([[0.0], np.cumsum(corte * coeficiente - relleno)])
+
+
+def con_puntos_balance(estaciones, ordenadas):
+    """Curva con los cruces por cero insertados; devuelve (estaciones, ordenadas, balances)"""
+    m0, m1 = ordenadas[:-1], ordenadas[1:]
+    cruza = np.flatnonzero(m0 * m1 < 0)
+    cruces = estaciones[cruza] + (estaciones[cruza + 1] - estaciones[cruza]) * m0[cruza] / (m0[cruza] - m1[cruza])
+    estaciones = np.insert(estaciones, cruza + 1, cruces)
+    ordenadas = np.insert(ordenadas, cruza + 1, 0.0)
+    # También balancean las estaciones con ordenada exactamente cero (menos el inicio)
+    return estaciones, ordenadas, estaciones[1:][ordenadas[1:] == 0]
+
+
+def anchos(estaciones, valores, niveles):
+    """Longitud de estaciones donde la curva lineal por tramos es >= cada nivel"""
+    s0, s1 = estaciones[:-1], estaciones[1:]
+    bajo = np.minimum(valores[:-1], valores[1:])
+    alto = np.maximum(valores[:-1], valores[1:])
+    h = niveles[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraccion = np.where(alto > bajo, np.clip((alto - h) / (alto - bajo), 0, 1), (bajo >= h) * 1.0)
+    return (fraccion * (s1 - s0)).sum(axis=1)
+
+
+def acarreo_onda(estaciones, valores, acarreo_libre, niveles=NIVELES_POR_ONDA):
+    """
+    Acarreo de una onda con ``valores`` >= 0. Si la onda queda abierta al
+    final del tramo solo se acarrea lo que está por encima de su extremo;
+    el resto es sobrante o faltante.
+    """
+    base = max(valores[0], valores[-1])
+    pico = valores.max()
+    if pico <= base:
+        return 0.0, 0.0, 0.0, 0.0
+
+    h = np.linspace(base, pico, niveles)
+    w = anchos(estaciones, valores, h)
+    total = float(np.trapezoid(w, h))
+    if w[0] <= acarreo_libre:
+        return float(pico - base), 0.0, 0.0, total
+
+    # w es decreciente: primer nivel donde el ancho ya cabe en el acarreo libre
+    limite = float(np.interp(-acarreo_libre, -w, h))
+    exceso = np.maximum(w - acarreo_libre, 0)
+    sobreacarreo = float(np.trapezoid(exceso, h))
+    return float(pico - limite), float(limite - base), sobreacarreo, total
+
+
+def diagrama_masas(estaciones, corte, relleno, coeficiente=1.0, acarreo_libre=20.0):
+    """Curva masa, puntos de balance y volúmenes de acarreo libre y sobreacarreo"""
+    estaciones = np.asarray(estaciones, dtype=float)
+    ordenadas = ordenadas_masa(np.asarray(corte), np.asarray(relleno), coeficiente)
+    curva_estaciones, curva_ordenadas, balances = con_puntos_balance(estaciones, ordenadas)
+
+    limites = np.concatenate([[0], np.flatnonzero(curva_ordenadas == 0), [len(curva_ordenadas) - 1]])
+    limites = np.unique(limites)
+    ondas = []
+    for desde, hasta in zip(limites[:-1], limites[1:]):
+        tramo = slice(desde, hasta + 1)
+        valores = curva_ordenadas[tramo]
+        signo = 1.0 if valores.sum() >= 0 else -1.0
+        libre, sobre, sobreacarreo, total = acarreo_onda(curva_estaciones[tramo], valores * signo, acarreo_libre)
+        if libre + sobre <= 0:
+            continue
+        ondas.append({
+            'desde': round(float(curva_estaciones[desde]), 3),
+            'hasta': round(float(curva_estaciones[hasta]), 3),
+            'sentido': 'adelante' if signo > 0 else 'atras',
+            'volumen_m3': libre + sobre,
+            'acarreo_libre_m3': libre,
+            'sobreacarreo_m3': sobre,
+            'sobreacarreo_m3_m': sobreacarreo,
+            'acarreo_m3_m': total,
+        })
+
+    final = float(ordenadas[-1])
+    return {
+        'estaciones': estaciones.round(3).tolist(),
+        'ordenadas': ordenadas.round(3).tolist(),
+        'puntos_balance': balances.round(3).tolist(),
+        'coeficiente': coeficiente,
+        'acarreo_libre_m': acarreo_libre,
+        'ondas': ondas,
+        'volumen_acarreo_libre_m3': sum(onda['acarreo_libre_m3'] for onda in ondas),
+        'volumen_sobreacarreo_m3': sum(onda['sobreacarreo_m3'] for onda in ondas),
+        'sobreacarreo_m3_m': sum(onda['sobreacarreo_m3_m'] for onda in ondas),
+        'sobrante_m3': max(0.0, final),
+        'faltante_m3': max(0.0, -final),
+    }
@@ -0,0 +1,194 @@
+"""
+Método de secciones transversales (SECCIONES): áreas de corte y relleno de
+cada sección y volumen por áreas extremas promediadas, con corrección
+prismoidal opcional.
+
+El archivo trae una fila por punto de sección: estación (m o cadenamiento
+``0+120.50``), desplazamiento desde el eje (negativo a la izquierda),
+elevación del terreno y, opcionalmente, elevación de proyecto (rasante).
+"""
+import numpy as np
+
+from .levantamiento import (
+    ErrorLevantamiento, cargar_columnas, columnas_encabezado, leer_contenido, primera_fila,
+)
+
+ALIAS_SECCIONES = {
+    'estacion': ('estacion', 'estación', 'est', 'cadenamiento', 'km', 'station'),
+    'desplazamiento': ('desplazamiento', 'dist', 'distancia', 'offset', 'eje'),
+    'z': ('z', 'elevacion', 'elevación', 'elev', 'cota', 'terreno'),
+    'diseno': ('diseno', 'diseño', 'rasante', 'subrasante', 'proyecto'),
+}
+
+
+def cadenamiento(valor):
+    """Estación en metros: acepta ``120.5``, ``0+120.50`` o ``km 1+020``"""
+    if isinstance(valor, bytes):
+        valor = valor.decode()
+    valor = valor.strip().lower().removeprefix('km').lstrip('k ').strip()
+    if '+' in valor:
+        kilometros, metros = valor.split('+', 1)
+        return float(kilometros or 0) * 1000 + float(metros)
+    return float(valor)
+
+
+def _es_estacion(valor):
+    try:
+        cadenamiento(valor)
+    except ValueError:
+        return False
+    return True
+
+
+def leer_secciones(archivo, transformacion=None):
+    """
+    Lee un archivo de secciones y devuelve (estacion, desplazamiento, z, diseno)
+    ordenados por estación y desplazamiento; ``diseno`` es None si no hay rasante.
+    """
+    texto = leer_contenido(archivo)
+    delimitador, primera = primera_fila(texto[:65536])
+
+    if all(_es_estacion(valor) for valor in primera):
+        encabezado = False
+        if len(primera) < 3:
+            raise ErrorLevantamiento('Se esperan al menos 3 columnas (estación, desplazamiento, elevación)')
+        columnas = {'estacion': 0, 'desplazamiento': 1, 'z': 2}
+        if len(primera) >= 4:
+            columnas['diseno'] = 3
+    else:
+        encabezado = True
+        columnas = columnas_encabezado(primera, ALIAS_SECCIONES)
+        faltantes = {'estacion', 'desplazamiento', 'z'} - columnas.keys()
+        if faltantes:
+            raise ErrorLevantamiento(f'Faltan columnas de sección: {", ".join(sorted(faltantes))}')
+
+    claves = [clave for clave in ('estacion', 'desplazamiento', 'z', 'diseno') if clave in columnas]
+    datos = cargar_columnas(
+        texto, delimitador, encabezado, [columnas[clave] for clave in claves],
+        convertidores={columnas['estacion']: cadenamiento},
+    )
+    orden = np.lexsort((datos[:, 1], datos[:, 0]))
+    datos = datos[orden]
+    if len(np.unique(datos[:, 0])) < 2:
+        raise ErrorLevantamiento('Se requieren al menos 2 secciones')
+
+    diseno = np.ascontiguousarray(datos[:, 3]) if 'diseno' in columnas else None
+    return (
+        np.ascontiguousarray(datos[:, 0]),
+        np.ascontiguousarray(datos[:, 1]),
+        np.ascontiguousarray(datos[:, 2]),
+        diseno,
+    )
+
+
+def interpolar_secciones(estacion, desplazamiento, diseno):
+    """
+    Rasante en cada punto (estacion, desplazamiento) a partir de secciones de
+    diseño en las mismas estaciones. Todas las secciones se interpolan con un
+    solo ``np.interp`` sobre una llave estación-desplazamiento; fuera del
+    ancho de la sección de diseño se prolonga su último valor.
+    Los puntos en estaciones sin sección de diseño quedan en NaN.
+    """
+    diseno_estacion, diseno_desplazamiento, diseno_z, _ = diseno
+    estaciones, inicios = np.unique(diseno_estacion, return_index=True)
+    fines = np.append(inicios[1:], len(diseno_estacion)) - 1
+    amplitud = np.ptp(np.concatenate([desplazamiento, diseno_desplazamiento])) + 1
+
+    posicion = np.searchsorted(estaciones, estacion)
+    posicion = np.minimum(posicion, len(estaciones) - 1)
+    con_diseno = estaciones[posicion] == estacion
+    limitado = np.clip(
+        desplazamiento,
+        diseno_desplazamiento[inicios[posicion]],
+        diseno_desplazamiento[fines[posicion]],
+    )
+
+    rango_diseno = np.repeat(np.arange(len(estaciones)), fines - inicios + 1)
+    llave_diseno = rango_diseno * amplitud + diseno_desplazamiento
+    rasante = np.interp(posicion * amplitud + limitado, llave_diseno, diseno_z)
+    rasante[~con_diseno] = np.nan
+    return rasante
+
+
+def areas_secciones(estacion, desplazamiento, diferencia):
+    """
+    Áreas y anchos de corte y relleno de todas las secciones a la vez.
+    ``diferencia`` es terreno - rasante en cada punto; entre puntos la
+    diferencia es lineal y los tramos que cruzan la rasante se dividen en el cruce.
+    Devuelve (estaciones, area_corte, area_relleno, ancho_corte, ancho_relleno, ancho).
+    """
+    estaciones, seccion = np.unique(estacion, return_inverse=True)
+    mismo = seccion[:-1] == seccion[1:]
+    tramo = seccion[:-1][mismo]
+    w = np.diff(desplazamiento)[mismo]
+    d0, d1 = diferencia[:-1][mismo], diferencia[1:][mismo]
+
+    cruza = d0 * d1 < 0
+    salto = np.where(cruza, np.abs(d0 - d1), 1.0)
+    resultados = []
+    for a, b in ((np.maximum(d0, 0), np.maximum(d1, 0)), (np.maximum(-d0, 0), np.maximum(-d1, 0))):
+        area = np.where(cruza, w * (a + b) ** 2 / (2 * salto), w * (a + b) / 2)
+        ancho = np.where(cruza, w * (a + b) / salto, w * ((a + b) > 0))
+        resultados.append((area, ancho))
+
+    (area_corte, ancho_corte), (area_relleno, ancho_relleno) = resultados
+    n = len(estaciones)
+    return (
+        estaciones,
+        np.bincount(tramo, area_corte, minlength=n),
+        np.bincount(tramo, area_relleno, minlength=n),
+        np.bincount(tramo, ancho_corte, minlength=n),
+        np.bincount(tramo, ancho_relleno, minlength=n),
+        np.bincount(tramo, w, minlength=n),
+    )
+
+
+def volumen_entre_secciones(longitud, area_1, area_2, ancho_1, ancho_2, prismoidal=False):
+    """
+    Volumen de cada tramo por áreas extremas promediadas. Con ``prismoidal``
+    se resta la corrección L/6·(b1 - b2)(h1 - h2), tomando cada sección como
+    un rectángulo equivalente de ancho b y altura media h = A/b.
+    """
+    volumen = longitud * (area_1 + area_2) / 2
+    if prismoidal:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            altura_1 = np.where(ancho_1 > 0, area_1 / ancho_1, 0.0)
+            altura_2 = np.where(ancho_2 > 0, area_2 / ancho_2, 0.0)
+        volumen = volumen - longitud / 6 * (ancho_1 - ancho_2) * (altura_1 - altura_2)
+    return volumen
+
+
+def volumen_secciones(secciones, diseno, prismoidal=False):
+    """
+    Volúmenes por secciones entre el terreno y la rasante. La rasante viene
+    del propio archivo, de secciones de diseño o de una elevación constante.
+    ``perfil`` (estaciones, corte y relleno por tramo) alimenta el diagrama de masas.
+    """
+    estacion, desplazamiento, z, rasante = secciones
+    if np.isscalar(diseno):
+        rasante = np.full_like(z, float(diseno)) if rasante is None else rasante
+    elif rasante is None:
+        rasante = interpolar_secciones(estacion, desplazamiento, diseno)
+
+    validos = ~np.isnan(rasante)
+    estacion, desplazamiento = estacion[validos], desplazamiento[validos]
+    estaciones, area_corte, area_relleno, ancho_corte, ancho_relleno, ancho = areas_secciones(
+        estacion, desplazamiento, z[validos] - rasante[validos]
+    )
+    if len(estaciones) < 2:
+        raise ErrorLevantamiento('Menos de 2 secciones tienen rasante')
+
+    longitud = np.diff(estaciones)
+    corte = volumen_entre_secciones(
+        longitud, area_corte[:-1], area_corte[1:], ancho_corte[:-1], ancho_corte[1:], prismoidal
+    )
+    relleno = volumen_entre_secciones(
+        longitud, area_relleno[:-1], area_relleno[1:], ancho_relleno[:-1], ancho_relleno[1:], prismoidal
+    )
+    return {
+        'area_m2': float((longitud * (ancho[:-1] + ancho[1:]) / 2).sum()),
+        'volumen_corte_m3': float(corte.sum()),
+        'volumen_relleno_m3': float(relleno.sum()),
+        'secciones': int(len(estaciones)),
+        'perfil': (estaciones, corte, relleno),
+    }
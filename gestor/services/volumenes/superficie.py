@@ -0,0 +1,22 @@
+"""Evaluación de la superficie de diseño en posiciones arbitrarias"""
+import numpy as np
+from scipy import interpolate
+
+
+def elevaciones_diseno(diseno, x, y):
+    """
+    Elevación del diseño en los puntos (x, y): una constante o puntos
+    (x, y, z) interpolados linealmente; fuera de la envolvente de los
+    puntos de diseño se toma el valor más cercano.
+    """
+    if np.isscalar(diseno):
+        return np.full(np.shape(x), float(diseno))
+
+    diseno_x, diseno_y, diseno_z = diseno
+    puntos = np.column_stack([diseno_x, diseno_y])
+    destino = np.column_stack([np.ravel(x), np.ravel(y)])
+    elevaciones = interpolate.griddata(puntos, diseno_z, destino, method='linear')
+    fuera = np.isnan(elevaciones)
+    if fuera.any():
+        elevaciones[fuera] = interpolate.griddata(puntos, diseno_z, destino[fuera], method='nearest')
+    return elevaciones.reshape(np.shape(x))
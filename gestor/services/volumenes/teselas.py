@@ -0,0 +1,290 @@
+"""
+Pirámide de teselas PNG de los levantamientos para los mapas Leaflet.
+
+Cada nivel de la pirámide promedia 2×2 las celdas del anterior, partiendo del
+DEM del levantamiento (capa ``elevacion``) o de su corte/relleno contra el
+diseño o el levantamiento base (capa ``corte_relleno``, positivo en corte).
+Una tesela XYZ (Web Mercator) se dibuja llevando el centro de cada píxel a la
+cuadrícula LOCAL del proyecto y leyendo el nivel cuya celda se acerca más al
+tamaño del píxel. Las teselas se guardan junto a los artefactos del
+levantamiento, separadas por volumen; la firma de la configuración forma
+parte de la ruta, así que cambiar el diseño o la celda genera teselas nuevas
+en vez de servir viejas.
+"""
+import hashlib
+import io
+import math
+import os
+import shutil
+import tempfile
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+from ..transformacion_service import transformacion_de_proyecto
+from . import diseno_de
+from .artefactos import artefactos_de, firma_transformacion, hash_archivo, leer_superficie
+from .diferencia import diferencia_superficies
+from .grid import Reticula, dem
+from .levantamiento import ErrorLevantamiento
+from .superficie import elevaciones_diseno
+
+# Cambiar al modificar el dibujo de las teselas
+VERSION = 1
+TAMANO_TESELA = 256
+CAPAS = ('elevacion', 'corte_relleno')
+# Métodos cuyo archivo de levantamiento es una nube de puntos
+METODOS = ('GRID', 'TIN', 'DIFERENCIA')
+# maxZoom de las capas en los mapas; no se dibujan teselas más allá
+ZOOM_MAXIMO = 22
+# Metros por píxel en el ecuador a zoom 0 (Web Mercator, teselas de 256 px)
+METROS_PIXEL_ZOOM_0 = 156543.03392804097
+
+# Rampas de color (posición 0-1, RGBA)
+RAMPA_ELEVACION = (
+    (0.0, (26, 152, 80, 200)),
+    (0.35, (166, 217, 106, 200)),
+    (0.6, (254, 224, 139, 200)),
+    (0.85, (215, 163, 91, 200)),
+    (1.0, (245, 245, 245, 200)),
+)
+RAMPA_CORTE_RELLENO = (
+    (0.0, (37, 99, 235, 210)),
+    (0.5, (248, 250, 252, 120)),
+    (1.0, (220, 38, 38, 210)),
+)
+
+# Caché por proceso: (pk, capa, firma) -> Piramide
+_CACHE = OrderedDict()
+MAXIMO_CACHE = 4
+# Límites WGS84 por proceso: (pk, firma) -> límites
+_LIMITES = OrderedDict()
+MAXIMO_LIMITES = 64
+
+
+def reducir(malla):
+    """Promedio 2×2 ignorando NaN (las celdas sin ningún dato quedan en NaN)"""
+    filas, columnas = malla.shape
+    malla = np.pad(malla, ((0, filas % 2), (0, columnas % 2)), constant_values=np.nan)
+    bloques = malla.reshape(malla.shape[0] // 2, 2, malla.shape[1] // 2, 2)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanmean(bloques, axis=(1, 3))
+
+
+class Piramide:
+    """Niveles de una malla, cada uno con la mitad de resolución que el anterior"""
+
+    def __init__(self, reticula, malla, capa):
+        self.capa = capa
+        self.niveles = [(reticula, malla.astype(np.float32))]
+        while max(malla.shape) > TAMANO_TESELA:
+            malla = reducir(malla)
+            anterior = self.niveles[-1][0]
+            reticula = Reticula(
+                anterior.x_min, anterior.y_min, anterior.tamano_celda * 2, malla.shape[1], malla.shape[0]
+            )
+            self.niveles.append((reticula, malla.astype(np.float32)))
+
+        valores = self.niveles[0][1]
+        valores = valores[~np.isnan(valores)]
+        if not len(valores):
+            raise ErrorLevantamiento('La superficie no tiene celdas con datos')
+        if capa == 'corte_relleno':
+            limite = float(np.percentile(np.abs(valores), 98)) or 1.0
+            self.rango = (-limite, limite)
+        else:
+            minimo, maximo = np.percentile(valores, [2, 98])
+            self.rango = (float(minimo), float(maximo) if maximo > minimo else float(minimo) + 1)
+
+    def muestrear(self, x, y, tamano_pixel):
+        """Valores en puntos LOCAL del nivel más fino cuya celda no es menor que la mitad del píxel"""
+        base = self.niveles[0][0].tamano_celda
+        nivel = int(np.clip(np.floor(np.log2(max(tamano_pixel, base) / base)), 0, len(self.niveles) - 1))
+        reticula, malla = self.niveles[nivel]
+        fila, columna = reticula.indices(x, y)
+        valores = np.full(x.shape, np.nan, dtype=np.float32)
+        dentro = fila >= 0
+        valores[dentro] = malla[fila[dentro], columna[dentro]]
+        return valores
+
+
+def colorear(valores, rango, rampa):
+    """Arreglo RGBA uint8; NaN queda transparente"""
+    posicion = np.clip(np.nan_to_num((valores - rango[0]) / (rango[1] - rango[0])), 0, 1)
+    paradas = [parada for parada, _ in rampa]
+    rgba = np.zeros(valores.shape + (4,), dtype=np.uint8)
+    for canal in range(4):
+        rgba[..., canal] = np.interp(posicion, paradas, [color[canal] for _, color in rampa])
+    rgba[np.isnan(valores)] = 0
+    return rgba
+
+
+def centros_pixeles(z, x, y):
+    """Latitud y longitud del centro de cada píxel de la tesela XYZ"""
+    n = 2 ** z
+    paso = (np.arange(TAMANO_TESELA) + 0.5) / TAMANO_TESELA
+    longitud = (x + paso) / n * 360 - 180
+    latitud = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y + paso) / n))))
+    return np.meshgrid(latitud, longitud, indexing='ij')
+
+
+def firma_configuracion(volumen):
+    """Todo lo que cambia el dibujo: levantamiento, transformación, celda y superficie de comparación"""
+    partes = [
+        VERSION, hash_archivo(volumen.archivo_levantamiento.path),
+        firma_transformacion(transformacion_de_proyecto(volumen.proyecto)),
+        volumen.tamano_celda_m, volumen.elevacion_diseno, volumen.proyecto.elevacion_referencia,
+        volumen.archivo_diseno.name if volumen.archivo_diseno else '',
+    ]
+    base = volumen.levantamiento_base
+    if base is not None and base.archivo_levantamiento:
+        partes.append(base.archivo_levantamiento.name)
+    return hashlib.sha1(repr(partes).encode()).hexdigest()[:16]
+
+
+def malla_de(volumen, capa):
+    """Retícula y malla de la capa a la resolución del registro"""
+    transformacion = transformacion_de_proyecto(volumen.proyecto)
+    existente = leer_superficie(volumen.archivo_levantamiento, transformacion)
+    x, y, _ = existente
+    if capa == 'elevacion':
+        reticula = Reticula.que_cubre(x, y, volumen.tamano_celda_m)
+        return reticula, dem(existente, reticula)
+
+    diseno = diseno_de(volumen, transformacion)
+    if volumen.levantamiento_base_id is not None:
+        reticula, diferencia = diferencia_superficies(existente, diseno, volumen.tamano_celda_m)
+        return reticula, -diferencia
+    reticula = Reticula.que_cubre(x, y, volumen.tamano_celda_m)
+    return reticula, dem(existente, reticula) - elevaciones_diseno(diseno, *reticula.centros())
+
+
+def piramide_de(volumen, capa, firma):
+    """Pirámide de la capa, construida una vez por proceso para cada configuración"""
+    llave = (volumen.pk, capa, firma)
+    piramide = _CACHE.get(llave)
+    if piramide is None:
+        piramide = Piramide(*malla_de(volumen, capa), capa)
+        _CACHE[llave] = piramide
+        while len(_CACHE) > MAXIMO_CACHE:
+            _CACHE.popitem(last=False)
+    else:
+        _CACHE.move_to_end(llave)
+    return piramide
+
+
+def dibujar_tesela(volumen, capa, z, x, y, firma):
+    """PNG de la tesela (transparente fuera del levantamiento)"""
+    piramide = piramide_de(volumen, capa, firma)
+    latitud, longitud = centros_pixeles(z, x, y)
+    local_x, local_y = transformacion_de_proyecto(volumen.proyecto).wgs84_a_local(latitud, longitud)
+    tamano_pixel = METROS_PIXEL_ZOOM_0 * math.cos(math.radians(float(latitud.mean()))) / 2 ** z
+
+    valores = piramide.muestrear(local_x, local_y, tamano_pixel)
+    rampa = RAMPA_CORTE_RELLENO if capa == 'corte_relleno' else RAMPA_ELEVACION
+    salida = io.BytesIO()
+    Image.fromarray(colorear(valores, piramide.rango, rampa), 'RGBA').save(salida, format='PNG')
+    return salida.getvalue()
+
+
+def tesela(volumen, capa, z, x, y, firma=None):
+    """
+    Contenido PNG de la tesela ``z/x/y`` de la capa; se lee del disco si ya
+    se dibujó con la misma configuración y, si no, se dibuja y se guarda.
+    """
+    if capa not in CAPAS:
+        raise ValueError(f'Capa desconocida: {capa}')
+    if volumen.metodo_calculo not in METODOS:
+        raise ErrorLevantamiento(f'{volumen.get_metodo_calculo_display()} no tiene superficie de puntos')
+    if not volumen.archivo_levantamiento:
+        raise ErrorLevantamiento(f'{volumen.nombre} no tiene archivo de levantamiento')
+
+    firma = firma or firma_configuracion(volumen)
+    artefactos = artefactos_de(
+        volumen.archivo_levantamiento, firma_transformacion(transformacion_de_proyecto(volumen.proyecto))
+    )
+    if artefactos is None:
+        return dibujar_tesela(volumen, capa, z, x, y, firma)
+
+    # Varios volúmenes pueden usar el mismo archivo: cada uno tiene sus teselas
+    directorio = os.path.join(artefactos.directorio, 'teselas')
+    prefijo = f'{capa}_{volumen.pk}_'
+    ruta = os.path.join(directorio, f'{prefijo}{firma}', str(z), str(x), f'{y}.png')
+    try:
+        with open(ruta, 'rb') as entrada:
+            return entrada.read()
+    except FileNotFoundError:
+        pass
+
+    # Las teselas de una configuración anterior del volumen ya no se piden
+    if os.path.isdir(directorio) and not os.path.isdir(os.path.join(directorio, f'{prefijo}{firma}')):
+        for anterior in os.listdir(directorio):
+            sin_volumen = anterior.startswith(f'{capa}_') and '_' not in anterior[len(capa) + 1:]
+            if anterior.startswith(prefijo) or sin_volumen:
+                shutil.rmtree(os.path.join(directorio, anterior), ignore_errors=True)
+
+    contenido = dibujar_tesela(volumen, capa, z, x, y, firma)
+    # La caché en disco es opcional: si otra petición borró el directorio se sirve sin guardar
+    try:
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as salida:
+            salida.write(contenido)
+        os.replace(temporal, ruta)
+    except OSError:
+        pass
+    return contenido
+
+
+def limites_wgs84(volumen):
+    """[[lat_min, lon_min], [lat_max, lon_max]] del levantamiento, para acotar la capa en Leaflet"""
+    transformacion = transformacion_de_proyecto(volumen.proyecto)
+    x, y, _ = leer_superficie(volumen.archivo_levantamiento, transformacion)
+    latitud, longitud = transformacion.local_a_wgs84(
+        np.array([x.min(), x.max(), x.min(), x.max()]), np.array([y.min(), y.min(), y.max(), y.max()])
+    )
+    return [[float(latitud.min()), float(longitud.min())], [float(latitud.max()), float(longitud.max())]]
+
+
+def limites_de(volumen, firma):
+    """``limites_wgs84`` del volumen, calculados una vez por proceso para cada configuración"""
+    llave = (volumen.pk, firma)
+    if llave not in _LIMITES:
+        _LIMITES[llave] = limites_wgs84(volumen)
+        while len(_LIMITES) > MAXIMO_LIMITES:
+            _LIMITES.popitem(last=False)
+    return _LIMITES[llave]
+
+
+def cubre_tesela(limites, z, x, y):
+    """Indica si la tesela ``z/x/y`` se cruza con los límites del levantamiento"""
+    (lat_min, lon_min), (lat_max, lon_max) = limites
+    n = 2 ** z
+
+    def latitud(fila):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * fila / n))))
+
+    return (
+        x / n * 360 - 180 <= lon_max and (x + 1) / n * 360 - 180 >= lon_min
+        and latitud(y + 1) <= lat_max and latitud(y) >= lat_min
+    )
+
+
+def teselas_de(limites, z):
+    """Índices (x, y) de las teselas del zoom ``z`` que cubren los límites"""
+    (lat_min, lon_min), (lat_max, lon_max) = limites
+    n = 2 ** z
+
+    def columna(longitud):
+        return min(int((longitud + 180) / 360 * n), n - 1)
+
+    def fila(latitud):
+        radianes = math.radians(latitud)
+        return min(int((1 - math.asinh(math.tan(radianes)) / math.pi) / 2 * n), n - 1)
+
+    for x in range(columna(lon_min), columna(lon_max) + 1):
+        for y in range(fila(lat_max), fila(lat_min) + 1):
+            yield x, y
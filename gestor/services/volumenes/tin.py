@@ -0,0 +1,79 @@
+"""
+Método de triangulación (TIN): Delaunay sobre los puntos del levantamiento y
+volumen de los prismas entre el terreno y el diseño.
+
+La diferencia terreno - diseño se toma lineal dentro de cada triángulo. Si un
+triángulo cruza el plano cero se separa exactamente la parte en corte de la
+de relleno: el vértice de signo opuesto forma un tetraedro de volumen
+A/3 · d³ / ((d - d1)(d - d2)).
+"""
+import numpy as np
+from scipy.spatial import Delaunay
+
+from .artefactos import reutilizar
+from .superficie import elevaciones_diseno
+
+
+def triangular(x, y):
+    """Índices (n, 3) de los triángulos de Delaunay de los puntos"""
+    return Delaunay(np.column_stack([x, y])).simplices
+
+
+def triangulacion(existente):
+    """Triangulación del levantamiento; se reutiliza la de sus artefactos si la tiene"""
+    x, y, _ = existente
+    return reutilizar(existente, 'triangulos', lambda: triangular(x, y))
+
+
+def areas_triangulos(x, y, triangulos):
+    x0, x1, x2 = x[triangulos[:, 0]], x[triangulos[:, 1]], x[triangulos[:, 2]]
+    y0, y1, y2 = y[triangulos[:, 0]], y[triangulos[:, 1]], y[triangulos[:, 2]]
+    return 0.5 * np.abs((x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0))
+
+
+def volumen_prismas(areas, diferencias):
+    """
+    Corte y relleno de cada prisma a partir del área del triángulo y la
+    diferencia terreno - diseño en sus tres vértices (arreglo (n, 3)).
+    Devuelve dos arreglos no negativos (corte, relleno).
+    """
+    d0, d1, d2 = np.sort(diferencias, axis=1).T
+    total = areas * (d0 + d1 + d2) / 3
+
+    corte = np.where(d0 >= 0, total, 0.0)
+    relleno = np.where(d2 <= 0, -total, 0.0)
+
+    # Un solo vértice sobre el diseño (d2): su tetraedro es el corte
+    uno_arriba = (d1 <= 0) & (d2 > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        punta = areas * d2 ** 3 / (3 * (d2 - d0) * (d2 - d1))
+    corte = np.where(uno_arriba, punta, corte)
+    relleno = np.where(uno_arriba, punta - total, relleno)
+
+    # Un solo vértice bajo el diseño (d0): su tetraedro es el relleno
+    uno_abajo = (d0 < 0) & (d1 > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        punta = -areas * d0 ** 3 / (3 * (d1 - d0) * (d2 - d0))
+    relleno = np.where(uno_abajo, punta, relleno)
+    corte = np.where(uno_abajo, total + punta, corte)
+    return corte, relleno
+
+
+def volumen_tin(existente, diseno, triangulos=None):
+    """
+    Volúmenes por TIN entre el terreno existente (x, y, z) y el diseño
+    (constante o puntos). ``triangulos`` permite reutilizar una triangulación.
+    """
+    x, y, z = existente
+    if triangulos is None:
+        triangulos = triangulacion(existente)
+
+    dz = z - elevaciones_diseno(diseno, x, y)
+    areas = areas_triangulos(x, y, triangulos)
+    corte, relleno = volumen_prismas(areas, dz[triangulos])
+    return {
+        'area_m2': float(areas.sum()),
+        'volumen_corte_m3': float(corte.sum()),
+        'volumen_relleno_m3': float(relleno.sum()),
+        'triangulos': int(len(triangulos)),
+    }
@@ -0,0 +1,103 @@
+"""
+Cálculo de volúmenes en segundo plano.
+
+El estado del trabajo vive en el propio VolumenTerraceria (estado, avance,
+tiempos, error y detalle del motor). El admin solo marca los registros como
+pendientes; el comando procesar_volumenes los reclama y los calcula en un
+ProcessPoolExecutor, así un levantamiento grande no bloquea al servidor web.
+"""
+import time
+import traceback
+
+from django.db import transaction
+from django.utils import timezone
+
+from gestor.models import VolumenTerraceria
+from . import calcular_volumen
+
+
+def programar_calculos(queryset):
+    """Marca como pendientes los registros con levantamiento que no están ya en cola"""
+    return (
+        queryset
+        .exclude(archivo_levantamiento='')
+        .exclude(archivo_levantamiento__isnull=True)
+        .exclude(estado_calculo__in=['PENDIENTE', 'EJECUCION'])
+        .update(
+            estado_calculo='PENDIENTE',
+            progreso_calculo=0,
+            error_calculo='',
+            calculo_iniciado_en=None,
+            calculo_finalizado_en=None,
+            duracion_calculo_s=None,
+            updated_at=timezone.now(),
+        )
+    )
+
+
+def reclamar_calculos(limite):
+    """Toma hasta ``limite`` cálculos pendientes sin bloquear a otros workers; devuelve sus pks"""
+    with transaction.atomic():
+        pks = list(
+            VolumenTerraceria.objects
+            .select_for_update(skip_locked=True)
+            .filter(estado_calculo='PENDIENTE')
+            .order_by('updated_at')
+            .values_list('pk', flat=True)[:limite]
+        )
+        ahora = timezone.now()
+        VolumenTerraceria.objects.filter(pk__in=pks).update(
+            estado_calculo='EJECUCION',
+            progreso_calculo=0,
+            calculo_iniciado_en=ahora,
+            updated_at=ahora,
+        )
+    return pks
+
+
+def ejecutar_calculo(pk):
+    """
+    Calcula un registro reclamado y guarda resultados, duración y error.
+    Devuelve un resumen serializable para el worker.
+    """
+    volumen = VolumenTerraceria.objects.select_related('proyecto', 'levantamiento_base').get(pk=pk)
+    registro = VolumenTerraceria.objects.filter(pk=pk)
+
+    def progreso(porcentaje):
+        registro.update(progreso_calculo=porcentaje, updated_at=timezone.now())
+
+    inicio = time.perf_counter()
+    try:
+        calcular_volumen(volumen, guardar=False, progreso=progreso)
+    except Exception:
+        volumen.estado_calculo = 'FALLIDO'
+        volumen.error_calculo = traceback.format_exc()
+        campos = []
+    else:
+        volumen.estado_calculo = 'COMPLETADO'
+        volumen.progreso_calculo = 100
+        volumen.error_calculo = ''
+        campos = ['area_m2', 'volumen_corte_m3', 'volumen_relleno_m3', 'volumen_neto_m3',
+                  'progreso_calculo', 'detalle_calculo']
+
+    volumen.duracion_calculo_s = round(time.perf_counter() - inicio, 3)
+    volumen.calculo_finalizado_en = timezone.now()
+    volumen.save(update_fields=campos + [
+        'estado_calculo', 'error_calculo', 'duracion_calculo_s', 'calculo_finalizado_en', 'updated_at',
+    ])
+    return {
+        'pk': str(volumen.pk),
+        'nombre': volumen.nombre,
+        'estado': volumen.estado_calculo,
+        'duracion': volumen.duracion_calculo_s,
+        'error': volumen.error_resumen,
+    }
+
+
+def reanudar_calculos(queryset):
+    """Devuelve a la cola cálculos fallidos o que quedaron en ejecución al detenerse un worker"""
+    return queryset.filter(estado_calculo__in=['EJECUCION', 'FALLIDO']).update(
+        estado_calculo='PENDIENTE',
+        progreso_calculo=0,
+        updated_at=timezone.now(),
+    )
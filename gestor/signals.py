@@ -0,0 +1,134 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from gestor.models import ElementoConstructivo, Proyecto, PuntoControl, ReporteAvance, VolumenTerraceria
+from gestor.services.avance_service import actualizar_avance_diario, registrar_avance
+from gestor.services.geocerca_service import evaluar_geocerca
+from gestor.services.media_service import campos_de, liberar_archivos, referenciar_archivos
+from gestor.services.miniaturas_service import borrar_miniaturas, copiar_miniaturas
+from gestor.services.task_service import encolar
+from gestor.services.puntos_cercanos_service import invalidar_indice
+from gestor.storage import NombreGuardado
+
+
+@receiver(post_save, sender=ElementoConstructivo)
+def registrar_cambio_avance(sender, instance, created, raw=False, **kwargs):
+    """Escribe el historial de avance cuando cambia el porcentaje o el estado"""
+    if raw or not (created or instance.avance_modificado()):
+        return
+    registrar_avance(instance)
+    instance._avance_guardado = (instance.porcentaje_avance, instance.estado)
+
+
+@receiver(post_delete, sender=ElementoConstructivo)
+def recalcular_avance_proyecto(sender, instance, origin=None, **kwargs):
+    # Al borrar el proyecto completo no tiene sentido recalcular su curva
+    if isinstance(origin, Proyecto) or (isinstance(origin, QuerySet) and origin.model is Proyecto):
+        return
+    actualizar_avance_diario(instance.proyecto_id)
+
+
+@receiver(post_save, sender=PuntoControl)
+@receiver(post_delete, sender=PuntoControl)
+def invalidar_indice_puntos(sender, instance, **kwargs):
+    """Descarta el KD-tree del proyecto en este proceso"""
+    invalidar_indice(instance.proyecto_id)
+
+
+@receiver(post_save, sender=ReporteAvance)
+def verificar_geocerca_reporte(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Evalúa la geocerca de reportes nuevos o que cambian de ubicación o elemento"""
+    if raw:
+        return
+    if not created and update_fields is not None and not {'latitud', 'longitud', 'elemento'} & set(update_fields):
+        return
+    evaluar_geocerca([instance.pk])
+
+
+@receiver(post_save, sender=ReporteAvance)
+def programar_miniaturas_reporte(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Descarta las variantes de una foto reemplazada y encola las de la nueva"""
+    if raw or (update_fields is not None and 'foto' not in update_fields):
+        return
+    nombre = instance.foto.name if instance.foto else ''
+    if nombre == instance.miniaturas.get('original', ''):
+        return
+
+    borrar_miniaturas(instance.miniaturas, excluir=instance.pk)
+    # La misma foto en otro reporte ya tiene variantes: se reutilizan
+    existentes = (
+        ReporteAvance.objects.filter(foto=nombre, miniaturas__original=nombre)
+        .exclude(pk=instance.pk).values_list('miniaturas', flat=True).first()
+    ) if nombre else None
+    instance.miniaturas = copiar_miniaturas(existentes) if existentes else {}
+    ReporteAvance.objects.filter(pk=instance.pk).update(miniaturas=instance.miniaturas)
+    if nombre and not existentes:
+        encolar('generar_miniaturas', descripcion=f'Miniaturas de {instance}', pks=[str(instance.pk)])
+
+
+@receiver(post_delete, sender=ReporteAvance)
+def borrar_miniaturas_reporte(sender, instance, **kwargs):
+    borrar_miniaturas(instance.miniaturas, excluir=instance.pk)
+
+
+@receiver(pre_save, sender=ReporteAvance)
+@receiver(pre_save, sender=VolumenTerraceria)
+def recordar_guardado(sender, instance, raw=False, **kwargs):
+    """
+    Lee en una sola consulta lo guardado que el save necesita: los nombres de
+    los archivos, para liberar los que se reemplacen, y en los reportes las
+    miniaturas, que el worker escribe con ``update`` (una instancia cargada
+    antes de que terminara no debe guardar encima su valor viejo).
+    """
+    if raw or instance._state.adding:
+        return
+    campos = campos_de(sender)
+    columnas = [*campos, 'miniaturas'] if sender is ReporteAvance else campos
+    guardados = sender.objects.filter(pk=instance.pk).values_list(*columnas).first()
+    if guardados is None:
+        return
+    instance._archivos_guardados = dict(zip(campos, guardados))
+    if sender is ReporteAvance:
+        instance.miniaturas = guardados[-1]
+
+
+@receiver(post_save, sender=ReporteAvance)
+@receiver(post_save, sender=VolumenTerraceria)
+def contar_referencias_archivos(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Suma la referencia de cada archivo nuevo en la fila y resta la del que
+    reemplaza o se quita. Lo recién escrito por el almacenamiento ya sumó la
+    suya (``NombreGuardado``); un nombre tomado de otro registro o asignado a
+    mano (``foto=otro.foto``) la suma aquí.
+    """
+    guardados = instance.__dict__.pop('_archivos_guardados', {})
+    if raw:
+        return
+    nuevos, reemplazados = [], []
+    for campo in campos_de(sender):
+        if update_fields is not None and campo not in update_fields:
+            continue
+        archivo = getattr(instance, campo)
+        nombre, anterior = archivo.name or '', guardados.get(campo) or ''
+        contado = isinstance(nombre, NombreGuardado)
+        if nombre and nombre != anterior and not contado:
+            nuevos.append(nombre)
+        # El mismo contenido subido otra vez también sumó una referencia
+        if anterior and (anterior != nombre or contado):
+            reemplazados.append(anterior)
+        if contado:
+            # Ya quedó contado: copiarlo a otro registro debe sumar otra referencia
+            archivo.name = str(nombre)
+
+    referenciar_archivos(nuevos)
+    if reemplazados:
+        transaction.on_commit(lambda: liberar_archivos(reemplazados))
+
+
+@receiver(post_delete, sender=ReporteAvance)
+@receiver(post_delete, sender=VolumenTerraceria)
+def liberar_archivos_borrados(sender, instance, **kwargs):
+    nombres = [getattr(instance, campo).name for campo in campos_de(sender)]
+    transaction.on_commit(lambda: liberar_archivos(nombres))
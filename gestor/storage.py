@@ -0,0 +1,101 @@
+"""
+Almacenamiento de media direccionado por contenido.
+
+Cada archivo se guarda una sola vez en ``contenido/<aa>/<bb>/<sha256><ext>``
+y el nombre que recibe el FileField es esa ruta, así la misma foto o el mismo
+levantamiento subido varias veces ocupa el espacio de uno. ``ArchivoMedia``
+lleva la cuenta de referencias: guardar suma una, ``delete`` solo resta una
+y el archivo se borra cuando llega a cero. Un nombre que se asigna a otro
+registro sin pasar por el almacenamiento suma la suya con ``referenciar``. Los nombres anteriores a la deduplicación (fuera de
+``contenido/``) se siguen leyendo y borrando como en FileSystemStorage.
+"""
+import hashlib
+import os
+import tempfile
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+DIRECTORIO = 'contenido'
+
+
+def ruta_contenido(sha256, extension=''):
+    return f'{DIRECTORIO}/{sha256[:2]}/{sha256[2:4]}/{sha256}{extension.lower()}'
+
+
+class NombreGuardado(str):
+    """Nombre devuelto por ``_save``: su referencia ya está contada"""
+
+
+class AlmacenamientoDeduplicado(FileSystemStorage):
+
+    def get_available_name(self, name, max_length=None):
+        # El nombre final lo decide el contenido en _save
+        return name
+
+    def _save(self, name, content):
+        directorio_temporal = self.path(os.path.join(DIRECTORIO, '.tmp'))
+        os.makedirs(directorio_temporal, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=directorio_temporal)
+        try:
+            digest = hashlib.sha256()
+            tamano = 0
+            # Se copia por bloques calculando el hash: la memoria no depende del tamaño
+            with os.fdopen(descriptor, 'wb') as salida:
+                for bloque in content.chunks():
+                    if isinstance(bloque, str):
+                        bloque = bloque.encode()
+                    digest.update(bloque)
+                    salida.write(bloque)
+                    tamano += len(bloque)
+            return NombreGuardado(
+                self.registrar(temporal, digest.hexdigest(), tamano, os.path.splitext(name)[1])
+            )
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+
+    def registrar(self, ruta_local, sha256, tamano, extension='', referencias=1):
+        """
+        Suma ``referencias`` al contenido ``sha256``; si aún no existe, mueve
+        ``ruta_local`` a su ruta de contenido. Devuelve el nombre guardado.
+        """
+        ArchivoMedia = apps.get_model('gestor', 'ArchivoMedia')
+        while True:
+            ArchivoMedia.objects.get_or_create(
+                sha256=sha256,
+                defaults={'ruta': ruta_contenido(sha256, extension), 'tamano': tamano},
+            )
+            with transaction.atomic():
+                archivo = ArchivoMedia.objects.select_for_update().filter(sha256=sha256).first()
+                # Otro proceso borró la última referencia entre ambas consultas
+                if archivo is None:
+                    continue
+
+                destino = self.path(archivo.ruta)
+                if not os.path.exists(destino):
+                    os.makedirs(os.path.dirname(destino), exist_ok=True)
+                    os.replace(ruta_local, destino)
+                    if self.file_permissions_mode is not None:
+                        os.chmod(destino, self.file_permissions_mode)
+                ArchivoMedia.objects.filter(pk=archivo.pk).update(referencias=F('referencias') + referencias)
+                return archivo.ruta
+
+    def referenciar(self, name):
+        """Suma una referencia a un nombre ya guardado (p. ej. asignado a otro registro)"""
+        ArchivoMedia = apps.get_model('gestor', 'ArchivoMedia')
+        ArchivoMedia.objects.filter(ruta=name).update(referencias=F('referencias') + 1)
+
+    def delete(self, name):
+        ArchivoMedia = apps.get_model('gestor', 'ArchivoMedia')
+        with transaction.atomic():
+            archivo = ArchivoMedia.objects.select_for_update().filter(ruta=name).first()
+            if archivo is None:
+                return super().delete(name)
+            if archivo.referencias > 1:
+                ArchivoMedia.objects.filter(pk=archivo.pk).update(referencias=F('referencias') - 1)
+                return
+            archivo.delete()
+            super().delete(name)
@@ -1,3 +1,125 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import tempfile
+from datetime import date
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from gestor.models import ArchivoMedia, ElementoConstructivo, Proyecto, ReporteAvance
+from gestor.services import purgar_proyecto
+
+
+def imagen(color):
+    salida = io.BytesIO()
+    Image.new('RGB', (8, 8), color).save(salida, 'PNG')
+    return ContentFile(salida.getvalue(), name='foto.png')
+
+
+class ReferenciasMediaTests(TestCase):
+    """Cuenta de referencias del almacenamiento deduplicado a través de los modelos"""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        ajustes = override_settings(MEDIA_ROOT=self.media)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        self.elemento = self.crear_elemento('P-1')
+
+    def crear_elemento(self, codigo):
+        proyecto = Proyecto.objects.create(
+            nombre=codigo, codigo=codigo, cliente='Cliente', zona_utm=14, hemisferio='N',
+            lat_referencia=19.4, lon_referencia=-99.1, fecha_inicio=date(2026, 1, 1),
+            fecha_fin_estimada=date(2026, 12, 31), presupuesto_total=1000,
+        )
+        return ElementoConstructivo.objects.create(
+            proyecto=proyecto, codigo=f'{codigo}-E1', nombre='Zapata', tipo='ZAPATA',
+            latitud=19.4, longitud=-99.1, elevacion=0,
+        )
+
+    def crear_reporte(self, foto, elemento=None):
+        return ReporteAvance.objects.create(
+            elemento=elemento or self.elemento, latitud=19.4, longitud=-99.1,
+            avance_cantidad=1, avance_porcentaje=10, descripcion='Reporte', foto=foto,
+        )
+
+    def referencias(self, nombre):
+        return ArchivoMedia.objects.filter(ruta=nombre).values_list('referencias', flat=True).first()
+
+    def existe(self, nombre):
+        return os.path.exists(os.path.join(self.media, nombre))
+
+    def test_nombre_compartido_suma_referencias(self):
+        original = self.crear_reporte(imagen('red'))
+        nombre = original.foto.name
+        self.assertEqual(self.referencias(nombre), 1)
+
+        # Tomado de otro registro o asignado por nombre, sin pasar por el almacenamiento
+        self.crear_reporte(original.foto)
+        copia = self.crear_reporte(nombre)
+        self.assertEqual(self.referencias(nombre), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            copia.delete()
+            original.delete()
+        self.assertEqual(self.referencias(nombre), 1)
+        self.assertTrue(self.existe(nombre))
+
+    def test_mismo_contenido_se_guarda_una_vez(self):
+        primero = self.crear_reporte(imagen('red'))
+        segundo = self.crear_reporte(imagen('red'))
+        self.assertEqual(primero.foto.name, segundo.foto.name)
+        self.assertEqual(self.referencias(primero.foto.name), 2)
+
+    def test_reemplazo_libera_el_anterior(self):
+        reporte = self.crear_reporte(imagen('red'))
+        anterior = reporte.foto.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reporte.foto = imagen('blue')
+            reporte.save()
+        self.assertIsNone(self.referencias(anterior))
+        self.assertFalse(self.existe(anterior))
+        self.assertEqual(self.referencias(reporte.foto.name), 1)
+
+        # Subir otra vez el mismo contenido no suma una referencia
+        with self.captureOnCommitCallbacks(execute=True):
+            reporte.foto = imagen('blue')
+            reporte.save()
+        self.assertEqual(self.referencias(reporte.foto.name), 1)
+
+        # Guardar sin cambiar la foto tampoco
+        with self.captureOnCommitCallbacks(execute=True):
+            ReporteAvance.objects.get(pk=reporte.pk).save()
+        self.assertEqual(self.referencias(reporte.foto.name), 1)
+
+    def test_borrado_elimina_con_la_ultima_referencia(self):
+        primero = self.crear_reporte(imagen('red'))
+        segundo = self.crear_reporte(primero.foto.name)
+        nombre = primero.foto.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            primero.delete()
+        self.assertEqual(self.referencias(nombre), 1)
+        self.assertTrue(self.existe(nombre))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            segundo.delete()
+        self.assertIsNone(self.referencias(nombre))
+        self.assertFalse(self.existe(nombre))
+
+    def test_purga_libera_solo_las_del_proyecto(self):
+        otro = self.crear_elemento('P-2')
+        compartida = self.crear_reporte(imagen('red')).foto.name
+        self.crear_reporte(compartida, elemento=otro)
+        propia = self.crear_reporte(imagen('green')).foto.name
+
+        purgar_proyecto(self.elemento.proyecto_id, tamano_lote=1)
+
+        self.assertEqual(self.referencias(compartida), 1)
+        self.assertTrue(self.existe(compartida))
+        self.assertIsNone(self.referencias(propia))
+        self.assertFalse(self.existe(propia))
@@ -1,11 +1,12 @@
-from datetime import timedelta
+from datetime import date, timedelta
 from django.views.generic import TemplateView
 import json
+import uuid
 from django.contrib.admin import AdminSite
 from django.utils import timezone
-from django.http import JsonResponse
-from gestor.models import (Proyecto, ElementoConstructivo, ReporteAvance,PuntoControl,Cuadrilla)
-from django.db.models import Avg, Count, Sum, Q
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from gestor.models import (Proyecto, ElementoConstructivo, ReporteAvance,PuntoControl,Cuadrilla,VolumenTerraceria,CargaArchivo,TareaFondo)
+from django.db.models import Avg, Count, JSONField, OuterRef, Subquery, Sum, Q
 from unfold.admin import ModelAdmin
 from unfold.views import UnfoldModelAdminViewMixin
 from django.db.models import Avg
@@ -14,6 +15,14 @@ from unfold.views import UnfoldModelAdminViewMixin
 from django.contrib.admin import site as admin_site
 from django.core.exceptions import PermissionDenied
 from gestor.models import Proyecto
+from gestor.services import coordenadas_proyecto, curva_s, miniatura_de, puntos_cercanos, puntos_cercanos_a
+from gestor.services.exportacion_service import ruta_exportacion
+from gestor.services.cargas_service import ErrorCarga, cancelar_cargas, crear_carga, estado_carga, recibir_fragmento
+from gestor.services.volumenes import ErrorLevantamiento, raster_diferencia
+from gestor.services.volumenes.teselas import (
+    CAPAS, METODOS, ZOOM_MAXIMO, cubre_tesela, firma_configuracion, limites_de, tesela
+)
+from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import FormView, RedirectView
 class ProyectoDashboardView(UnfoldModelAdminViewMixin, TemplateView):
@@ -83,6 +92,7 @@ class ProyectoMapsView(UnfoldModelAdminViewMixin, TemplateView):
                 'proyecto': proyecto,
                 'elementos': elementos,
                 'elementos_json': json.dumps(elementos_json),  # JSON para JavaScript
+                'superficies': superficies_mapa(proyecto),
             })
 
         return context
@@ -327,9 +337,27 @@ class ProyectoDataAPIView(UnfoldModelAdminViewMixin, TemplateView):
                 count=Count('id')
             ).order_by('-count')
 
+            # Foto más reciente de cada elemento (solo nombre y variantes, sin abrir archivos)
+            ultimos_reportes = ReporteAvance.objects.filter(
+                elemento=OuterRef('pk')
+            ).exclude(foto='').exclude(foto__isnull=True).order_by('-fecha', '-hora')
+            elementos_con_foto = elementos.annotate(
+                ultima_foto=Subquery(ultimos_reportes.values('foto')[:1]),
+                ultimas_miniaturas=Subquery(ultimos_reportes.values('miniaturas')[:1], output_field=JSONField()),
+            )
+
             # Elementos para el mapa
             elementos_mapa = []
-            for elemento in elementos:
+            for elemento in elementos_con_foto:
+                foto = None
+                if elemento.ultima_foto:
+                    reporte = ReporteAvance(foto=elemento.ultima_foto, miniaturas=elemento.ultimas_miniaturas or {})
+                    miniatura = miniatura_de(reporte, 200)
+                    foto = {
+                        'url': reporte.foto.url,
+                        'webp': miniatura['webp'] if miniatura else None,
+                        'jpg': miniatura['jpg'] if miniatura else reporte.foto.url,
+                    }
                 elementos_mapa.append({
                     'id': str(elemento.id),
                     'codigo': elemento.codigo,
@@ -342,6 +370,7 @@ class ProyectoDataAPIView(UnfoldModelAdminViewMixin, TemplateView):
                     'avance': float(elemento.porcentaje_avance),
                     'tipo': elemento.tipo,
                     'tipo_display': elemento.get_tipo_display(),
+                    'foto': foto,
                 })
 
             # Datos del proyecto
@@ -377,6 +406,302 @@ class ProyectoDataAPIView(UnfoldModelAdminViewMixin, TemplateView):
             return JsonResponse({'error': 'Proyecto no encontrado'}, status=404)
 
 
+class ProyectoCurvaSAPIView(UnfoldModelAdminViewMixin, TemplateView):
+    """API con las curvas S programada y real de un proyecto"""
+    permission_required = ()
+
+    def get(self, request, *args, **kwargs):
+        proyecto = self.model_admin.get_object(request, self.kwargs.get('object_id'))
+        if proyecto is None:
+            return JsonResponse({'error': 'Proyecto no encontrado'}, status=404)
+
+        try:
+            desde = date.fromisoformat(request.GET['desde']) if request.GET.get('desde') else None
+            hasta = date.fromisoformat(request.GET['hasta']) if request.GET.get('hasta') else None
+        except ValueError:
+            return JsonResponse({'error': 'Fechas inválidas, use AAAA-MM-DD'}, status=400)
+
+        return JsonResponse({
+            'proyecto': proyecto.codigo,
+            **curva_s(proyecto, desde, hasta),
+        })
+
+
+class ProyectoCoordenadasAPIView(UnfoldModelAdminViewMixin, TemplateView):
+    """API con las coordenadas de elementos o puntos de control en WGS84, UTM o LOCAL"""
+    permission_required = ()
+
+    def get(self, request, *args, **kwargs):
+        proyecto = self.model_admin.get_object(request, self.kwargs.get('object_id'))
+        if proyecto is None:
+            return JsonResponse({'error': 'Proyecto no encontrado'}, status=404)
+
+        sistema = request.GET.get('sistema') or proyecto.sistema_coordenadas
+        if sistema not in ('WGS84', 'UTM', 'LOCAL'):
+            return JsonResponse({'error': 'sistema debe ser WGS84, UTM o LOCAL'}, status=400)
+
+        if request.GET.get('tipo') == 'puntos':
+            queryset = proyecto.puntos_control.all()
+        else:
+            queryset = proyecto.elementos.all()
+
+        return JsonResponse({
+            'proyecto': proyecto.codigo,
+            **coordenadas_proyecto(proyecto, queryset, sistema),
+        })
+
+
+class ProyectoPuntosCercanosAPIView(UnfoldModelAdminViewMixin, TemplateView):
+    """
+    API de puntos de control validados cercanos a una posición, un elemento o un reporte.
+    Parámetros: lat/lon, elemento o reporte; k (5 por defecto) y/o radio en metros.
+    Con radio y k=0 devuelve todos los puntos dentro del radio.
+    """
+    permission_required = ()
+
+    def get(self, request, *args, **kwargs):
+        proyecto = self.model_admin.get_object(request, self.kwargs.get('object_id'))
+        if proyecto is None:
+            return JsonResponse({'error': 'Proyecto no encontrado'}, status=404)
+
+        try:
+            k = int(request.GET.get('k', 5)) or None
+            radio = float(request.GET['radio']) if request.GET.get('radio') else None
+        except ValueError:
+            return JsonResponse({'error': 'k y radio deben ser numéricos'}, status=400)
+        if (k is not None and k < 0) or (radio is not None and radio < 0):
+            return JsonResponse({'error': 'k y radio no pueden ser negativos'}, status=400)
+        if k is None and radio is None:
+            return JsonResponse({'error': 'Indique k o radio'}, status=400)
+
+        try:
+            elemento_id = uuid.UUID(request.GET['elemento']) if request.GET.get('elemento') else None
+            reporte_id = uuid.UUID(request.GET['reporte']) if request.GET.get('reporte') else None
+        except ValueError:
+            return JsonResponse({'error': 'elemento y reporte deben ser UUID válidos'}, status=400)
+
+        if elemento_id:
+            objeto = proyecto.elementos.filter(pk=elemento_id).first()
+        elif reporte_id:
+            objeto = ReporteAvance.objects.filter(
+                pk=reporte_id, elemento__proyecto=proyecto
+            ).select_related('elemento').first()
+        else:
+            objeto = None
+            try:
+                latitud = float(request.GET['lat'])
+                longitud = float(request.GET['lon'])
+            except (KeyError, ValueError):
+                return JsonResponse({'error': 'Indique lat/lon, elemento o reporte'}, status=400)
+
+        if objeto is not None:
+            puntos = puntos_cercanos_a(objeto, k, radio)
+        elif elemento_id or reporte_id:
+            return JsonResponse({'error': 'Elemento o reporte no encontrado en el proyecto'}, status=404)
+        else:
+            puntos = puntos_cercanos(proyecto.pk, latitud, longitud, k, radio)
+
+        return JsonResponse({
+            'proyecto': proyecto.codigo,
+            'puntos': puntos,
+        })
+
+
+class VolumenCalculosView(UnfoldModelAdminViewMixin, TemplateView):
+    """Cálculos de volúmenes en cola, en ejecución y terminados recientemente"""
+    title = "Cálculos de Volúmenes"
+    permission_required = ("gestor.view_volumenterraceria",)
+    template_name = "board/volumen_calculos.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        volumenes = VolumenTerraceria.objects.select_related('proyecto')
+
+        context.update({
+            'en_curso': volumenes.filter(
+                estado_calculo__in=['EJECUCION', 'PENDIENTE']
+            ).order_by('estado_calculo', 'updated_at'),
+            'terminados': volumenes.filter(
+                estado_calculo__in=['COMPLETADO', 'FALLIDO']
+            ).order_by('-calculo_finalizado_en')[:50],
+            'conteos': dict(
+                volumenes.values_list('estado_calculo').annotate(total=Count('id')).order_by()
+            ),
+        })
+        return context
+
+
+class VolumenDiferenciaRasterView(UnfoldModelAdminViewMixin, TemplateView):
+    """Descarga el ráster de diferencia por celda contra el levantamiento base"""
+    permission_required = ("gestor.view_volumenterraceria",)
+
+    def get(self, request, *args, **kwargs):
+        volumen = self.model_admin.get_object(request, self.kwargs.get('object_id'))
+        if volumen is None:
+            return JsonResponse({'error': 'Volumen no encontrado'}, status=404)
+        if volumen.levantamiento_base_id is None:
+            return JsonResponse({'error': 'El volumen no tiene levantamiento base'}, status=400)
+
+        try:
+            raster = raster_diferencia(volumen)
+        except (ErrorLevantamiento, OSError) as error:
+            return JsonResponse({'error': str(error)}, status=400)
+
+        respuesta = HttpResponse(raster, content_type='text/plain; charset=utf-8')
+        respuesta['Content-Disposition'] = f'attachment; filename="diferencia_{volumen.pk}.asc"'
+        return respuesta
+
+
+def superficies_mapa(proyecto):
+    """
+    Levantamientos del proyecto como capas de teselas para Leaflet: nombre,
+    límites y plantilla de URL ``{z}/{x}/{y}`` por capa. La firma va en la URL
+    para que el navegador guarde las teselas hasta que cambie la configuración.
+    """
+    superficies = []
+    volumenes = (
+        proyecto.volumenes.exclude(archivo_levantamiento='')
+        .exclude(archivo_levantamiento__isnull=True)
+        .filter(metodo_calculo__in=METODOS)
+        .select_related('proyecto', 'levantamiento_base')
+    )
+    for volumen in volumenes:
+        try:
+            firma = firma_configuracion(volumen)
+            limites = limites_de(volumen, firma)
+        except (ErrorLevantamiento, OSError, ValueError):
+            continue
+        capas = {}
+        for capa in CAPAS:
+            url = reverse('admin:volumen_tesela', args=[volumen.pk, capa, 0, 0, 0])
+            capas[capa] = url.replace('/0/0/0.png', '/{z}/{x}/{y}.png') + f'?v={firma}'
+        superficies.append({'nombre': volumen.nombre, 'limites': limites, 'capas': capas})
+    return superficies
+
+
+class VolumenTeselaView(UnfoldModelAdminViewMixin, TemplateView):
+    """Tesela PNG de elevación o corte/relleno del levantamiento (cacheable por firma)"""
+    permission_required = ("gestor.view_volumenterraceria",)
+    # Con ?v=<firma> la URL cambia junto con la configuración y la tesela no caduca
+    MAX_AGE_VERSIONADA = 60 * 60 * 24 * 365
+    MAX_AGE = 60 * 5
+
+    def get(self, request, *args, **kwargs):
+        capa, z, x, y = (self.kwargs[llave] for llave in ('capa', 'z', 'x', 'y'))
+        if capa not in CAPAS or z > ZOOM_MAXIMO or not 0 <= x < 2 ** z or not 0 <= y < 2 ** z:
+            return JsonResponse({'error': 'Tesela inválida'}, status=404)
+        volumen = self.model_admin.get_object(request, self.kwargs.get('object_id'))
+        if volumen is None:
+            return JsonResponse({'error': 'Volumen no encontrado'}, status=404)
+
+        try:
+            firma = firma_configuracion(volumen)
+            limites = limites_de(volumen, firma)
+        except (ErrorLevantamiento, OSError, ValueError) as error:
+            return JsonResponse({'error': str(error)}, status=400)
+        etag = f'"{firma}-{capa}-{z}-{x}-{y}"'
+        if request.GET.get('v') == firma:
+            cache_control = f'private, max-age={self.MAX_AGE_VERSIONADA}, immutable'
+        else:
+            cache_control = f'private, max-age={self.MAX_AGE}'
+
+        # Fuera del levantamiento no hay nada que dibujar ni que guardar
+        if not cubre_tesela(limites, z, x, y):
+            respuesta = HttpResponse(status=204)
+        elif etag in request.headers.get('If-None-Match', ''):
+            respuesta = HttpResponse(status=304)
+        else:
+            try:
+                contenido = tesela(volumen, capa, z, x, y, firma)
+            except (ErrorLevantamiento, OSError, ValueError) as error:
+                return JsonResponse({'error': str(error)}, status=400)
+            respuesta = HttpResponse(contenido, content_type='image/png')
+        respuesta['ETag'] = etag
+        respuesta['Cache-Control'] = cache_control
+        return respuesta
+
+
+class CargaArchivoAPIView(UnfoldModelAdminViewMixin, TemplateView):
+    """
+    Crea una carga reanudable. Recibe JSON {destino, objeto_id, nombre, tamano,
+    sha256 (opcional)} y responde con el id y el offset inicial.
+    """
+    permission_required = ("gestor.add_cargaarchivo",)
+
+    def post(self, request, *args, **kwargs):
+        try:
+            datos = json.loads(request.body)
+            carga = crear_carga(
+                request.user,
+                datos.get('destino', ''),
+                datos['objeto_id'],
+                str(datos.get('nombre', '')),
+                int(datos['tamano']),
+                str(datos.get('sha256', '')),
+            )
+        except (ValueError, KeyError, TypeError):
+            return JsonResponse({'error': 'Se requieren destino, objeto_id, nombre y tamano'}, status=400)
+        except ErrorCarga as error:
+            return JsonResponse({'error': str(error)}, status=error.codigo)
+        return JsonResponse(estado_carga(carga), status=201)
+
+
+class CargaFragmentoAPIView(UnfoldModelAdminViewMixin, TemplateView):
+    """
+    GET: offset recibido para reanudar. PATCH: cuerpo crudo del fragmento con
+    los encabezados Upload-Offset y X-Checksum-Sha256. DELETE: cancela.
+    """
+    permission_required = ("gestor.add_cargaarchivo",)
+
+    def carga(self):
+        carga = CargaArchivo.objects.filter(pk=self.kwargs['carga_id']).first()
+        if carga is None:
+            return None
+        if carga.creada_por_id != self.request.user.pk and not self.request.user.is_superuser:
+            return None
+        return carga
+
+    def get(self, request, *args, **kwargs):
+        carga = self.carga()
+        if carga is None:
+            return JsonResponse({'error': 'Carga no encontrada'}, status=404)
+        respuesta = JsonResponse(estado_carga(carga))
+        respuesta['Upload-Offset'] = carga.recibido
+        return respuesta
+
+    def patch(self, request, *args, **kwargs):
+        if self.carga() is None:
+            return JsonResponse({'error': 'Carga no encontrada'}, status=404)
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            longitud = int(request.headers['Content-Length'])
+        except (KeyError, ValueError):
+            return JsonResponse({'error': 'Se requieren Upload-Offset y Content-Length'}, status=400)
+
+        try:
+            # Se lee del stream del request: el fragmento nunca se carga completo en memoria
+            carga = recibir_fragmento(
+                self.kwargs['carga_id'], offset, request, longitud, request.headers.get('X-Checksum-Sha256', '')
+            )
+        except ErrorCarga as error:
+            carga = CargaArchivo.objects.get(pk=self.kwargs['carga_id'])
+            respuesta = JsonResponse({**estado_carga(carga), 'error': str(error)}, status=error.codigo)
+            respuesta['Upload-Offset'] = carga.recibido
+            return respuesta
+
+        respuesta = JsonResponse(estado_carga(carga))
+        respuesta['Upload-Offset'] = carga.recibido
+        return respuesta
+
+    def delete(self, request, *args, **kwargs):
+        carga = self.carga()
+        if carga is None:
+            return JsonResponse({'error': 'Carga no encontrada'}, status=404)
+        cancelar_cargas(CargaArchivo.objects.filter(pk=carga.pk))
+        carga.refresh_from_db()
+        return JsonResponse(estado_carga(carga))
+
+
 def admin_password_change_guard(request):
     """
     Esta vista intercepta la URL de cambio de contraseña.
@@ -390,6 +715,27 @@ def admin_password_change_guard(request):
     return admin_site.password_change(request)
 
 
+class ReporteExportacionView(UnfoldModelAdminViewMixin, TemplateView):
+    """Descarga de una exportación de reportes generada en segundo plano"""
+    permission_required = ("gestor.view_reporteavance",)
+
+    def get(self, request, *args, **kwargs):
+        tarea = TareaFondo.objects.filter(
+            pk=self.kwargs['tarea_id'], tipo='exportar_reportes', estado='COMPLETADA'
+        ).first()
+        if tarea is None or (tarea.creada_por_id != request.user.pk and not request.user.is_superuser):
+            raise Http404('Exportación no encontrada')
+        try:
+            archivo = open(ruta_exportacion(tarea), 'rb')
+        except FileNotFoundError:
+            raise Http404('El archivo de la exportación ya no existe')
+        return FileResponse(
+            archivo,
+            as_attachment=True,
+            filename=f'reportes_avance_{timezone.localtime(tarea.created_at):%Y%m%d_%H%M}.{tarea.parametros["formato"]}',
+        )
+
+
 class HomeView(RedirectView):
     pattern_name = "admin:home"
 
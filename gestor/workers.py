@@ -0,0 +1,29 @@
+"""
+Funciones que se ejecutan dentro de procesos hijos (ProcessPoolExecutor).
+
+Este módulo no importa modelos al cargarse para que funcione también con
+los métodos de arranque spawn/forkserver: Django se inicializa en el hijo
+con ``inicializar`` y los modelos se importan dentro de cada función.
+"""
+import django
+
+
+def inicializar():
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def actualizar_utm_lote(etiqueta_modelo, pks, latitudes, longitudes, zonas, hemisferios):
+    from gestor.services.utm_backfill_service import guardar_utm_lote
+    return guardar_utm_lote(etiqueta_modelo, pks, latitudes, longitudes, zonas, hemisferios)
+
+
+def calcular_volumen(pk):
+    from gestor.services.volumenes.trabajos import ejecutar_calculo
+    return ejecutar_calculo(pk)
+
+
+def generar_miniaturas(nombre):
+    from gestor.services.miniaturas_service import generar_miniaturas
+    return generar_miniaturas(nombre)